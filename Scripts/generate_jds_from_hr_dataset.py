@@ -1,17 +1,12 @@
 import os
-import json
-import pandas as pd
+import csv
+from collections import Counter, defaultdict
+
+from json_helpers import write_json
 
 # === Paths ===
 csv_path = "./data/aug_train.csv"
 output_folder = "./data/job_descriptions/"
-os.makedirs(output_folder, exist_ok=True)
-
-# === Load Data ===
-df = pd.read_csv(csv_path)
-
-# === Clean & Filter ===
-df = df.dropna(subset=["major_discipline", "experience", "education_level", "relevent_experience"])
 
 # === Mappings for readability ===
 experience_map = {
@@ -39,41 +34,70 @@ rel_exp_map = {
     "No relevent experience": "Relevant experience is a plus but not required"
 }
 
-# === Generate JDs grouped by major_discipline ===
-grouped = df.groupby("major_discipline")
-
-for discipline, group in grouped:
-    # Normalize file name
-    title_slug = discipline.strip().replace(" ", "_").replace("/", "_").lower()
-
-    # Mode values
-    raw_exp = str(group["experience"].mode()[0])
-    raw_edu = str(group["education_level"].mode()[0])
-    raw_relexp = str(group["relevent_experience"].mode()[0])
-
-    # Cleaned values
-    exp = experience_map.get(raw_exp, f"{raw_exp} years of experience")
-    edu = edu_map.get(raw_edu, raw_edu)
-    relexp = rel_exp_map.get(raw_relexp, raw_relexp)
-
-    # Create description and requirements
-    jd = {
-        "title": f"{discipline} Specialist",
-        "description": (
-            f"We are seeking a passionate {discipline} Specialist to join our team. "
-            f"The ideal candidate will have a solid educational background and the ability to apply their knowledge to real-world projects."
-        ),
-        "requirements": [
-            f"Minimum experience required: {exp}",
-            f"Education level: {edu}",
-            f"{relexp}"
-        ],
-        "skills": [discipline]
-    }
-
-    # Save JD as JSON
-    file_path = os.path.join(output_folder, f"{title_slug}.json")
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(jd, f, indent=2)
-
-print(f"SUCCESS: Generated {len(grouped)} enhanced job descriptions in: {output_folder}")
+def mode(counter):
+    """Most frequent value, ties broken by the smallest value (as pandas' mode does)"""
+    top = max(counter.values())
+    return min(value for value, count in counter.items() if count == top)
+
+def main():
+    """Generate one job description per major discipline from the HR dataset"""
+    os.makedirs(output_folder, exist_ok=True)
+
+    # === Stream Data ===
+    # Only the per-discipline mode of three columns is needed, so count values row by row
+    required_fields = ["major_discipline", "experience", "education_level", "relevent_experience"]
+    counters = defaultdict(lambda: {
+        "experience": Counter(),
+        "education_level": Counter(),
+        "relevent_experience": Counter()
+    })
+
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            # === Clean & Filter ===
+            if any(not row.get(field) for field in required_fields):
+                continue
+            group = counters[row["major_discipline"]]
+            for field in group:
+                group[field][row[field]] += 1
+
+    # === Generate JDs grouped by major_discipline ===
+    for discipline in sorted(counters):
+        group = counters[discipline]
+
+        # Normalize file name
+        title_slug = discipline.strip().replace(" ", "_").replace("/", "_").lower()
+
+        # Mode values
+        raw_exp = mode(group["experience"])
+        raw_edu = mode(group["education_level"])
+        raw_relexp = mode(group["relevent_experience"])
+
+        # Cleaned values
+        exp = experience_map.get(raw_exp, f"{raw_exp} years of experience")
+        edu = edu_map.get(raw_edu, raw_edu)
+        relexp = rel_exp_map.get(raw_relexp, raw_relexp)
+
+        # Create description and requirements
+        jd = {
+            "title": f"{discipline} Specialist",
+            "description": (
+                f"We are seeking a passionate {discipline} Specialist to join our team. "
+                f"The ideal candidate will have a solid educational background and the ability to apply their knowledge to real-world projects."
+            ),
+            "requirements": [
+                f"Minimum experience required: {exp}",
+                f"Education level: {edu}",
+                f"{relexp}"
+            ],
+            "skills": [discipline]
+        }
+
+        # Save JD as JSON
+        file_path = os.path.join(output_folder, f"{title_slug}.json")
+        write_json(file_path, jd)
+
+    print(f"SUCCESS: Generated {len(counters)} enhanced job descriptions in: {output_folder}")
+
+if __name__ == "__main__":
+    main()
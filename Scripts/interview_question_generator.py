@@ -1,10 +1,22 @@
 import os
+import sys
 import json
 import logging
 from transformers.pipelines import pipeline
-from transformers import T5Tokenizer, AutoModelForSeq2SeqLM
+from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 import torch
+import threading
+import time
 import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import ctranslate2
+except ImportError:  # Fall back to PyTorch generation
+    ctranslate2 = None
+
+from json_helpers import write_json
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -14,13 +26,136 @@ logger = logging.getLogger(__name__)
 MATCH_RESULTS_DIR = "data/match_results"
 OUTPUT_DIR = "data/interview_questions"
 MODEL_DIR = "models/flan-t5-base"  # local model path
+BATCH_SIZE = int(os.getenv("QUESTION_BATCH_SIZE", "8"))  # prompts per forward pass; sweep 2/4/8
+CHUNK_SIZE = int(os.getenv("QUESTION_CHUNK_SIZE", "64"))  # max pairs held in memory before flushing
+PREFETCH_FILES = 4  # match files read ahead in the background
+MAX_SNIPPET_TOKENS = 384  # resume snippet budget inside the prompt
+SNIPPET_CHARS_PER_TOKEN = 16  # head of a long snippet that is tokenized; T5 pieces average ~4 chars, so 4x headroom
+MAX_NEW_TOKENS = 192  # a handful of questions fits well within this; caps worst-case decode steps
+REPETITION_PENALTY = 1.1  # keeps greedy decoding from looping on the same question
+MODEL_DTYPE = os.getenv("GENERATOR_DTYPE")  # "bfloat16", "float16" or "float32"; auto-selected when unset
+COMPILE_MODEL = os.getenv("GENERATOR_COMPILE", "0").lower() in ("1", "true", "yes")
+GENERATOR_BACKEND = os.getenv("GENERATOR_BACKEND", "torch")  # "torch", "onnx" (needs optimum[onnxruntime]) or "ctranslate2"
+ONNX_MODEL_DIR = os.getenv("GENERATOR_ONNX_DIR", "models/flan-t5-base-onnx")  # exported once, then reused
+CT2_MODEL_DIR = os.getenv("GENERATOR_CT2_DIR", "models/flan-t5-base-ct2")  # converted once, then reused
+# int8 weights with bf16 activations; T5 overflows in fp16, so avoid int8_float16
+CT2_COMPUTE_TYPE = os.getenv("GENERATOR_CT2_COMPUTE_TYPE", "int8_bfloat16")
+CT2_INTRA_THREADS = int(os.getenv("OMP_NUM_THREADS", str(os.cpu_count() or 0)))  # this process's share of the cores
+SAMPLING_TOP_K = 50  # transformers' default top_k when do_sample=True
+# Greedy decoding: a single beam, deterministic output (so cached questions stay valid) and a bounded step count
+GENERATE_KWARGS = {
+    "max_new_tokens": MAX_NEW_TOKENS,
+    "num_beams": 1,
+    "do_sample": False,
+    "repetition_penalty": REPETITION_PENALTY,
+    "use_cache": True,
+}
 
 # Global generator instance
 _generator = None
+_generator_lock = threading.Lock()  # the server may load the generator from several threads at once
 
 # === Load local model ===
+def _cpu_supports_bf16():
+    """Whether the CPU has native bfloat16 instructions (AVX512-BF16 or AMX), per /proc/cpuinfo"""
+    try:
+        with open("/proc/cpuinfo") as cpuinfo:
+            flags = cpuinfo.read()
+    except OSError:
+        return False
+    return "avx512_bf16" in flags or "amx_bf16" in flags
+
+def select_device_and_dtype():
+    """Pick the GPU when available, with a matching reduced-precision dtype"""
+    if torch.cuda.is_available():
+        device = torch.device("cuda:0")
+        # T5 activations can overflow in fp16, so prefer bf16 where the GPU supports it
+        default_dtype = "bfloat16" if torch.cuda.is_bf16_supported() else "float16"
+    else:
+        device = torch.device("cpu")
+        # Without native bf16 instructions the CPU emulates it, slower than fp32
+        default_dtype = "bfloat16" if _cpu_supports_bf16() else "float32"
+    return device, getattr(torch, MODEL_DTYPE or default_dtype)
+
+def load_generator_ort():
+    """Load FLAN-T5 on ONNX Runtime, exporting it on first use; returns None if unavailable"""
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError:
+        logger.warning("WARNING: optimum[onnxruntime] is not installed, falling back to PyTorch")
+        return None
+    
+    try:
+        if os.path.exists(ONNX_MODEL_DIR):
+            logger.info(f"Loading ONNX model from: {ONNX_MODEL_DIR}")
+            return ORTModelForSeq2SeqLM.from_pretrained(ONNX_MODEL_DIR)
+        
+        logger.info(f"Exporting {MODEL_DIR} to ONNX at: {ONNX_MODEL_DIR}")
+        model = ORTModelForSeq2SeqLM.from_pretrained(MODEL_DIR, export=True)
+        model.save_pretrained(ONNX_MODEL_DIR)
+        return model
+    except Exception as e:
+        logger.warning(f"WARNING: Could not load ONNX model, falling back to PyTorch: {e}")
+        return None
+
+class CT2Seq2SeqModel:
+    """generate() over a CTranslate2 translator, taking and returning token ids like a transformers model"""
+    device = torch.device("cpu")  # inputs stay on the host; CTranslate2 manages its own device
+
+    def __init__(self, translator, tokenizer):
+        self.translator = translator
+        self.tokenizer = tokenizer
+
+    def generate(self, input_ids, attention_mask=None, max_new_tokens=MAX_NEW_TOKENS, do_sample=False, temperature=1.0, repetition_penalty=1.0, **kwargs):
+        rows = input_ids.tolist()
+        if attention_mask is not None:
+            rows = [[token for token, keep in zip(row, mask) if keep] for row, mask in zip(rows, attention_mask.tolist())]
+        results = self.translator.translate_batch(
+            [self.tokenizer.convert_ids_to_tokens(row) for row in rows],
+            max_batch_size=len(rows),
+            beam_size=1,
+            max_decoding_length=max_new_tokens,
+            sampling_topk=SAMPLING_TOP_K if do_sample else 1,
+            sampling_temperature=temperature if do_sample else 1.0,
+            repetition_penalty=repetition_penalty
+        )
+        return [self.tokenizer.convert_tokens_to_ids(result.hypotheses[0]) for result in results]
+
+class CT2Generator:
+    """Holds a CTranslate2 model and its tokenizer, exposing .model and .tokenizer like a pipeline"""
+
+    def __init__(self, model, tokenizer):
+        self.model = model
+        self.tokenizer = tokenizer
+
+def load_generator_ct2(tokenizer):
+    """Load FLAN-T5 on CTranslate2, converting it on first use; returns None if unavailable"""
+    if ctranslate2 is None:
+        logger.warning("WARNING: ctranslate2 is not installed, falling back to PyTorch")
+        return None
+    
+    try:
+        if not os.path.isdir(CT2_MODEL_DIR):
+            logger.info(f"Converting {MODEL_DIR} to CTranslate2 at: {CT2_MODEL_DIR}")
+            ctranslate2.converters.TransformersConverter(MODEL_DIR).convert(CT2_MODEL_DIR, quantization=CT2_COMPUTE_TYPE)
+        
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        translator = ctranslate2.Translator(CT2_MODEL_DIR, device=device, compute_type=CT2_COMPUTE_TYPE, intra_threads=CT2_INTRA_THREADS)
+        logger.info(f"Generator running on CTranslate2 ({device}, {CT2_COMPUTE_TYPE})")
+        return CT2Generator(CT2Seq2SeqModel(translator, tokenizer), tokenizer)
+    except Exception as e:
+        logger.warning(f"WARNING: Could not load CTranslate2 model, falling back to PyTorch: {e}")
+        return None
+
 def load_generator():
     """Load the text generation model with comprehensive error handling"""
+    if _generator is not None:
+        return _generator
+    
+    with _generator_lock:
+        return _load_generator_locked()
+
+def _load_generator_locked():
     global _generator
     
     if _generator is not None:
@@ -48,18 +183,48 @@ def load_generator():
         logger.info(f"CWD: {os.getcwd()}")
         
         # Load model and tokenizer separately for better error handling
-        tokenizer = T5Tokenizer.from_pretrained(MODEL_DIR)
-        model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_DIR)
+        tokenizer = AutoTokenizer.from_pretrained(MODEL_DIR, use_fast=True)
+        
+        if GENERATOR_BACKEND == "ctranslate2":
+            _generator = load_generator_ct2(tokenizer)
+            if _generator is not None:
+                logger.info("SUCCESS: Interview question generator loaded successfully")
+                return _generator
+        
+        device, dtype = select_device_and_dtype()
+        model = load_generator_ort() if GENERATOR_BACKEND == "onnx" else None
+        
+        if model is None:
+            model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_DIR, torch_dtype=dtype)
+            model.to(device)
+            model.eval()
+            logger.info(f"Generator running on {device} with {dtype}")
+            
+            if COMPILE_MODEL:
+                try:
+                    # generate() calls forward() once per decoding step; compiling the
+                    # wrapper module would leave the pipeline on the eager forward
+                    model.forward = torch.compile(model.forward, dynamic=True)
+                    logger.info("Compiled generator model with torch.compile")
+                except Exception as e:
+                    logger.warning(f"WARNING: torch.compile unavailable, using eager model: {e}")
         
         # Create pipeline
         _generator = pipeline(
             "text2text-generation",
             model=model,
             tokenizer=tokenizer,
-            max_new_tokens=256,
-            device="cpu"  # Force CPU to avoid CUDA issues
+            max_new_tokens=MAX_NEW_TOKENS,
+            device=model.device
         )
         
+        # Warm up so the first real request doesn't pay one-off initialisation costs
+        try:
+            with torch.inference_mode():
+                _generator("warmup", max_new_tokens=8)
+        except Exception as e:
+            logger.warning(f"WARNING: Generator warmup failed: {e}")
+        
         logger.info("SUCCESS: Interview question generator loaded successfully")
         return _generator
         
@@ -74,12 +239,57 @@ def load_generator():
         return None
 
 # === Prompt template ===
-QUESTION_PROMPT_TEMPLATE = (
-    "You are an AI interview assistant. Given the job title '{job_title}' and the following resume:\n\n"
-    "{resume_snippet}\n\n"
-    "Generate 3 relevant and specific interview questions for this job-resume match. "
+# The static pieces around the two placeholders are tokenized once and reused
+PROMPT_PREFIX = "You are an AI interview assistant. Given the job title '"
+PROMPT_MIDDLE = "' and the following resume:\n\n"
+PROMPT_SUFFIX = (
+    "\n\nGenerate 3 relevant and specific interview questions for this job-resume match. "
     "Focus on technical skills, experience, and cultural fit. Format as a simple list."
 )
+QUESTION_PROMPT_TEMPLATE = PROMPT_PREFIX + "{job_title}" + PROMPT_MIDDLE + "{resume_snippet}" + PROMPT_SUFFIX
+
+# Token ids for the static prompt pieces, keyed by tokenizer
+_prompt_piece_ids = {}
+
+def _get_prompt_piece_ids(tokenizer):
+    """Tokenize the static prompt pieces once per tokenizer"""
+    key = id(tokenizer)
+    if key not in _prompt_piece_ids:
+        _prompt_piece_ids[key] = tuple(
+            tokenizer.encode(piece, add_special_tokens=False)
+            for piece in (PROMPT_PREFIX, PROMPT_MIDDLE, PROMPT_SUFFIX, "...")
+        )
+    return _prompt_piece_ids[key]
+
+def encode_prompt(tokenizer, job_title, resume_snippet, max_snippet_tokens=MAX_SNIPPET_TOKENS):
+    """Build prompt input ids from cached static pieces plus the per-match fields
+
+    The resume snippet is truncated by tokens rather than characters, so every
+    prompt gets the same context budget regardless of language.
+    """
+    prefix_ids, middle_ids, suffix_ids, ellipsis_ids = _get_prompt_piece_ids(tokenizer)
+    # Bound tokenizer work on very long snippets: encode a head of the text, cut at
+    # whitespace so its tokens are a prefix of the full snippet's, and fall back to the
+    # whole snippet in the rare case the head yields fewer tokens than the budget
+    snippet_ids = None
+    max_chars = max_snippet_tokens * SNIPPET_CHARS_PER_TOKEN
+    if len(resume_snippet) > max_chars:
+        head = resume_snippet[:max_chars].rsplit(None, 1)[0]
+        snippet_ids = tokenizer.encode(head, add_special_tokens=False)
+        if len(snippet_ids) <= max_snippet_tokens:
+            snippet_ids = None
+    if snippet_ids is None:
+        snippet_ids = tokenizer.encode(resume_snippet, add_special_tokens=False)
+    if len(snippet_ids) > max_snippet_tokens:
+        snippet_ids = snippet_ids[:max_snippet_tokens] + ellipsis_ids
+    return (
+        prefix_ids
+        + tokenizer.encode(job_title, add_special_tokens=False)
+        + middle_ids
+        + snippet_ids
+        + suffix_ids
+        + [tokenizer.eos_token_id]
+    )
 
 def generate_interview_questions(job_title, resume_snippet, generator=None):
     """Generate interview questions for a specific job-resume match"""
@@ -96,26 +306,19 @@ def generate_interview_questions(job_title, resume_snippet, generator=None):
         if not job_title or not resume_snippet:
             return "Error: Job title and resume snippet are required"
         
-        # Truncate resume snippet if too long
-        max_length = 1000
-        if len(resume_snippet) > max_length:
-            resume_snippet = resume_snippet[:max_length] + "..."
-        
-        prompt = QUESTION_PROMPT_TEMPLATE.format(
-            job_title=job_title,
-            resume_snippet=resume_snippet
-        )
+        model, tokenizer = generator.model, generator.tokenizer
+        input_ids = torch.tensor([encode_prompt(tokenizer, job_title, resume_snippet)], device=model.device)
         
         logger.info(f"Generating questions for job: {job_title}")
         
         # Generate with error handling
-        with torch.no_grad():
-            output = generator(prompt, max_length=512, do_sample=True, temperature=0.7)
+        with torch.inference_mode():
+            generated = model.generate(input_ids=input_ids, **GENERATE_KWARGS)
+        generated_text = tokenizer.decode(generated[0], skip_special_tokens=True).strip()
         
-        if output and len(output) > 0:
-            generated_text = output[0]["generated_text"]
+        if generated_text:
             logger.info("Questions generated successfully")
-            return generated_text.strip()
+            return generated_text
         else:
             logger.warning("No output generated from model")
             return "Error: No questions generated. Please try again."
@@ -124,67 +327,170 @@ def generate_interview_questions(job_title, resume_snippet, generator=None):
         logger.error(f"ERROR: Error generating questions: {e}")
         return f"Error generating questions: {str(e)}"
 
-# === Main processing ===
-def main():
-    """Main function to process match results and generate interview questions"""
-    if not os.path.exists(OUTPUT_DIR):
-        os.makedirs(OUTPUT_DIR)
+def generate_interview_questions_batch(pairs, generator=None, batch_size=BATCH_SIZE, max_time=None):
+    """Generate interview questions for many (job_title, resume_snippet) pairs in batches
 
-    generator = load_generator()
-    if generator is None:
-        logger.error("Cannot proceed without generator model")
-        return
+    Prompts are encoded from pre-tokenized template pieces and fed straight
+    to model.generate, skipping the pipeline's per-call overhead. They are
+    sorted by token length before batching so each batch pads to a similar
+    size; results are returned in the original order.
 
-    processed_count = 0
-    error_count = 0
+    Returns one (ok, text) pair per input: ok is False when text is an error
+    message rather than generated questions. With max_time (seconds), the
+    whole call stops generating once that much time has passed; the pairs it
+    did not finish come back as not ok.
+    """
+    if generator is None:
+        generator = _generator or load_generator()
+        if generator is None:
+            logger.error("Could not load question generator model")
+            return [(False, "Error: Could not load question generator model. Please check if the model files are properly installed.")] * len(pairs)
 
-    for filename in os.listdir(MATCH_RESULTS_DIR):
-        if not filename.endswith(".json"):
+    deadline = None if max_time is None else time.monotonic() + max_time
+    results = [None] * len(pairs)
+    model, tokenizer = generator.model, generator.tokenizer
+    encoded = []
+    for idx, (job_title, resume_snippet) in enumerate(pairs):
+        if not job_title or not resume_snippet:
+            results[idx] = (False, "Error: Job title and resume snippet are required")
             continue
+        encoded.append((idx, encode_prompt(tokenizer, job_title, resume_snippet)))
+
+    if not encoded:
+        return results
+
+    # Bucket by token length to minimise padding inside each batch
+    encoded.sort(key=lambda item: len(item[1]))
 
-        file_path = os.path.join(MATCH_RESULTS_DIR, filename)
+    for start in range(0, len(encoded), batch_size):
+        chunk = encoded[start:start + batch_size]
+        generate_kwargs = {}
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                for idx, _ in encoded[start:]:
+                    results[idx] = (False, "Interview questions generation timed out. Please try again.")
+                break
+            # Stops decoding mid-batch on PyTorch; CTranslate2 is bounded by max_new_tokens alone
+            generate_kwargs["max_time"] = remaining
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                match_data_list = json.load(f)
+            batch = tokenizer.pad(
+                {"input_ids": [ids for _, ids in chunk]},
+                return_tensors="pt"
+            ).to(model.device)
+            with torch.inference_mode():
+                generated = model.generate(**batch, **GENERATE_KWARGS, **generate_kwargs)
+            texts = tokenizer.batch_decode(generated, skip_special_tokens=True)
         except Exception as e:
-            logger.error(f"ERROR: Error reading {filename}: {e}")
-            error_count += 1
+            logger.error(f"ERROR: Error generating questions in batch: {e}")
+            for idx, _ in chunk:
+                results[idx] = (False, f"Error generating questions: {str(e)}")
             continue
 
-        job_title = filename.replace(".json", "").replace("_", " ")
-        output_data = []
+        # Output cut off by the deadline is returned, but marked as not ok so it is not cached
+        timed_out = deadline is not None and time.monotonic() >= deadline
+        for (idx, _), text in zip(chunk, texts):
+            text = text.strip()
+            if text:
+                results[idx] = (not timed_out, text)
+            else:
+                results[idx] = (False, "Error: No questions generated. Please try again.")
 
-        for match in match_data_list:
-            resume_text = match.get("resume_snippet", "").strip()
-            if not resume_text:
-                continue
+    return results
 
-            try:
-                questions = generate_interview_questions(job_title, resume_text, generator)
-                output_data.append({
-                    "job_title": job_title,
-                    "resume_snippet": resume_text,
-                    "interview_questions": questions
-                })
-                logger.info(f"SUCCESS: Generated questions for: {job_title}")
-            except Exception as e:
-                logger.error(f"ERROR: Error generating questions for {job_title}: {e}")
-                error_count += 1
-                continue
+# === Main processing ===
+def _read_match_file(filename):
+    """Load one match result file and return its job title and resume snippets"""
+    file_path = os.path.join(MATCH_RESULTS_DIR, filename)
+    with open(file_path, "r", encoding="utf-8") as f:
+        match_data_list = json.load(f)
+
+    job_title = filename.replace(".json", "").replace("_", " ")
+    snippets = [match.get("resume_snippet", "").strip() for match in match_data_list]
+    return job_title, [snippet for snippet in snippets if snippet]
+
+def _flush_chunk(file_entries, pairs, generator):
+    """Generate questions for a chunk of files and save each file's output"""
+    processed_count = 0
+    error_count = 0
+    questions_list = [text for _, text in generate_interview_questions_batch(pairs, generator)]
+
+    for filename, job_title, start, end in file_entries:
+        output_data = [
+            {
+                "job_title": job_title,
+                "resume_snippet": resume_text,
+                "interview_questions": questions
+            }
+            for (_, resume_text), questions in zip(pairs[start:end], questions_list[start:end])
+        ]
+        if output_data:
+            logger.info(f"SUCCESS: Generated questions for: {job_title}")
 
         # Save generated questions
         if output_data:
             output_path = os.path.join(OUTPUT_DIR, filename)
             try:
-                with open(output_path, "w", encoding="utf-8") as f:
-                    json.dump(output_data, f, ensure_ascii=False, indent=2)
+                write_json(output_path, output_data)
                 logger.info(f"💾 Saved: {output_path}")
                 processed_count += 1
             except Exception as e:
                 logger.error(f"ERROR: Failed to save {output_path}: {e}")
                 error_count += 1
 
+    return processed_count, error_count
+
+def main():
+    """Main function to process match results and generate interview questions"""
+    if not os.path.exists(OUTPUT_DIR):
+        os.makedirs(OUTPUT_DIR)
+
+    generator = load_generator()
+    if generator is None:
+        logger.error("Cannot proceed without generator model")
+        return False
+
+    processed_count = 0
+    error_count = 0
+
+    filenames = [f for f in os.listdir(MATCH_RESULTS_DIR) if f.endswith(".json")]
+
+    # Pairs are accumulated across files into bounded chunks so the model runs on
+    # full batches without holding the whole corpus in memory. Upcoming files are
+    # read on a background thread while the model works on the current chunk.
+    file_entries = []
+    pairs = []
+    with ThreadPoolExecutor(max_workers=1) as io_pool:
+        pending = deque(io_pool.submit(_read_match_file, f) for f in filenames[:PREFETCH_FILES])
+        for idx, filename in enumerate(filenames):
+            future = pending.popleft()
+            if idx + PREFETCH_FILES < len(filenames):
+                pending.append(io_pool.submit(_read_match_file, filenames[idx + PREFETCH_FILES]))
+
+            try:
+                job_title, snippets = future.result()
+            except Exception as e:
+                logger.error(f"ERROR: Error reading {filename}: {e}")
+                error_count += 1
+                continue
+
+            start = len(pairs)
+            pairs.extend((job_title, snippet) for snippet in snippets)
+            file_entries.append((filename, job_title, start, len(pairs)))
+
+            if len(pairs) >= CHUNK_SIZE:
+                processed, errors = _flush_chunk(file_entries, pairs, generator)
+                processed_count += processed
+                error_count += errors
+                file_entries, pairs = [], []
+
+    if file_entries:
+        processed, errors = _flush_chunk(file_entries, pairs, generator)
+        processed_count += processed
+        error_count += errors
+
     logger.info(f"\n Summary: Processed {processed_count} files, {error_count} errors")
+    return processed_count > 0 or error_count == 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,14 @@
+# Scripts/json_helpers.py
+
+import orjson
+
+JSON_WRITE_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+def dumps_json(obj):
+    """Serialize obj to indented UTF-8 JSON bytes with orjson"""
+    return orjson.dumps(obj, option=JSON_WRITE_OPTIONS)
+
+def write_json(path, obj):
+    """Serialize obj with orjson and write it to path as UTF-8 bytes"""
+    with open(path, "wb") as f:
+        f.write(dumps_json(obj))
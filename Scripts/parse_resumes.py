@@ -1,11 +1,23 @@
 import os
-import json
+import sys
 import spacy
-from parser_helpers import extract_email, extract_phone, extract_education, extract_experience, extract_skills
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from json_helpers import dumps_json
+from parser_helpers import ParsedText, extract_email, extract_phone, extract_education, extract_experience, extract_skills
+
+# spaCy components not needed for PERSON entity extraction
+SPACY_DISABLED_COMPONENTS = ["tagger", "parser", "lemmatizer", "attribute_ruler"]
+SPACY_BATCH_SIZE = 32
+
+# Resumes are parsed in chunks across a process pool; each worker batches its chunk through spaCy
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(os.cpu_count() or 1)))
+PARSE_CHUNK_SIZE = 64
 
 # Load spaCy model
 try:
-    nlp = spacy.load("en_core_web_sm")
+    nlp = spacy.load("en_core_web_sm", disable=SPACY_DISABLED_COMPONENTS)
     print("SUCCESS: spaCy model loaded successfully")
 except Exception as e:
     print(f"ERROR: Error loading spaCy model: {e}")
@@ -15,14 +27,20 @@ RESUME_DIR = "data/resumes"
 TRANSLATED_DIR = "data/translated"
 OUTPUT_DIR = "data/parsed"
 
-def parse_resume(text):
-    """Parse resume text and extract structured information"""
+def parse_resume(text, doc=None):
+    """Parse resume text and extract structured information
+
+    A pre-processed spaCy ``doc`` (e.g. from ``nlp.pipe``) can be passed to
+    skip running the pipeline again.
+    """
     if nlp is None:
         print("ERROR: spaCy model not available, using basic parsing")
         return parse_resume_basic(text)
     
     try:
-        doc = nlp(text)
+        if doc is None:
+            doc = nlp(text)
+        pt = ParsedText(text)  # Lowered and split once for all extractors
         
         # Extract name (first entity that looks like a person)
         name = None
@@ -33,11 +51,11 @@ def parse_resume(text):
         
         parsed = {
             "name": name,
-            "email": extract_email(text),
-            "phone": extract_phone(text),
-            "education": extract_education(text),
-            "experience": extract_experience(text),
-            "skills": extract_skills(text),
+            "email": extract_email(pt),
+            "phone": extract_phone(pt),
+            "education": extract_education(pt),
+            "experience": extract_experience(pt),
+            "skills": extract_skills(pt),
             "text": text  # Keep original text for vector storage
         }
         return parsed
@@ -47,17 +65,71 @@ def parse_resume(text):
 
 def parse_resume_basic(text):
     """Basic parsing without spaCy"""
+    pt = ParsedText(text)  # Lowered and split once for all extractors
     parsed = {
         "name": None,
-        "email": extract_email(text),
-        "phone": extract_phone(text),
-        "education": extract_education(text),
-        "experience": extract_experience(text),
-        "skills": extract_skills(text),
+        "email": extract_email(pt),
+        "phone": extract_phone(pt),
+        "education": extract_education(pt),
+        "experience": extract_experience(pt),
+        "skills": extract_skills(pt),
         "text": text
     }
     return parsed
 
+def _output_filename(filename):
+    """Map a resume .txt filename to its parsed .json filename"""
+    if filename.endswith("_translated.txt"):
+        return filename.replace("_translated.txt", ".json")
+    return filename.replace(".txt", ".json")
+
+def _parse_chunk(input_dir, filenames):
+    """Read and parse a chunk of resume files (runs in a worker process)
+
+    The worker reuses the module-level spaCy model, inherited on fork or loaded
+    once per worker on spawn. Returns (filename, out_filename, json_bytes, error)
+    tuples so the parent only has to write bytes to disk.
+    """
+    results = []
+    entries = []
+    for filename in filenames:
+        input_path = os.path.join(input_dir, filename)
+        try:
+            with open(input_path, 'r', encoding='utf-8') as f:
+                entries.append((f.read(), filename))
+        except Exception as e:
+            results.append((filename, None, None, str(e)))
+
+    if nlp is None:
+        results.extend(_parse_text(text, None, filename) for text, filename in entries)
+        return results
+
+    done = 0
+    try:
+        for doc, filename in nlp.pipe(entries, batch_size=SPACY_BATCH_SIZE, as_tuples=True):
+            results.append(_parse_text(doc.text, doc, filename))
+            done += 1
+    except Exception as e:
+        # A bad text fails its whole spaCy batch; parse the rest one at a time so only that file errors
+        print(f"WARNING: spaCy batch failed ({e}), parsing the remaining files one by one")
+        for text, filename in entries[done:]:
+            try:
+                doc = nlp(text)
+            except Exception as e:
+                results.append((filename, None, None, str(e)))
+                continue
+            results.append(_parse_text(text, doc, filename))
+
+    return results
+
+def _parse_text(text, doc, filename):
+    """Parse one resume into a (filename, out_filename, json_bytes, error) result"""
+    try:
+        parsed = parse_resume(text, doc)
+        return (filename, _output_filename(filename), dumps_json(parsed), None)
+    except Exception as e:
+        return (filename, None, None, str(e))
+
 def process_directory(input_dir, output_dir):
     """Process all resume files in a directory"""
     if not os.path.exists(input_dir):
@@ -69,34 +141,35 @@ def process_directory(input_dir, output_dir):
     processed_count = 0
     error_count = 0
     
-    for filename in os.listdir(input_dir):
-        if not filename.endswith(".txt"):
-            continue
-            
-        input_path = os.path.join(input_dir, filename)
-        try:
-            with open(input_path, 'r', encoding='utf-8') as f:
-                text = f.read()
-
-            parsed = parse_resume(text)
-
-            # Create output filename
-            if filename.endswith("_translated.txt"):
-                out_filename = filename.replace("_translated.txt", ".json")
-            else:
-                out_filename = filename.replace(".txt", ".json")
-            
-            out_path = os.path.join(output_dir, out_filename)
-            
-            with open(out_path, 'w', encoding='utf-8') as out_f:
-                json.dump(parsed, out_f, indent=2, ensure_ascii=False)
-
-            processed_count += 1
-            print(f"SUCCESS: Parsed: {filename}")
-            
-        except Exception as e:
-            error_count += 1
-            print(f"ERROR: Error parsing {filename}: {e}")
+    filenames = [f for f in os.listdir(input_dir) if f.endswith(".txt")]
+    chunks = [filenames[i:i + PARSE_CHUNK_SIZE] for i in range(0, len(filenames), PARSE_CHUNK_SIZE)]
+
+    executor = None
+    if PARSE_WORKERS > 1 and len(chunks) > 1:
+        executor = ProcessPoolExecutor(max_workers=min(PARSE_WORKERS, len(chunks)))
+        chunk_results = executor.map(_parse_chunk, repeat(input_dir), chunks)
+    else:
+        chunk_results = map(_parse_chunk, repeat(input_dir), chunks)
+
+    try:
+        for results in chunk_results:
+            for filename, out_filename, blob, error in results:
+                if error is not None:
+                    error_count += 1
+                    print(f"ERROR: Error parsing {filename}: {error}")
+                    continue
+
+                try:
+                    with open(os.path.join(output_dir, out_filename), 'wb') as out_f:
+                        out_f.write(blob)
+                    processed_count += 1
+                    print(f"SUCCESS: Parsed: {filename}")
+                except Exception as e:
+                    error_count += 1
+                    print(f"ERROR: Error parsing {filename}: {e}")
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
     return processed_count, error_count
 
@@ -123,6 +196,7 @@ def main():
     print(f"   Processed: {total_processed} resumes")
     print(f"   Errors: {total_errors}")
     print(f"   Output directory: {OUTPUT_DIR}")
+    return total_processed > 0 or total_errors == 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(0 if main() else 1)
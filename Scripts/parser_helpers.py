@@ -3,10 +3,180 @@
 import re
 import dateparser
 
+try:
+    import ahocorasick
+except ImportError:  # Fall back to per-term substring scans
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:  # Fall back to one re.search per pattern
+    hyperscan = None
+
+# === Keyword lists ===
+# Common degree patterns
+DEGREES = [
+    "B.Sc", "M.Sc", "Bachelor", "Master", "B.E", "B.Tech", "PhD", "MBA",
+    "Bachelor's", "Master's", "Doctorate", "Associate", "Diploma",
+    "B.A", "M.A", "B.S", "M.S", "Ph.D", "D.Phil"
+]
+
+# Keywords that indicate work experience
+EXPERIENCE_KEYWORDS = [
+    "experience", "developer", "engineer", "manager", "analyst",
+    "consultant", "specialist", "coordinator", "assistant", "director",
+    "lead", "senior", "junior", "intern", "freelance", "contractor"
+]
+
+# Comprehensive list of technical skills
+TECHNICAL_SKILLS = [
+    # Programming Languages
+    "Python", "Java", "C++", "C#", "JavaScript", "TypeScript", "PHP", "Ruby", "Go", "Rust", "Swift", "Kotlin",
+    "Scala", "Perl", "R", "MATLAB", "Julia", "Dart", "Elixir", "Clojure", "Haskell", "Lua",
+
+    # Web Technologies
+    "HTML", "CSS", "React", "Angular", "Vue.js", "Node.js", "Express.js", "Django", "Flask", "Spring",
+    "ASP.NET", "Laravel", "Symfony", "Ruby on Rails", "FastAPI", "GraphQL", "REST API",
+
+    # Databases
+    "SQL", "MySQL", "PostgreSQL", "MongoDB", "Redis", "Cassandra", "Oracle", "SQLite", "MariaDB",
+    "Neo4j", "Elasticsearch", "DynamoDB", "Firebase", "Supabase",
+
+    # Cloud & DevOps
+    "AWS", "Azure", "Google Cloud", "Docker", "Kubernetes", "Jenkins", "GitLab CI", "GitHub Actions",
+    "Terraform", "Ansible", "Chef", "Puppet", "Vagrant", "Vagrant",
+
+    # Data Science & ML
+    "TensorFlow", "PyTorch", "Scikit-learn", "Pandas", "NumPy", "Matplotlib", "Seaborn", "Plotly",
+    "Jupyter", "Apache Spark", "Hadoop", "Kafka", "Airflow", "MLflow", "Kubeflow",
+
+    # Mobile Development
+    "Android", "iOS", "React Native", "Flutter", "Xamarin", "Ionic", "Cordova",
+
+    # Other Technologies
+    "Git", "SVN", "Linux", "Unix", "Windows", "MacOS", "Shell Scripting", "Bash", "PowerShell",
+    "Vim", "Emacs", "VS Code", "IntelliJ", "Eclipse", "Xcode", "Android Studio",
+
+    # Frameworks & Libraries
+    "Bootstrap", "Tailwind CSS", "Sass", "Less", "Webpack", "Babel", "Gulp", "Grunt",
+    "Jest", "Mocha", "Chai", "Cypress", "Selenium", "Playwright",
+
+    # Methodologies
+    "Agile", "Scrum", "Kanban", "Waterfall", "DevOps", "CI/CD", "TDD", "BDD", "DDD"
+]
+
+LANGUAGES = [
+    "English", "Spanish", "French", "German", "Italian", "Portuguese", "Russian", "Chinese",
+    "Japanese", "Korean", "Arabic", "Hindi", "Bengali", "Dutch", "Swedish", "Norwegian",
+    "Danish", "Finnish", "Polish", "Czech", "Hungarian", "Turkish", "Greek", "Hebrew"
+]
+
+CERTIFICATION_KEYWORDS = [
+    "certified", "certification", "certificate", "accredited", "licensed",
+    "AWS Certified", "Microsoft Certified", "Google Certified", "Cisco Certified",
+    "PMP", "PMP®", "PRINCE2", "ITIL", "Scrum Master", "Product Owner"
+]
+
+# === Precompiled patterns ===
+EMAIL_RE = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
+
+# Phone number formats, merged into one alternation so the text is scanned once
+PHONE_RE = re.compile(
+    r"(?:(\+?\d{1,3})?[\s\-]?\(?\d{2,4}\)?[\s\-]?\d{3,4}[\s\-]?\d{3,4})"  # International format
+    r"|(?:\(\d{3}\)\s?\d{3}-\d{4})"  # US format (555) 123-4567
+    r"|(?:\d{3}-\d{3}-\d{4})"  # US format 555-123-4567
+    r"|(?:\d{10})"  # 10 digits
+)
+
+CONTACT_PATTERNS = (EMAIL_RE, PHONE_RE)
+
+def _build_contact_database():
+    """Compile the contact patterns into one Hyperscan database reporting leftmost match starts"""
+    if hyperscan is None:
+        return None
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.pattern.encode("ascii") for pattern in CONTACT_PATTERNS],
+            ids=list(range(len(CONTACT_PATTERNS))),
+            elements=len(CONTACT_PATTERNS),
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(CONTACT_PATTERNS)
+        )
+        return database
+    except Exception as e:
+        print(f"WARNING: Could not compile Hyperscan contact patterns, using re: {e}")
+        return None
+
+_CONTACT_DB = _build_contact_database()
+
+# === Preprocessed text ===
+class ParsedText:
+    """Resume text with its lowercased form and line splits computed once
+
+    Pass one instance to every extractor so the text is lowered and split a
+    single time per resume instead of once per extractor.
+    """
+    __slots__ = ("raw", "lower", "lines", "lines_lower")
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.lower = raw.lower()
+        self.lines = raw.split('\n')
+        self.lines_lower = self.lower.split('\n')
+
+def _as_parsed_text(text):
+    """Accept either a plain string or a ParsedText"""
+    return text if isinstance(text, ParsedText) else ParsedText(text)
+
+# === Multi-pattern matchers ===
+# Lowercased once at import so no per-call list rebuilding is needed
+_DEGREES_LC = tuple(term.lower() for term in DEGREES)
+_EXPERIENCE_LC = tuple(term.lower() for term in EXPERIENCE_KEYWORDS)
+_SKILLS_LC = tuple(term.lower() for term in TECHNICAL_SKILLS)
+_LANGUAGES_LC = tuple(term.lower() for term in LANGUAGES)
+_CERTIFICATIONS_LC = tuple(term.lower() for term in CERTIFICATION_KEYWORDS)
+
+def _build_automaton(terms_lc):
+    """Build an Aho-Corasick automaton over the lowercased terms"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for term in terms_lc:
+        automaton.add_word(term, term)
+    automaton.make_automaton()
+    return automaton
+
+_DEGREES_AC = _build_automaton(_DEGREES_LC)
+_EXPERIENCE_AC = _build_automaton(_EXPERIENCE_LC)
+_SKILLS_AC = _build_automaton(_SKILLS_LC)
+_LANGUAGES_AC = _build_automaton(_LANGUAGES_LC)
+_CERTIFICATIONS_AC = _build_automaton(_CERTIFICATIONS_LC)
+
+def _find_terms(text_lower, terms, terms_lc, automaton):
+    """Return the terms (in list order) that occur as substrings of text_lower"""
+    if automaton is None:
+        return [term for term, term_lc in zip(terms, terms_lc) if term_lc in text_lower]
+    found = {match for _, match in automaton.iter(text_lower)}
+    return [term for term, term_lc in zip(terms, terms_lc) if term_lc in found]
+
+def _has_any_term(text_lower, terms_lc, automaton):
+    """Check whether any term occurs as a substring of text_lower"""
+    if automaton is None:
+        return any(term_lc in text_lower for term_lc in terms_lc)
+    return next(automaton.iter(text_lower), None) is not None
+
+def _matching_lines(pt, terms_lc, automaton):
+    """Return stripped lines containing at least one of the terms"""
+    return [
+        line.strip()
+        for line, line_lower in zip(pt.lines, pt.lines_lower)
+        if _has_any_term(line_lower, terms_lc, automaton)
+    ]
+
 def extract_email(text):
     """Extract email addresses from text"""
     try:
-        match = re.search(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", text)
+        match = EMAIL_RE.search(text.raw if isinstance(text, ParsedText) else text)
         return match.group(0) if match else None
     except Exception as e:
         print(f"ERROR: Error extracting email: {e}")
@@ -15,42 +185,46 @@ def extract_email(text):
 def extract_phone(text):
     """Extract phone numbers from text"""
     try:
-        # Multiple phone number patterns
-        patterns = [
-            r"(\+?\d{1,3})?[\s\-]?\(?\d{2,4}\)?[\s\-]?\d{3,4}[\s\-]?\d{3,4}",  # International format
-            r"\(\d{3}\)\s?\d{3}-\d{4}",  # US format (555) 123-4567
-            r"\d{3}-\d{3}-\d{4}",  # US format 555-123-4567
-            r"\d{10}",  # 10 digits
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                return match.group(0)
-        return None
+        match = PHONE_RE.search(text.raw if isinstance(text, ParsedText) else text)
+        return match.group(0) if match else None
     except Exception as e:
         print(f"ERROR: Error extracting phone: {e}")
         return None
 
-def extract_education(text):
-    """Extract education information from text"""
+def extract_contact(text):
+    """Extract the first email address and phone number from text, as (email, phone)
+
+    With Hyperscan, both patterns are found in a single pass over the text; the
+    re pattern is then matched at the leftmost start Hyperscan reported, so the
+    result is the same as extract_email/extract_phone. Non-ASCII text goes
+    through re directly, since \\d and \\s are Unicode-aware there.
+    """
+    raw = text.raw if isinstance(text, ParsedText) else text
+    if _CONTACT_DB is None or not raw.isascii():
+        return extract_email(raw), extract_phone(raw)
+    
     try:
-        # Common degree patterns
-        degrees = [
-            "B.Sc", "M.Sc", "Bachelor", "Master", "B.E", "B.Tech", "PhD", "MBA",
-            "Bachelor's", "Master's", "Doctorate", "Associate", "Diploma",
-            "B.A", "M.A", "B.S", "M.S", "Ph.D", "D.Phil"
-        ]
-        
-        lines = text.split('\n')
-        education = []
+        starts = [None] * len(CONTACT_PATTERNS)
         
-        for line in lines:
-            line_lower = line.lower()
-            if any(deg.lower() in line_lower for deg in degrees):
-                education.append(line.strip())
+        def on_match(pattern_id, start, end, flags, context):
+            if starts[pattern_id] is None or start < starts[pattern_id]:
+                starts[pattern_id] = start
         
-        return education
+        _CONTACT_DB.scan(raw.encode("ascii"), match_event_handler=on_match)
+        matches = [
+            pattern.match(raw, start) if start is not None else None
+            for pattern, start in zip(CONTACT_PATTERNS, starts)
+        ]
+        email, phone = (match.group(0) if match else None for match in matches)
+        return email, phone
+    except Exception as e:
+        print(f"ERROR: Error extracting contact info: {e}")
+        return extract_email(raw), extract_phone(raw)
+
+def extract_education(text):
+    """Extract education information from text"""
+    try:
+        return _matching_lines(_as_parsed_text(text), _DEGREES_LC, _DEGREES_AC)
     except Exception as e:
         print(f"ERROR: Error extracting education: {e}")
         return []
@@ -58,22 +232,7 @@ def extract_education(text):
 def extract_experience(text):
     """Extract work experience information from text"""
     try:
-        # Keywords that indicate work experience
-        experience_keywords = [
-            "experience", "developer", "engineer", "manager", "analyst",
-            "consultant", "specialist", "coordinator", "assistant", "director",
-            "lead", "senior", "junior", "intern", "freelance", "contractor"
-        ]
-        
-        lines = text.split('\n')
-        experiences = []
-        
-        for line in lines:
-            line_lower = line.lower()
-            if any(keyword in line_lower for keyword in experience_keywords):
-                experiences.append(line.strip())
-        
-        return experiences
+        return _matching_lines(_as_parsed_text(text), _EXPERIENCE_LC, _EXPERIENCE_AC)
     except Exception as e:
         print(f"ERROR: Error extracting experience: {e}")
         return []
@@ -81,51 +240,7 @@ def extract_experience(text):
 def extract_skills(text):
     """Extract technical skills from text"""
     try:
-        # Comprehensive list of technical skills
-        technical_skills = [
-            # Programming Languages
-            "Python", "Java", "C++", "C#", "JavaScript", "TypeScript", "PHP", "Ruby", "Go", "Rust", "Swift", "Kotlin",
-            "Scala", "Perl", "R", "MATLAB", "Julia", "Dart", "Elixir", "Clojure", "Haskell", "Lua",
-            
-            # Web Technologies
-            "HTML", "CSS", "React", "Angular", "Vue.js", "Node.js", "Express.js", "Django", "Flask", "Spring",
-            "ASP.NET", "Laravel", "Symfony", "Ruby on Rails", "FastAPI", "GraphQL", "REST API",
-            
-            # Databases
-            "SQL", "MySQL", "PostgreSQL", "MongoDB", "Redis", "Cassandra", "Oracle", "SQLite", "MariaDB",
-            "Neo4j", "Elasticsearch", "DynamoDB", "Firebase", "Supabase",
-            
-            # Cloud & DevOps
-            "AWS", "Azure", "Google Cloud", "Docker", "Kubernetes", "Jenkins", "GitLab CI", "GitHub Actions",
-            "Terraform", "Ansible", "Chef", "Puppet", "Vagrant", "Vagrant",
-            
-            # Data Science & ML
-            "TensorFlow", "PyTorch", "Scikit-learn", "Pandas", "NumPy", "Matplotlib", "Seaborn", "Plotly",
-            "Jupyter", "Apache Spark", "Hadoop", "Kafka", "Airflow", "MLflow", "Kubeflow",
-            
-            # Mobile Development
-            "Android", "iOS", "React Native", "Flutter", "Xamarin", "Ionic", "Cordova",
-            
-            # Other Technologies
-            "Git", "SVN", "Linux", "Unix", "Windows", "MacOS", "Shell Scripting", "Bash", "PowerShell",
-            "Vim", "Emacs", "VS Code", "IntelliJ", "Eclipse", "Xcode", "Android Studio",
-            
-            # Frameworks & Libraries
-            "Bootstrap", "Tailwind CSS", "Sass", "Less", "Webpack", "Babel", "Gulp", "Grunt",
-            "Jest", "Mocha", "Chai", "Cypress", "Selenium", "Playwright",
-            
-            # Methodologies
-            "Agile", "Scrum", "Kanban", "Waterfall", "DevOps", "CI/CD", "TDD", "BDD", "DDD"
-        ]
-        
-        found_skills = []
-        text_lower = text.lower()
-        
-        for skill in technical_skills:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
-        
-        return found_skills
+        return _find_terms(_as_parsed_text(text).lower, TECHNICAL_SKILLS, _SKILLS_LC, _SKILLS_AC)
     except Exception as e:
         print(f"ERROR: Error extracting skills: {e}")
         return []
@@ -133,20 +248,7 @@ def extract_skills(text):
 def extract_languages(text):
     """Extract language skills from text"""
     try:
-        languages = [
-            "English", "Spanish", "French", "German", "Italian", "Portuguese", "Russian", "Chinese",
-            "Japanese", "Korean", "Arabic", "Hindi", "Bengali", "Dutch", "Swedish", "Norwegian",
-            "Danish", "Finnish", "Polish", "Czech", "Hungarian", "Turkish", "Greek", "Hebrew"
-        ]
-        
-        found_languages = []
-        text_lower = text.lower()
-        
-        for language in languages:
-            if language.lower() in text_lower:
-                found_languages.append(language)
-        
-        return found_languages
+        return _find_terms(_as_parsed_text(text).lower, LANGUAGES, _LANGUAGES_LC, _LANGUAGES_AC)
     except Exception as e:
         print(f"ERROR: Error extracting languages: {e}")
         return []
@@ -154,21 +256,7 @@ def extract_languages(text):
 def extract_certifications(text):
     """Extract certifications from text"""
     try:
-        certification_keywords = [
-            "certified", "certification", "certificate", "accredited", "licensed",
-            "AWS Certified", "Microsoft Certified", "Google Certified", "Cisco Certified",
-            "PMP", "PMP®", "PRINCE2", "ITIL", "Scrum Master", "Product Owner"
-        ]
-        
-        lines = text.split('\n')
-        certifications = []
-        
-        for line in lines:
-            line_lower = line.lower()
-            if any(keyword.lower() in line_lower for keyword in certification_keywords):
-                certifications.append(line.strip())
-        
-        return certifications
+        return _matching_lines(_as_parsed_text(text), _CERTIFICATIONS_LC, _CERTIFICATIONS_AC)
     except Exception as e:
         print(f"ERROR: Error extracting certifications: {e}")
         return []
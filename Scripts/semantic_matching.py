@@ -1,13 +1,51 @@
 import os
+import sys
 import json
-from sentence_transformers import SentenceTransformer
-import chromadb
-from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
+import shelve
+from hashlib import blake2b
+
+import numpy as np
+
+try:
+    import faiss
+except ImportError:  # Fall back to the numpy matrix search
+    faiss = None
+
+from json_helpers import write_json
+from vector_store import EMBEDDING_BACKEND, get_embedding_model, init_chroma
 
-CHROMA_DB_DIR = "data/chroma_db"
 JOB_DESCRIPTION_FOLDER = "data/job_descriptions"
 MATCH_RESULT_FOLDER = "data/match_results"
 TOP_K = 5
+EMBEDDING_MODEL_PATH = "models/sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_CACHE_PATH = "data/emb_cache.db"  # job description embeddings keyed by text hash
+# Corpora up to this size are searched in memory with one matmul; larger ones go through Chroma
+MATRIX_SEARCH_MAX_RESUMES = int(os.getenv("MATRIX_SEARCH_MAX_RESUMES", "50000"))
+RETRIEVAL_BACKEND = os.getenv("RETRIEVAL_BACKEND", "matrix")  # "matrix" (numpy), "faiss" (needs faiss-cpu) or "chroma"
+FAISS_QUANTIZATION = os.getenv("FAISS_QUANTIZATION", "none")  # "none" (float32) or "int8" scalar-quantized vectors
+
+# Global instances, loaded lazily and reused across queries
+_embedder = None
+_resume_index = None  # (collection, count, index) so the matrix is rebuilt only when the collection changes
+
+def _get_embedder():
+    """Lazy load the embedding model used to embed job descriptions
+
+    Shared with vector_store so queries always use the same backend that
+    embedded the resume collection.
+    """
+    global _embedder
+    if _embedder is None:
+        _embedder = get_embedding_model()
+    return _embedder
+
+def _get_collection():
+    """Lazy load the resume collection from ChromaDB
+
+    Shared with vector_store so the process holds a single Chroma client.
+    """
+    _, collection = init_chroma()
+    return collection
 
 def build_job_description_text(data):
     """Build a comprehensive job description text from structured data"""
@@ -29,25 +67,195 @@ def build_job_description_text(data):
     
     return "\n\n".join(parts).strip()
 
-def get_top_matches(job_text, top_k=TOP_K):
+def _get_resume_index(collection):
+    """Load every resume embedding into one float32 matrix, or None if the corpus is too large
+
+    Squared norms are precomputed so squared L2 distances (Chroma's default
+    metric) reduce to a single matrix product per query batch.
+    """
+    global _resume_index
+    count = collection.count()
+    if _resume_index is not None and _resume_index[0] is collection and _resume_index[1] == count:
+        return _resume_index[2]
+
+    if RETRIEVAL_BACKEND == "chroma" or count == 0 or count > MATRIX_SEARCH_MAX_RESUMES:
+        index = None
+    else:
+        records = collection.get(include=["embeddings", "documents", "metadatas"])
+        index = _build_resume_index(
+            records["ids"],
+            records["documents"],
+            records["metadatas"],
+            np.asarray(records["embeddings"], dtype=np.float32)
+        )
+        print(f"SUCCESS: Loaded {count} resume embeddings for in-memory search")
+
+    _resume_index = (collection, count, index)
+    return index
+
+def _build_faiss_index(matrix):
+    """Build an exact inner-product FAISS index, storing vectors as int8 codes if configured"""
+    if FAISS_QUANTIZATION == "int8":
+        # One byte per dimension (4x smaller than float32), scanned with SIMD int8 kernels
+        faiss_index = faiss.IndexScalarQuantizer(matrix.shape[1], faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+        faiss_index.train(matrix)
+    else:
+        faiss_index = faiss.IndexFlatIP(matrix.shape[1])
+    faiss_index.add(matrix)
+    return faiss_index
+
+def _build_resume_index(ids, documents, metadatas, matrix):
+    """Assemble the in-memory index over a C-contiguous float32 embedding matrix
+
+    With the FAISS backend the vectors live only inside the FAISS index;
+    otherwise the matrix and its squared norms are kept for the numpy search.
+    """
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    index = {
+        "ids": ids,
+        "documents": documents,
+        "metadatas": metadatas,
+    }
+    if RETRIEVAL_BACKEND == "faiss" and faiss is not None:
+        # Exact inner-product scan; embeddings are unit-norm, so it ranks like L2
+        index["faiss"] = _build_faiss_index(matrix)
+    else:
+        if RETRIEVAL_BACKEND == "faiss":
+            print("WARNING: faiss is not installed, using numpy matrix search")
+        index["matrix"] = matrix
+        index["sq_norms"] = np.einsum("ij,ij->i", matrix, matrix)
+    return index
+
+def add_to_resume_index(collection, ids, documents, embeddings, metadatas=None):
+    """Append resumes just added to the collection to the in-memory index, avoiding a full reload
+
+    A new index is built and swapped in, so searches running on other threads
+    keep a consistent view. If the collection did not grow by exactly these
+    rows (e.g. an id already existed), the index is dropped and reloaded on
+    the next query instead.
+    """
+    global _resume_index
+    if _resume_index is None or _resume_index[0] is not collection or _resume_index[2] is None:
+        return
+    
+    _, count, index = _resume_index
+    new_count = count + len(ids)
+    if collection.count() != new_count or new_count > MATRIX_SEARCH_MAX_RESUMES:
+        _resume_index = None
+        return
+    
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    new_index = {
+        "ids": index["ids"] + list(ids),
+        "documents": index["documents"] + list(documents),
+        "metadatas": (index["metadatas"] or [None] * count) + (list(metadatas) if metadatas else [None] * len(ids)),
+    }
+    if "faiss" in index:
+        new_index["faiss"] = faiss.clone_index(index["faiss"])
+        new_index["faiss"].add(embeddings)
+    else:
+        new_index["matrix"] = np.vstack([index["matrix"], embeddings])
+        new_index["sq_norms"] = np.concatenate([index["sq_norms"], np.einsum("ij,ij->i", embeddings, embeddings)])
+    _resume_index = (collection, new_count, new_index)
+
+def _search_resume_index(index, query_embeddings, top_k):
+    """Exact top-K search over the in-memory index, returned in Chroma's query result layout"""
+    queries = np.asarray(query_embeddings, dtype=np.float32)
+    if "faiss" in index:
+        similarities, top = index["faiss"].search(np.ascontiguousarray(queries), min(top_k, len(index["ids"])))
+        # Report squared L2 like Chroma does: ||a - b||^2 = 2 - 2 a.b for unit vectors
+        return _index_results(index, top, np.maximum(2.0 - 2.0 * similarities, 0.0))
+
+    distances = (
+        np.einsum("ij,ij->i", queries, queries)[:, None]
+        + index["sq_norms"][None, :]
+        - 2.0 * (queries @ index["matrix"].T)
+    )
+    np.maximum(distances, 0.0, out=distances)
+
+    k = min(top_k, distances.shape[1])
+    top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    top_distances = np.take_along_axis(distances, top, axis=1)
+    order = np.argsort(top_distances, axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    top_distances = np.take_along_axis(top_distances, order, axis=1)
+    return _index_results(index, top, top_distances)
+
+def _index_results(index, top, top_distances):
+    """Format top-K row positions and distances in Chroma's query result layout"""
+    metadatas = index["metadatas"]
+    return {
+        "ids": [[index["ids"][j] for j in row] for row in top],
+        "documents": [[index["documents"][j] for j in row] for row in top],
+        "metadatas": [[metadatas[j] for j in row] for row in top] if metadatas else None,
+        "distances": top_distances.tolist(),
+    }
+
+def query_resumes(collection, query_embeddings, top_k):
+    """Run a top-K query in memory when the corpus fits, otherwise through Chroma"""
+    index = _get_resume_index(collection)
+    if index is not None:
+        return _search_resume_index(index, query_embeddings, top_k)
+    
+    return collection.query(
+        query_embeddings=np.asarray(query_embeddings).tolist(),
+        n_results=top_k
+    )
+
+def get_top_matches(job_text, top_k=TOP_K, embedder=None, collection=None):
     """Get top matching candidates for a job description"""
     try:
-        client = chromadb.PersistentClient(path=CHROMA_DB_DIR)
-        collection = client.get_collection(name="resume_collection")
+        collection = collection or _get_collection()
         
         # Use the same embedding model as the collection
-        embedder = SentenceTransformer("models/sentence-transformers/all-MiniLM-L6-v2")
+        embedder = embedder or _get_embedder()
         
         # Embed job description
-        job_embedding = embedder.encode(job_text).tolist()
+        job_embedding = embedder.encode(job_text, normalize_embeddings=True)
         
         # Query resumes by embedding vector
-        results = collection.query(
-            query_embeddings=[job_embedding], 
-            n_results=top_k
-        )
+        return query_resumes(collection, [job_embedding], top_k)
+        
+    except Exception as e:
+        print(f"ERROR: Error in semantic matching: {e}")
+        return None
+
+def _embedding_cache_key(text):
+    """Cache key for a text, tied to the embedding model and backend that produced it"""
+    return blake2b(f"{EMBEDDING_MODEL_PATH}\0{EMBEDDING_BACKEND}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+def encode_with_cache(embedder, texts, batch_size=64):
+    """Encode texts, reusing embeddings stored on disk and encoding only the misses in one batch"""
+    keys = [_embedding_cache_key(text) for text in texts]
+    embeddings = [None] * len(texts)
+
+    with shelve.open(EMBEDDING_CACHE_PATH) as cache:
+        missing = []
+        for i, key in enumerate(keys):
+            cached = cache.get(key)
+            if cached is None:
+                missing.append(i)
+            else:
+                embeddings[i] = cached
+
+        if missing:
+            encoded = embedder.encode([texts[i] for i in missing], batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=len(missing) > batch_size)
+            for i, embedding in zip(missing, encoded):
+                cache[keys[i]] = embedding
+                embeddings[i] = embedding
+
+    print(f"Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} misses")
+    return np.vstack(embeddings)
+
+def get_top_matches_batch(job_texts, top_k=TOP_K, embedder=None, collection=None, batch_size=64):
+    """Get top matching candidates for many job descriptions with one encode and one query"""
+    try:
+        collection = collection or _get_collection()
+        embedder = embedder or _get_embedder()
+        
+        job_embeddings = encode_with_cache(embedder, job_texts, batch_size=batch_size)
         
-        return results
+        return query_resumes(collection, job_embeddings, top_k)
         
     except Exception as e:
         print(f"ERROR: Error in semantic matching: {e}")
@@ -56,10 +264,8 @@ def get_top_matches(job_text, top_k=TOP_K):
 def main():
     """Main function to process job descriptions and find matches"""
     try:
-        client = chromadb.PersistentClient(path=CHROMA_DB_DIR)
-        collection = client.get_collection(name="resume_collection")
-        
-        embedder = SentenceTransformer("models/sentence-transformers/all-MiniLM-L6-v2")
+        collection = _get_collection()
+        embedder = _get_embedder()
         
         # Ensure result folder exists
         os.makedirs(MATCH_RESULT_FOLDER, exist_ok=True)
@@ -67,6 +273,8 @@ def main():
         processed_count = 0
         error_count = 0
         
+        # Load every job description first so they can be embedded and queried together
+        jobs = []
         for filename in os.listdir(JOB_DESCRIPTION_FOLDER):
             if not filename.endswith(".json"):
                 continue
@@ -86,20 +294,34 @@ def main():
                 error_count += 1
                 continue
 
-            # Get matches
-            results = get_top_matches(job_text)
-            if not results:
+            jobs.append((filename, job_data, job_text))
+
+        if not jobs:
+            print(f"\n Summary: Processed {processed_count} job descriptions, {error_count} errors")
+            return error_count == 0
+
+        results = get_top_matches_batch([job_text for _, _, job_text in jobs], embedder=embedder, collection=collection)
+        if not results:
+            print("ERROR: Semantic matching query failed")
+            return False
+
+        for job_idx, (filename, job_data, _) in enumerate(jobs):
+            documents = results["documents"][job_idx]
+            distances = results["distances"][job_idx]
+            metadatas = results["metadatas"][job_idx] if results["metadatas"] else None
+
+            if not documents:
                 print(f"ERROR: No matches found for {filename}")
                 error_count += 1
                 continue
 
             print(f"\n📋 Top {TOP_K} matches for '{job_data.get('title', filename)}':\n")
-            for i in range(len(results["documents"][0])):
+            for i in range(len(documents)):
                 print(f"Rank {i+1}")
-                print(f"Resume Snippet: {results['documents'][0][i][:300]}...")
-                print(f"Score: {results['distances'][0][i]:.4f}")
-                if results['metadatas'] and results['metadatas'][0]:
-                    print(f"Metadata: {results['metadatas'][0][i]}")
+                print(f"Resume Snippet: {documents[i][:300]}...")
+                print(f"Score: {distances[i]:.4f}")
+                if metadatas:
+                    print(f"Metadata: {metadatas[i]}")
                 print("-" * 40)
 
             # Save to result file
@@ -108,29 +330,30 @@ def main():
             result_path = os.path.join(MATCH_RESULT_FOLDER, f"{safe_title}.json")
 
             match_results = []
-            for i in range(len(results["documents"][0])):
+            for i in range(len(documents)):
                 match_result = {
                     "rank": i + 1,
-                    "resume_snippet": results["documents"][0][i],
-                    "score": results["distances"][0][i]
+                    "resume_snippet": documents[i],
+                    "score": distances[i]
                 }
                 
                 # Add metadata if available
-                if results['metadatas'] and results['metadatas'][0]:
-                    match_result["metadata"] = results['metadatas'][0][i]
+                if metadatas:
+                    match_result["metadata"] = metadatas[i]
                 
                 match_results.append(match_result)
 
-            with open(result_path, "w", encoding="utf-8") as out_file:
-                json.dump(match_results, out_file, indent=2, ensure_ascii=False)
+            write_json(result_path, match_results)
             
             processed_count += 1
             print(f"💾 Saved results to: {result_path}")
 
         print(f"\n Summary: Processed {processed_count} job descriptions, {error_count} errors")
+        return processed_count > 0 or error_count == 0
 
     except Exception as e:
         print(f"ERROR: Error in main processing: {e}")
+        return False
 
 if __name__ == "__main__":
-    main()
+    sys.exit(0 if main() else 1)
@@ -9,33 +9,25 @@ import sys
 import subprocess
 from pathlib import Path
 
-def run_script(script_name, description):
-    """Run a Python script and handle errors"""
+def run_step(script_name, description):
+    """Run a pipeline script in its own interpreter and handle errors"""
     print(f"\n{description}...")
-    print(f"   Running: python Scripts/{script_name}")
+    print(f"   Running: {script_name}")
     
+    # Each step gets a fresh process so its models are released when it exits and no
+    # process pool is forked from an interpreter that already started torch/CT2 threads.
+    # Output is streamed rather than captured so long steps show their progress.
     try:
-        result = subprocess.run(
-            [sys.executable, f"Scripts/{script_name}"],
-            capture_output=True,
-            text=True,
-            cwd=os.getcwd()
-        )
-        
-        if result.returncode == 0:
-            print(f"SUCCESS: {description} completed successfully")
-            if result.stdout:
-                print(f"   Output: {result.stdout.strip()}")
-        else:
-            print(f"ERROR: {description} failed")
-            if result.stderr:
-                print(f"   Error: {result.stderr.strip()}")
-            return False
-            
+        result = subprocess.run([sys.executable, os.path.join("Scripts", script_name)], cwd=os.getcwd())
     except Exception as e:
         print(f"ERROR: Error running {script_name}: {e}")
         return False
     
+    if result.returncode != 0:
+        print(f"ERROR: {description} failed (exit code {result.returncode})")
+        return False
+    
+    print(f"SUCCESS: {description} completed successfully")
     return True
 
 def check_prerequisites():
@@ -76,9 +68,8 @@ def create_directories():
     
     for directory in directories:
         os.makedirs(directory, exist_ok=True)
-        print(f"   SUCCESS: Created: {directory}")
     
-    print("SUCCESS: All directories created")
+    print(f"SUCCESS: All directories created: {', '.join(directories)}")
 
 def main():
     """Main setup function"""
@@ -113,7 +104,7 @@ def main():
     total_steps = len(setup_steps)
     
     for script_name, description in setup_steps:
-        if run_script(script_name, description):
+        if run_step(script_name, description):
             success_count += 1
         else:
             print(f"WARNING: Skipping remaining steps due to failure in {script_name}")
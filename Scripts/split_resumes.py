@@ -5,14 +5,36 @@ Converts CSV resume dataset into individual text files for processing
 """
 
 import pandas as pd
+import csv
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pv
+except ImportError:  # Fall back to pandas' CSV parser
+    pa = pv = None
+
 # Configuration
 CSV_PATH = "data/resumes.csv"
 OUTPUT_FOLDER = "data/resumes"
 ENCODING = "utf-8"
+CSV_CHUNK_SIZE = 10_000  # rows held in memory at a time (pandas reader)
+CSV_BLOCK_SIZE = 64 << 20  # bytes parsed per block across threads (pyarrow reader)
+
+WRITE_WORKERS = 8  # resume files are small, so writes are bound by filesystem metadata latency
+
+WHITESPACE_RE = re.compile(r'\s+')
+CSV_ESCAPE_RE = re.compile(r'\\([nt])')  # literal "\n" / "\t" left in the CSV text
+CSV_ESCAPES = {'n': '\n', 't': '\t'}
+
+def _unescape(match):
+    """Replace an escaped newline/tab with the real character"""
+    return CSV_ESCAPES[match.group(1)]
 
 def detect_resume_column(df):
     """Detect the column containing resume text"""
@@ -24,16 +46,16 @@ def detect_resume_column(df):
             return col
     
     # If no obvious column found, try to find the longest text column
-    text_columns = []
-    for col in df.columns:
-        if df[col].dtype == 'object':  # String/object columns
-            avg_length = df[col].astype(str).str.len().mean()
-            if avg_length > 100:  # Assume resume text is longer than 100 chars
-                text_columns.append((col, avg_length))
+    object_columns = df.select_dtypes(include="object")  # String/object columns
+    if object_columns.empty:
+        return None
+    
+    avg_lengths = object_columns.apply(lambda s: s.astype(str).str.len().mean())
+    avg_lengths = avg_lengths[avg_lengths > 100]  # Assume resume text is longer than 100 chars
     
-    if text_columns:
+    if not avg_lengths.empty:
         # Return the column with the longest average text
-        return max(text_columns, key=lambda x: x[1])[0]
+        return avg_lengths.idxmax()
     
     return None
 
@@ -45,14 +67,61 @@ def clean_resume_text(text):
     text = str(text).strip()
     
     # Remove excessive whitespace
-    import re
-    text = re.sub(r'\s+', ' ', text)
+    text = WHITESPACE_RE.sub(' ', text)
     
     # Remove common CSV artifacts
-    text = text.replace('\\n', '\n').replace('\\t', '\t')
+    text = CSV_ESCAPE_RE.sub(_unescape, text)
     
     return text
 
+def clean_resume_column(series):
+    """Vectorized clean_resume_text over a whole column"""
+    return (
+        series.fillna("")
+        .astype(str)
+        .str.strip()
+        .str.replace(WHITESPACE_RE, ' ', regex=True)
+        .str.replace(CSV_ESCAPE_RE, _unescape, regex=True)
+    )
+
+def iter_csv_chunks(csv_path):
+    """Yield the CSV as DataFrame chunks, parsed by pyarrow's multithreaded reader when available
+
+    Chunks carry a running row index so row numbers match a single full read.
+    Like pandas, quoted cells may span lines and every column is read as text.
+    """
+    if pv is None:
+        yield from pd.read_csv(csv_path, encoding=ENCODING, dtype=str, chunksize=CSV_CHUNK_SIZE)
+        return
+    
+    with open(csv_path, encoding=ENCODING, newline="") as f:
+        header = next(csv.reader(f), [])
+    reader = pv.open_csv(
+        csv_path,
+        read_options=pv.ReadOptions(block_size=CSV_BLOCK_SIZE, use_threads=True, encoding=ENCODING),
+        parse_options=pv.ParseOptions(newlines_in_values=True),
+        convert_options=pv.ConvertOptions(
+            column_types={name: pa.string() for name in header},
+            strings_can_be_null=True
+        )
+    )
+    offset = 0
+    for batch in reader:
+        chunk = batch.to_pandas()
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield chunk
+
+def _write_resume(task):
+    """Write one encoded resume to disk; returns an error message or None"""
+    _, file_path, data = task
+    try:
+        with open(file_path, "wb") as f:
+            f.write(data)
+        return None
+    except Exception as e:
+        return str(e)
+
 def split_resumes(csv_path, output_folder):
     """Split CSV resumes into individual text files"""
     print(f"Loading CSV file: {csv_path}")
@@ -64,20 +133,23 @@ def split_resumes(csv_path, output_folder):
         return False
     
     try:
-        # Load CSV with error handling
-        df = pd.read_csv(csv_path, encoding=ENCODING)
-        print(f"SUCCESS: Loaded CSV with {len(df)} rows and {len(df.columns)} columns")
+        # Stream the CSV in chunks so memory stays bounded by the chunk size, not the file size
+        reader = iter_csv_chunks(csv_path)
+        first_chunk = next(reader, None)
+        if first_chunk is None:
+            first_chunk = pd.read_csv(csv_path, encoding=ENCODING, dtype=str)
+        print(f"SUCCESS: Opened CSV with {len(first_chunk.columns)} columns")
         
     except Exception as e:
         print(f"ERROR: Error loading CSV: {e}")
         return False
     
-    # Detect resume column
-    resume_column = detect_resume_column(df)
+    # Detect resume column from the first chunk
+    resume_column = detect_resume_column(first_chunk)
     if not resume_column:
         print("ERROR: Could not find resume text column!")
         print("Available columns:")
-        for col in df.columns:
+        for col in first_chunk.columns:
             print(f"   - {col}")
         return False
     
@@ -90,33 +162,50 @@ def split_resumes(csv_path, output_folder):
     # Process each resume
     successful_exports = 0
     failed_exports = 0
+    total_rows = 0
+    read_failed = False
     
-    for idx, row in df.iterrows():
+    # Write resumes to files, overlapping the per-file open/close latency across threads
+    with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as executor:
         try:
-            resume_text = clean_resume_text(row[resume_column])
-            
-            if not resume_text:
-                print(f"WARNING: Skipping row {idx+1}: Empty resume text")
-                failed_exports += 1
-                continue
-            
-            # Create filename
-            filename = f"resume_{idx+1:04d}.txt"
-            file_path = os.path.join(output_folder, filename)
-            
-            # Write resume to file
-            with open(file_path, "w", encoding=ENCODING) as f:
-                f.write(resume_text)
-            
-            successful_exports += 1
-            
-            # Progress indicator
-            if (idx + 1) % 100 == 0:
-                print(f"   Processed {idx + 1}/{len(df)} resumes...")
+            for chunk in chain([first_chunk], reader):
+                total_rows += len(chunk)
+                cleaned_texts = clean_resume_column(chunk[resume_column])
                 
+                tasks = []
+                for idx, resume_text in zip(chunk.index, cleaned_texts.to_numpy()):
+                    try:
+                        if not resume_text:
+                            print(f"WARNING: Skipping row {idx+1}: Empty resume text")
+                            failed_exports += 1
+                            continue
+                        
+                        # Create filename
+                        filename = f"resume_{idx+1:04d}.txt"
+                        file_path = os.path.join(output_folder, filename)
+                        tasks.append((idx, file_path, resume_text.encode(ENCODING)))
+                            
+                    except Exception as e:
+                        print(f"ERROR: Error processing row {idx+1}: {e}")
+                        failed_exports += 1
+                
+                for (idx, _, _), error in zip(tasks, executor.map(_write_resume, tasks)):
+                    if error is not None:
+                        print(f"ERROR: Error processing row {idx+1}: {error}")
+                        failed_exports += 1
+                        continue
+                    
+                    successful_exports += 1
+                    
+                    # Progress indicator
+                    if (idx + 1) % 100 == 0:
+                        print(f"   Processed {idx + 1} resumes...")
         except Exception as e:
-            print(f"ERROR: Error processing row {idx+1}: {e}")
-            failed_exports += 1
+            print(f"ERROR: Error reading CSV after {total_rows} rows: {e}")
+            read_failed = True
+    
+    if not read_failed:
+        print(f"SUCCESS: Read {total_rows} rows from CSV")
     
     # Summary
     print(f"\nSplit Summary:")
@@ -124,7 +213,10 @@ def split_resumes(csv_path, output_folder):
     print(f"   ERROR: Failed exports: {failed_exports}")
     print(f"   Output directory: {output_folder}")
     
-    if successful_exports > 0:
+    if read_failed:
+        print(f"\nERROR: CSV could not be read completely; the export is partial")
+        return False
+    elif successful_exports > 0:
         print(f"\nSUCCESS: Resume splitting completed successfully!")
         print(f"   Next step: Run 'python Scripts/translate_resumes.py'")
         return True
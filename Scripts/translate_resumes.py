@@ -1,9 +1,25 @@
 import os
+import sys
+import re
+import functools
+import threading
+import torch
+from concurrent.futures import ProcessPoolExecutor
 from tqdm import tqdm
 from transformers import MarianMTModel, MarianTokenizer
 from langdetect import detect
 import glob
 
+try:
+    import fasttext
+except ImportError:  # Fall back to langdetect
+    fasttext = None
+
+try:
+    import ctranslate2
+except ImportError:  # Fall back to PyTorch MarianMT
+    ctranslate2 = None
+
 # Local model paths
 MODEL_DIR = os.path.join(os.getcwd(), "models")
 LANG_TO_MODEL = {
@@ -12,42 +28,304 @@ LANG_TO_MODEL = {
     "de": os.path.join(MODEL_DIR, "opus-mt-de-en"),
 }
 
+# Optional CTranslate2 backend: int8 models converted once from the local MarianMT checkpoints
+TRANSLATION_BACKEND = os.getenv("TRANSLATION_BACKEND", "ctranslate2")  # "ctranslate2" or "torch"
+CT2_MODEL_DIR = os.path.join(MODEL_DIR, "ct2")
+# One translator per language is shared by every caller: intra_threads parallelise a single batch,
+# inter_threads let that many batches run on the same translator at once
+# Defaults to this process's thread budget (OMP_NUM_THREADS, split per server worker) rather than every core
+CT2_INTRA_THREADS = int(os.getenv("TRANSLATION_INTRA_THREADS", os.getenv("OMP_NUM_THREADS", str(os.cpu_count() or 0))))
+CT2_INTER_THREADS = int(os.getenv("TRANSLATION_INTER_THREADS", "1"))
+
+LID_MODEL_PATH = os.path.join(MODEL_DIR, "lid.176.bin")  # fastText language identification model
+LID_MAX_CHARS = 1000  # the opening of a resume is enough to identify its language
+
+TRANSLATION_BATCH_SIZE = int(os.getenv("TRANSLATION_BATCH_SIZE", "16"))
+MAX_SOURCE_TOKENS = 512
+WINDOW_TOKENS = 450  # long resumes are split into windows of this many source tokens
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+DETECT_WORKERS = int(os.getenv("DETECT_WORKERS", str(os.cpu_count() or 1)))
+NUM_BEAMS = 1  # greedy decoding; the opus-mt configs default to beam search
+
+# Loaded (model, tokenizer) pairs keyed by language code, so each model is read from disk once
+_model_cache = {}
+_ct2_cache = {}  # language code -> (translator, tokenizer), or None if CTranslate2 is unavailable
+_translator_lock = threading.Lock()  # the server may translate from several threads at once
+_lid_model = None
+_lid_checked = False
+
+def load_lid_model():
+    """Lazy load the fastText language identifier; returns None if unavailable"""
+    global _lid_model, _lid_checked
+    if _lid_checked:
+        return _lid_model
+    _lid_checked = True
+    
+    if fasttext is None or not os.path.exists(LID_MODEL_PATH):
+        return None
+    
+    try:
+        _lid_model = fasttext.load_model(LID_MODEL_PATH)
+        print(f"SUCCESS: Loaded language identification model from {LID_MODEL_PATH}")
+    except Exception as e:
+        print(f"WARNING: Could not load fastText model, using langdetect: {e}")
+        _lid_model = None
+    return _lid_model
+
 def detect_language(text):
     """Detect the language of the input text"""
     try:
-        return detect(text)
+        lid_model = load_lid_model()
+        if lid_model is not None:
+            # fastText's single-string predict builds its result with np.array(copy=False),
+            # which NumPy 2 rejects; the list form returns plain lists
+            labels, _ = lid_model.predict([text[:LID_MAX_CHARS].replace("\n", " ")], k=1)
+            return labels[0][0].removeprefix("__label__")
+        return detect(text[:LID_MAX_CHARS])
     except Exception as e:
         print(f"ERROR: Error detecting language: {e}")
         return "unknown"
 
-def load_model_tokenizer(lang_code):
-    """Load the translation model and tokenizer for a specific language"""
+def detect_language_many(texts):
+    """Detect the language of each text, in one fastText call when the model is available"""
+    lid_model = load_lid_model()
+    if lid_model is None:
+        return [detect_language(text) for text in texts]
+    try:
+        labels, _ = lid_model.predict([text[:LID_MAX_CHARS].replace("\n", " ") for text in texts], k=1)
+        return [label[0].removeprefix("__label__") for label in labels]
+    except Exception as e:
+        print(f"ERROR: Error detecting languages: {e}")
+        return ["unknown"] * len(texts)
+
+def read_text_file(file_path):
+    """Read a whole UTF-8 file with one sized read, bypassing the buffered text layer"""
+    with open(file_path, "rb", buffering=0) as f:
+        data = f.readall()  # sizes the buffer from fstat, so small files take a single read syscall
+    # Match text-mode universal newline handling
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+def _read_resume(file_path):
+    """Read a resume, returning (file_path, text, error)"""
+    try:
+        return file_path, read_text_file(file_path), None
+    except Exception as e:
+        return file_path, None, str(e)
+
+def _read_and_detect(file_path):
+    """Read a resume and detect its language (runs in a worker process)"""
+    try:
+        text = read_text_file(file_path)
+        return file_path, text, detect_language(text), None
+    except Exception as e:
+        return file_path, None, None, str(e)
+
+@functools.lru_cache(maxsize=None)
+def _model_dir(lang_code):
+    """Resolve the local model directory for a language once; None if it is missing"""
     model_path = LANG_TO_MODEL.get(lang_code)
     if model_path is None or not os.path.isdir(model_path):
+        return None
+    return model_path
+
+def load_model_tokenizer(lang_code):
+    """Load the translation model and tokenizer for a specific language, reusing cached ones"""
+    cached = _model_cache.get(lang_code)
+    if cached is not None:
+        return cached
+
+    with _translator_lock:
+        return _load_model_tokenizer_locked(lang_code)
+
+def _load_model_tokenizer_locked(lang_code):
+    if lang_code in _model_cache:
+        return _model_cache[lang_code]
+
+    model_path = _model_dir(lang_code)
+    if model_path is None:
         raise ValueError(f"No local model found for language code '{lang_code}'")
 
     try:
         tokenizer = MarianTokenizer.from_pretrained(model_path)
         model = MarianMTModel.from_pretrained(model_path)
-        print(f"SUCCESS: Loaded translation model for {lang_code}")
+        if torch.cuda.is_available():
+            model = model.to("cuda").half()
+        model.eval()
+        print(f"SUCCESS: Loaded translation model for {lang_code} on {model.device}")
+        _model_cache[lang_code] = (model, tokenizer)
         return model, tokenizer
     except Exception as e:
         print(f"ERROR: Error loading model for {lang_code}: {e}")
         raise
 
-def translate_text(text, lang_code):
-    """Translate text from the specified language to English"""
+def load_ct2_translator(lang_code):
+    """Load a CTranslate2 int8 translator for a language, converting it on first use; returns None if unavailable"""
+    if lang_code in _ct2_cache:
+        return _ct2_cache[lang_code]
+    
+    with _translator_lock:
+        return _load_ct2_translator_locked(lang_code)
+
+def _load_ct2_translator_locked(lang_code):
+    if lang_code in _ct2_cache:
+        return _ct2_cache[lang_code]
+    
+    _ct2_cache[lang_code] = None
+    if ctranslate2 is None:
+        print("WARNING: ctranslate2 is not installed, falling back to PyTorch")
+        return None
+    
+    model_path = _model_dir(lang_code)
+    if model_path is None:
+        raise ValueError(f"No local model found for language code '{lang_code}'")
+    
+    ct2_path = os.path.join(CT2_MODEL_DIR, os.path.basename(model_path))
     try:
-        model, tokenizer = load_model_tokenizer(lang_code)
-        
-        # Prepare the text for translation
-        batch = tokenizer.prepare_seq2seq_batch([text], return_tensors="pt")
+        if not os.path.isdir(ct2_path):
+            print(f"Converting {model_path} to CTranslate2 int8 at: {ct2_path}")
+            ctranslate2.converters.TransformersConverter(model_path).convert(ct2_path, quantization="int8")
         
-        # Generate translation
-        generated = model.generate(**batch)
-        translated = tokenizer.batch_decode(generated, skip_special_tokens=True)[0]
+        translator = ctranslate2.Translator(
+            ct2_path, device="cpu", compute_type="int8",
+            intra_threads=CT2_INTRA_THREADS, inter_threads=CT2_INTER_THREADS
+        )
+        tokenizer = MarianTokenizer.from_pretrained(model_path)
+        print(f"SUCCESS: Loaded CTranslate2 translator for {lang_code}")
+        _ct2_cache[lang_code] = (translator, tokenizer)
+    except Exception as e:
+        print(f"WARNING: Could not load CTranslate2 model for {lang_code}, falling back to PyTorch: {e}")
+    return _ct2_cache[lang_code]
+
+def load_translators():
+    """Load the translator for every supported language up front, so the first request of each language doesn't pay for it"""
+    for lang_code in LANG_TO_MODEL:
+        if _model_dir(lang_code) is None:
+            continue
+        try:
+            if TRANSLATION_BACKEND != "ctranslate2" or load_ct2_translator(lang_code) is None:
+                load_model_tokenizer(lang_code)
+        except Exception as e:
+            print(f"WARNING: Could not preload translator for {lang_code}: {e}")
+
+def split_into_windows(tokenizer, text, max_tokens=WINDOW_TOKENS):
+    """Split text at line, then sentence, boundaries into windows of at most max_tokens tokens
+
+    Returns (windows, separators) where separators[i] is the whitespace that
+    rejoins window i to the next one. A single sentence longer than the window
+    is kept whole and truncated by the tokenizer.
+    """
+    pieces = []
+    for line in text.split("\n"):
+        sentences = SENTENCE_END_RE.split(line)
+        pieces.extend((sentence, " ") for sentence in sentences[:-1])
+        pieces.append((sentences[-1], "\n"))
+    
+    lengths = [len(ids) for ids in tokenizer([piece for piece, _ in pieces], add_special_tokens=False)["input_ids"]]
+    
+    windows, separators = [], []
+    current, current_len = [], 0
+    for (piece, separator), length in zip(pieces, lengths):
+        if current and current_len + length > max_tokens:
+            windows.append("".join(p + s for p, s in current[:-1]) + current[-1][0])
+            separators.append(current[-1][1])
+            current, current_len = [], 0
+        current.append((piece, separator))
+        current_len += length
+    
+    windows.append("".join(p + s for p, s in current[:-1]) + current[-1][0])
+    separators.append("")
+    return windows, separators
+
+def _translate_windows_ct2(translator, tokenizer, texts, batch_size):
+    """Translate texts with CTranslate2; it sorts and pads batches internally and keeps the input order"""
+    try:
+        encoded = tokenizer(texts, truncation=True, max_length=MAX_SOURCE_TOKENS)["input_ids"]
+        source_tokens = [tokenizer.convert_ids_to_tokens(ids) for ids in encoded]
+        results = translator.translate_batch(
+            source_tokens,
+            max_batch_size=batch_size,
+            beam_size=NUM_BEAMS,
+            max_decoding_length=MAX_SOURCE_TOKENS
+        )
+        return [
+            tokenizer.decode(tokenizer.convert_tokens_to_ids(result.hypotheses[0]), skip_special_tokens=True)
+            for result in results
+        ]
+    except Exception as e:
+        print(f"ERROR: Error translating batch: {e}")
+        return list(texts)  # Keep original texts if translation fails
+
+def _translate_windows_torch(model, tokenizer, texts, batch_size):
+    """Translate texts with MarianMT, padding each batch only to its longest text"""
+    # Sort by length so texts in a batch pad to similar sizes, then restore the input order
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    translations = [None] * len(texts)
+    
+    for start in range(0, len(order), batch_size):
+        indices = order[start:start + batch_size]
+        batch_texts = [texts[i] for i in indices]
+        try:
+            batch = tokenizer(
+                batch_texts,
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+                max_length=MAX_SOURCE_TOKENS
+            ).to(model.device)
+            
+            with torch.inference_mode():
+                generated = model.generate(**batch, num_beams=NUM_BEAMS, max_new_tokens=MAX_SOURCE_TOKENS)
+            decoded = tokenizer.batch_decode(generated, skip_special_tokens=True)
+        except Exception as e:
+            print(f"ERROR: Error translating batch: {e}")
+            decoded = batch_texts  # Keep original texts if translation fails
         
-        return translated
+        for i, translated in zip(indices, decoded):
+            translations[i] = translated
+    
+    return translations
+
+def translate_batch(texts, lang_code, batch_size=TRANSLATION_BATCH_SIZE):
+    """Translate many texts from one language to English
+
+    Long texts are split into token-bounded windows so nothing past the
+    model's 512-token limit is dropped; all windows are translated together
+    and stitched back per text.
+    """
+    ct2 = load_ct2_translator(lang_code) if TRANSLATION_BACKEND == "ctranslate2" else None
+    if ct2 is not None:
+        translator, tokenizer = ct2
+    else:
+        model, tokenizer = load_model_tokenizer(lang_code)
+    
+    # Flatten every text into windows, translating only the non-blank ones
+    layouts = []
+    windows = []
+    for text in texts:
+        text_windows, separators = split_into_windows(tokenizer, text)
+        slots = []
+        for window in text_windows:
+            if window.strip():
+                slots.append(len(windows))
+                windows.append(window)
+            else:
+                slots.append(window)
+        layouts.append((slots, separators))
+    
+    if ct2 is not None:
+        translated = _translate_windows_ct2(translator, tokenizer, windows, batch_size)
+    else:
+        translated = _translate_windows_torch(model, tokenizer, windows, batch_size)
+    
+    return [
+        "".join((translated[slot] if isinstance(slot, int) else slot) + separator for slot, separator in zip(slots, separators))
+        for slots, separators in layouts
+    ]
+
+def translate_text(text, lang_code):
+    """Translate text from the specified language to English"""
+    try:
+        return translate_batch([text], lang_code)[0]
     except Exception as e:
         print(f"ERROR: Error translating text: {e}")
         return text  # Return original text if translation fails
@@ -60,43 +338,69 @@ def process_resumes(input_dir="data/resumes", output_dir="data/translated"):
     
     if not resume_files:
         print(f"ERROR: No resume files found in {input_dir}")
-        return
+        return False
 
     translated_count = 0
     skipped_count = 0
     error_count = 0
 
-    for file_path in tqdm(resume_files, desc="Translating non-English resumes"):
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                text = f.read()
+    # Detect languages (in one batched fastText call, or across a process pool for langdetect),
+    # then bucket files so each model translates its files in batches
+    if load_lid_model() is not None:
+        read = [_read_resume(file_path) for file_path in tqdm(resume_files, desc="Reading resumes")]
+        texts = [text for _, text, error in read if error is None]
+        langs = iter(detect_language_many(texts))
+        detected = [
+            (file_path, text, next(langs) if error is None else None, error)
+            for file_path, text, error in read
+        ]
+    elif DETECT_WORKERS > 1 and len(resume_files) > 1:
+        with ProcessPoolExecutor(max_workers=DETECT_WORKERS) as executor:
+            detected = list(tqdm(executor.map(_read_and_detect, resume_files, chunksize=32), total=len(resume_files), desc="Detecting resume languages"))
+    else:
+        detected = [_read_and_detect(file_path) for file_path in tqdm(resume_files, desc="Detecting resume languages")]
 
-            lang = detect_language(text)
-            
-            if lang not in LANG_TO_MODEL:
-                print(f"SKIPPING: Skipping {os.path.basename(file_path)}, unsupported language: {lang}")
-                skipped_count += 1
-                continue
+    files_by_lang = {}
+    for file_path, text, lang, error in detected:
+        if error is not None:
+            print(f"ERROR: Error processing {os.path.basename(file_path)}: {error}")
+            error_count += 1
+            continue
 
-            # Translate the text
-            translated_text = translate_text(text, lang)
-            
-            # Save translated text
-            output_path = os.path.join(output_dir, os.path.basename(file_path))
-            with open(output_path, "w", encoding="utf-8") as out_f:
-                out_f.write(translated_text)
-            
-            translated_count += 1
-            print(f"SUCCESS: Translated {os.path.basename(file_path)} ({lang} -> en)")
-            
+        if lang not in LANG_TO_MODEL:
+            print(f"SKIPPING: Skipping {os.path.basename(file_path)}, unsupported language: {lang}")
+            skipped_count += 1
+            continue
+
+        files_by_lang.setdefault(lang, []).append((file_path, text))
+
+    for lang, entries in files_by_lang.items():
+        try:
+            translated_texts = translate_batch([text for _, text in entries], lang)
         except Exception as e:
-            print(f"ERROR: Error processing {os.path.basename(file_path)}: {e}")
-            error_count += 1
+            print(f"ERROR: Error translating {lang} resumes: {e}")
+            error_count += len(entries)
+            continue
+
+        for (file_path, _), translated_text in tqdm(zip(entries, translated_texts), total=len(entries), desc=f"Saving {lang} translations"):
+            try:
+                # Save translated text
+                output_path = os.path.join(output_dir, os.path.basename(file_path))
+                with open(output_path, "w", encoding="utf-8") as out_f:
+                    out_f.write(translated_text)
+                
+                translated_count += 1
+                print(f"SUCCESS: Translated {os.path.basename(file_path)} ({lang} -> en)")
+                
+            except Exception as e:
+                print(f"ERROR: Error processing {os.path.basename(file_path)}: {e}")
+                error_count += 1
 
     print(f"\nTranslation Summary:")
     print(f"   Translated: {translated_count}")
     print(f"   Skipped: {skipped_count}")
     print(f"   Errors: {error_count}")
+    return translated_count > 0 or error_count == 0
 
 def translate_single_resume(text, lang_code=None):
     """Translate a single resume text"""
@@ -110,4 +414,4 @@ def translate_single_resume(text, lang_code=None):
     return translated_text, lang_code
 
 if __name__ == "__main__":
-    process_resumes()
+    sys.exit(0 if process_resumes() else 1)
@@ -1,14 +1,129 @@
 import os
-import json
+import sys
+
+# Let OpenMP/MKL worker threads sleep right after a parallel region instead of
+# spinning, and keep MKL from resizing its pool; must be set before torch loads
+os.environ.setdefault("KMP_BLOCKTIME", "0")
+os.environ.setdefault("MKL_DYNAMIC", "FALSE")
+
+import orjson
+import numpy as np
+import torch
 import chromadb
-from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
+from concurrent.futures import ThreadPoolExecutor
 from sentence_transformers import SentenceTransformer
 
 MODEL_PATH = "models/sentence-transformers/all-MiniLM-L6-v2"
+ADD_BATCH_SIZE = 256  # resumes written to ChromaDB per collection.add call
+ENCODE_BATCH_SIZE = 64
+READ_WORKERS = 16  # parsed JSON files are small, so reading them is bound by I/O latency
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")  # "torch", "onnx" (needs optimum[onnxruntime]), "openvino" (needs optimum[openvino]) or "model2vec"
+STATIC_MODEL_PATH = os.getenv("STATIC_EMBEDDING_MODEL", "models/m2v-minilm")  # model2vec distillation of MODEL_PATH
+STATIC_PCA_DIMS = 256
+ONNX_QUANTIZATION = os.getenv("EMBEDDING_ONNX_QUANTIZATION", "avx512_vnni")  # "arm64", "avx2", "avx512" or "avx512_vnni"
+OPENVINO_PRECISION = os.getenv("EMBEDDING_OPENVINO_PRECISION", "bf16")  # runtime precision hint; FP16 IR weights run as bf16 on AMX/AVX512-BF16 CPUs
+EMBEDDING_THREADS = int(os.getenv("OMP_NUM_THREADS", str(os.cpu_count() or 1)))  # intra-op threads for PyTorch encodes
 
 # Global variables for lazy loading
 _embedding_model = None
-_embedding_function = None
+_chroma = None  # (client, collection), opened once per process
+
+def load_embedding_model_onnx(cache_dir):
+    """Load MiniLM on ONNX Runtime with int8 weights, quantizing it on first use; returns None if unavailable"""
+    file_name = f"model_qint8_{ONNX_QUANTIZATION}.onnx"
+    quantized_path = os.path.join(MODEL_PATH, "onnx", file_name)
+    
+    try:
+        if not os.path.exists(quantized_path):
+            from sentence_transformers import export_dynamic_quantized_onnx_model
+            
+            print(f"Exporting {MODEL_PATH} to int8 ONNX at: {quantized_path}")
+            fp32_model = SentenceTransformer(MODEL_PATH, backend="onnx", cache_folder=cache_dir)
+            export_dynamic_quantized_onnx_model(fp32_model, ONNX_QUANTIZATION, MODEL_PATH)
+        
+        model = SentenceTransformer(
+            MODEL_PATH,
+            backend="onnx",
+            cache_folder=cache_dir,
+            model_kwargs={"file_name": f"onnx/{file_name}"}
+        )
+        print(f"SUCCESS: Loaded int8 ONNX embedding model from {quantized_path}")
+        return model
+    except Exception as e:
+        print(f"WARNING: Could not load ONNX embedding model, falling back to PyTorch: {e}")
+        return None
+
+def load_embedding_model_openvino(cache_dir):
+    """Load MiniLM on OpenVINO from an FP16 IR, exporting it on first use; returns None if unavailable
+
+    Not quantized to int8: at the small batches the API encodes, dequantization
+    costs more than it saves.
+    """
+    ir_path = os.path.join(MODEL_PATH, "openvino", "openvino_model.xml")
+    model_kwargs = {"ov_config": {"INFERENCE_PRECISION_HINT": OPENVINO_PRECISION}}
+    
+    try:
+        if not os.path.exists(ir_path):
+            import openvino as ov
+            
+            print(f"Exporting {MODEL_PATH} to FP16 OpenVINO IR at: {ir_path}")
+            exported = SentenceTransformer(MODEL_PATH, backend="openvino", cache_folder=cache_dir)
+            os.makedirs(os.path.dirname(ir_path), exist_ok=True)
+            ov.save_model(exported[0].auto_model.model, ir_path, compress_to_fp16=True)
+        
+        model = SentenceTransformer(
+            MODEL_PATH,
+            backend="openvino",
+            cache_folder=cache_dir,
+            model_kwargs=model_kwargs
+        )
+        print(f"SUCCESS: Loaded OpenVINO embedding model from {ir_path} ({OPENVINO_PRECISION} inference)")
+        return model
+    except Exception as e:
+        print(f"WARNING: Could not load OpenVINO embedding model, falling back to PyTorch: {e}")
+        return None
+
+class StaticEmbedder:
+    """SentenceTransformer-style encode() over a model2vec static embedding model"""
+
+    def __init__(self, model):
+        self.model = model
+
+    def encode(self, sentences, batch_size=ENCODE_BATCH_SIZE, show_progress_bar=False, normalize_embeddings=False, **kwargs):
+        embeddings = self.model.encode(sentences, show_progress_bar=show_progress_bar)
+        if normalize_embeddings:
+            embeddings = embeddings / np.maximum(np.linalg.norm(embeddings, axis=-1, keepdims=True), 1e-12)
+        return embeddings
+
+def load_static_embedding_model():
+    """Load the model2vec static embedder, distilling it from MiniLM on first use; returns None if unavailable
+
+    Static embeddings live in a different vector space than MiniLM's, so the
+    resume collection has to be rebuilt with the same backend.
+    """
+    try:
+        from model2vec import StaticModel
+        
+        if not os.path.exists(STATIC_MODEL_PATH):
+            from model2vec.distill import distill
+            
+            print(f"Distilling {MODEL_PATH} into a static model at: {STATIC_MODEL_PATH}")
+            distill(model_name=MODEL_PATH, pca_dims=STATIC_PCA_DIMS).save_pretrained(STATIC_MODEL_PATH)
+        
+        model = StaticEmbedder(StaticModel.from_pretrained(STATIC_MODEL_PATH))
+        print(f"SUCCESS: Loaded static embedding model from {STATIC_MODEL_PATH}")
+        return model
+    except Exception as e:
+        print(f"WARNING: Could not load static embedding model, falling back to PyTorch: {e}")
+        return None
+
+def configure_torch_threads():
+    """Pin PyTorch's thread pools so encodes do not oversubscribe the container's CPUs"""
+    torch.set_num_threads(EMBEDDING_THREADS)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:  # Only allowed before the first parallel op in the process
+        pass
 
 def get_embedding_model():
     """Lazy load the embedding model with proper cache directory"""
@@ -23,53 +138,64 @@ def get_embedding_model():
             os.environ['HF_HOME'] = cache_dir
             os.environ['TRANSFORMERS_CACHE'] = cache_dir
             
-            _embedding_model = SentenceTransformer(MODEL_PATH, cache_folder=cache_dir)
-            print(f"SUCCESS: Loaded embedding model from {MODEL_PATH}")
+            if EMBEDDING_BACKEND == "onnx":
+                _embedding_model = load_embedding_model_onnx(cache_dir)
+            elif EMBEDDING_BACKEND == "openvino":
+                _embedding_model = load_embedding_model_openvino(cache_dir)
+            elif EMBEDDING_BACKEND == "model2vec":
+                _embedding_model = load_static_embedding_model()
+            
+            if _embedding_model is None:
+                configure_torch_threads()
+                _embedding_model = SentenceTransformer(MODEL_PATH, cache_folder=cache_dir).eval()
+                print(f"SUCCESS: Loaded embedding model from {MODEL_PATH}")
         except Exception as e:
             print(f"ERROR: Failed to load embedding model: {e}")
             # Fallback to default model if local model fails
             try:
                 print("Attempting to load default sentence-transformers model...")
-                _embedding_model = SentenceTransformer('all-MiniLM-L6-v2', cache_folder=cache_dir)
+                _embedding_model = SentenceTransformer('all-MiniLM-L6-v2', cache_folder=cache_dir).eval()
                 print("SUCCESS: Loaded default embedding model")
             except Exception as fallback_error:
                 print(f"ERROR: Failed to load default model: {fallback_error}")
                 raise
     return _embedding_model
 
-def get_embedding_function():
-    """Lazy load the embedding function"""
-    global _embedding_function
-    if _embedding_function is None:
-        try:
-            model = get_embedding_model()
-            _embedding_function = SentenceTransformerEmbeddingFunction(model_name=MODEL_PATH)
-        except Exception as e:
-            print(f"ERROR: Failed to create embedding function: {e}")
-            # Fallback to default model
-            try:
-                _embedding_function = SentenceTransformerEmbeddingFunction(model_name='all-MiniLM-L6-v2')
-                print("SUCCESS: Created embedding function with default model")
-            except Exception as fallback_error:
-                print(f"ERROR: Failed to create default embedding function: {fallback_error}")
-                raise
-    return _embedding_function
+def embed_texts(texts):
+    """Encode texts with the shared embedding model in large batches
+
+    Vectors are L2-normalized, so the collection's L2 distance ranks exactly
+    like cosine similarity (||a - b||^2 = 2 - 2 cos(a, b)).
+    """
+    model = get_embedding_model()
+    with torch.inference_mode():
+        return model.encode(
+            texts,
+            batch_size=ENCODE_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=len(texts) > ENCODE_BATCH_SIZE
+        )
 
 def init_chroma():
-    """Initialize ChromaDB client and collection"""
+    """Initialize ChromaDB client and collection, reusing them after the first call"""
+    global _chroma
+    if _chroma is not None:
+        return _chroma
+    
     try:
         # Use PersistentClient for local storage
         client = chromadb.PersistentClient(path="data/chroma_db")
         
-        # Get embedding function with lazy loading
-        embedding_function = get_embedding_function()
-        
+        # Embeddings are always computed with get_embedding_model and passed in,
+        # so Chroma does not need to load its own copy of the model
         collection = client.get_or_create_collection(
             name="resume_collection",
-            embedding_function=embedding_function
+            embedding_function=None
         )
         print("SUCCESS: ChromaDB initialized successfully")
-        return client, collection
+        _chroma = (client, collection)
+        return _chroma
     except Exception as e:
         print(f"ERROR: Error initializing ChromaDB: {e}")
         raise
@@ -77,35 +203,29 @@ def init_chroma():
 def load_parsed_resume_text(file_path):
     """Load and format parsed resume text for vector storage"""
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(file_path, "rb") as f:
+            data = orjson.loads(f.read())
 
         # If text field exists, use it directly
         if "text" in data:
             return data["text"].strip()
 
-        # Build text from parsed components
-        text_parts = []
-
-        if "name" in data and data["name"]:
-            text_parts.append(f"Name: {data['name']}")
-        if "email" in data and data["email"]:
-            text_parts.append(f"Email: {data['email']}")
-        if "phone" in data and data["phone"]:
-            text_parts.append(f"Phone: {data['phone']}")
-        if "skills" in data and data["skills"]:
-            text_parts.append("Skills: " + ", ".join(data["skills"]))
-        if "education" in data and data["education"]:
-            for edu in data["education"]:
-                degree = edu.get("degree", "")
-                institution = edu.get("institution", "")
-                year = edu.get("year", "")
-                text_parts.append(f"Education: {degree} from {institution}, Year: {year}")
-        if "experience" in data and data["experience"]:
-            for exp in data["experience"]:
-                text_parts.append(f"Experience: {exp}")
-        if "languages" in data and data["languages"]:
-            text_parts.append("Languages: " + ", ".join(data["languages"]))
+        # Build text from parsed components, joined once at the end
+        get = data.get
+        text_parts = [
+            f"{label}: {value}"
+            for key, label in (("name", "Name"), ("email", "Email"), ("phone", "Phone"))
+            if (value := get(key))
+        ]
+        if skills := get("skills"):
+            text_parts.append("Skills: " + ", ".join(skills))
+        text_parts.extend(
+            f"Education: {edu.get('degree', '')} from {edu.get('institution', '')}, Year: {edu.get('year', '')}"
+            for edu in get("education") or ()
+        )
+        text_parts.extend(f"Experience: {exp}" for exp in get("experience") or ())
+        if languages := get("languages"):
+            text_parts.append("Languages: " + ", ".join(languages))
 
         return "\n".join(text_parts).strip()
 
@@ -114,13 +234,18 @@ def load_parsed_resume_text(file_path):
         return None
 
 def add_resume_to_store(resume_text, resume_id, metadata=None):
-    """Add a single resume to the vector store"""
+    """Add a resume (or lists of resumes, ids and metadatas) to the vector store"""
     try:
         client, collection = init_chroma()
+        if isinstance(resume_text, list):
+            documents, ids, metadatas = resume_text, resume_id, metadata
+        else:
+            documents, ids, metadatas = [resume_text], [resume_id], [metadata] if metadata else None
         collection.add(
-            documents=[resume_text],
-            ids=[resume_id],
-            metadatas=[metadata] if metadata else None
+            documents=documents,
+            embeddings=embed_texts(documents).tolist(),
+            ids=ids,
+            metadatas=metadatas
         )
         print(f"SUCCESS: Added resume {resume_id} to vector store")
         return True
@@ -133,41 +258,72 @@ def main():
     parsed_dir = "data/parsed"
     if not os.path.exists(parsed_dir):
         print(f"ERROR: Parsed directory not found: {parsed_dir}")
-        return
+        return False
 
     client, collection = init_chroma()
     added_count = 0
     error_count = 0
 
-    for filename in os.listdir(parsed_dir):
-        if filename.endswith(".json"):
-            file_path = os.path.join(parsed_dir, filename)
-            resume_text = load_parsed_resume_text(file_path)
-
-            if resume_text:
-                try:
-                    # Create metadata
-                    metadata = {
-                        "filename": filename,
-                        "source": "parsed",
-                        "language": "en"  # Default, could be enhanced with language detection
-                    }
-                    
-                    collection.add(
-                        documents=[resume_text],
-                        ids=[filename],
-                        metadatas=[metadata]
-                    )
-                    added_count += 1
-                    print(f"SUCCESS: Added {filename} to vector store")
-                except Exception as e:
-                    error_count += 1
-                    print(f"ERROR: Error adding {filename}: {e}")
-            else:
-                error_count += 1
-                print(f"ERROR: No text found in {file_path}")
+    documents = []
+    ids = []
+    metadatas = []
+
+    filenames = [filename for filename in os.listdir(parsed_dir) if filename.endswith(".json")]
+    file_paths = [os.path.join(parsed_dir, filename) for filename in filenames]
+
+    # Read the files concurrently so open/read latency overlaps across threads
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as executor:
+        resume_texts = list(executor.map(load_parsed_resume_text, file_paths))
+
+    for filename, file_path, resume_text in zip(filenames, file_paths, resume_texts):
+        if resume_text:
+            documents.append(resume_text)
+            ids.append(filename)
+            # Create metadata
+            metadatas.append({
+                "filename": filename,
+                "source": "parsed",
+                "language": "en"  # Default, could be enhanced with language detection
+            })
+        else:
+            error_count += 1
+            print(f"ERROR: No text found in {file_path}")
+
+    if ids:
+        # Resumes already in the collection keep their stored embeddings; skip re-encoding them
+        existing = set(collection.get(ids=ids, include=[])["ids"])
+        if existing:
+            print(f"Skipping {len(existing)} resumes already in the vector store")
+            keep = [i for i, resume_id in enumerate(ids) if resume_id not in existing]
+            documents = [documents[i] for i in keep]
+            ids = [ids[i] for i in keep]
+            metadatas = [metadatas[i] for i in keep]
+
+    if documents:
+        # Encode each distinct text once, up front in large batches; duplicates reuse its vector
+        unique_index = {}
+        positions = [unique_index.setdefault(text, len(unique_index)) for text in documents]
+        if len(unique_index) < len(documents):
+            print(f"Skipping {len(documents) - len(unique_index)} duplicate resume texts when embedding")
+        embeddings = embed_texts(list(unique_index))[positions]
+
+        for start in range(0, len(documents), ADD_BATCH_SIZE):
+            end = start + ADD_BATCH_SIZE
+            try:
+                collection.add(
+                    documents=documents[start:end],
+                    embeddings=embeddings[start:end].tolist(),
+                    ids=ids[start:end],
+                    metadatas=metadatas[start:end]
+                )
+                added_count += len(ids[start:end])
+                print(f"SUCCESS: Added {len(ids[start:end])} resumes to vector store")
+            except Exception as e:
+                error_count += len(ids[start:end])
+                print(f"ERROR: Error adding resumes {ids[start]}..{ids[min(end, len(ids)) - 1]}: {e}")
 
     print(f"\n Summary: Added {added_count} resumes, {error_count} errors")
+    return added_count > 0 or error_count == 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(0 if main() else 1)
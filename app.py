@@ -2,770 +2,383 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'Scripts'))
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 import uvicorn
-import json
-import tempfile
-from typing import List, Dict, Any
-import shutil
-import PyPDF2
+import orjson
+import asyncio
+from typing import Dict, Any
+import pypdfium2 as pdfium  # ctypes binding to Google's PDFium engine
+import gzip
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 import io
-
-from vector_store import init_chroma, load_parsed_resume_text
-from semantic_matching import build_job_description_text
-from interview_question_generator import generate_interview_questions
-from translate_resumes import detect_language, translate_text
+import uuid
+import hashlib
+import shutil
+import subprocess
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from functools import lru_cache
+from contextlib import asynccontextmanager
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # Serve gzip only
+    brotli = None
+
+try:
+    import docx  # python-docx
+except ImportError:  # Read word/document.xml straight from the archive
+    docx = None
+
+try:
+    from charset_normalizer import from_bytes as detect_charset
+except ImportError:  # Decode non-UTF-8 text with replacement characters
+    detect_charset = None
+
+try:
+    import diskcache  # SQLite-backed cache shared by all server workers
+except ImportError:  # Keep generated questions in memory only
+    diskcache = None
+
+from vector_store import init_chroma, get_embedding_model, embed_texts
+from semantic_matching import build_job_description_text, query_resumes, add_to_resume_index
+from interview_question_generator import generate_interview_questions_batch, load_generator
+from translate_resumes import detect_language, translate_text, load_translators
 from parse_resumes import parse_resume
-from parser_helpers import extract_email, extract_phone, extract_education, extract_experience, extract_skills
+from parser_helpers import extract_contact
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+logger = logging.getLogger(__name__)
+
+def start_log_listener():
+    """Send log records through a queue so request handlers never block on log I/O
 
-app = FastAPI(title="Multilingual Resume Screener & Interview Assistant", version="1.0.0")
+    The root logger's handlers (or a stderr handler if there are none) move to a
+    background listener thread. Returns the listener; stop it on shutdown to flush.
+    """
+    root = logging.getLogger()
+    handlers = [handler for handler in root.handlers if not isinstance(handler, QueueHandler)]
+    if not handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        handlers = [handler]
+    
+    log_queue = queue.SimpleQueue()
+    root.handlers = [QueueHandler(log_queue)]
+    root.setLevel(LOG_LEVEL)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson, which writes UTF-8 bytes directly and handles numpy values"""
+
+    def render(self, content):
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+@asynccontextmanager
+async def lifespan(app):
+    """Load and warm every model before the server starts taking requests"""
+    log_listener = start_log_listener()
+    try:
+        # All models are cached singletons in their modules, so handlers get the same instances
+        init_chroma()
+        get_embedding_model()
+        # One throwaway batch on the request path so kernel selection and ONNX Runtime
+        # session setup happen now rather than on the first user's request
+        try:
+            await run_in_cpu_pool(embed_texts, ["warmup " * 16] * 8)
+        except Exception as e:
+            logger.warning(f"WARNING: Embedding warm-up failed: {e}")
+        # Load (and, with GENERATOR_COMPILE=1, compile and warm) the question generator and one
+        # shared translator per supported language side by side, so no first request pays for them
+        await asyncio.gather(asyncio.to_thread(load_generator), asyncio.to_thread(load_translators))
+        logger.info("✅ Application initialized successfully")
+    except Exception as e:
+        logger.exception(f"❌ Failed to initialize application: {e}")
+    yield
+    cpu_pool.shutdown(wait=False, cancel_futures=True)
+    log_listener.stop()
+    logging.getLogger().handlers = list(log_listener.handlers)  # log directly again once the listener is gone
+
+app = FastAPI(
+    title="Multilingual Resume Screener & Interview Assistant",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
 
-# CORS middleware for frontend integration
+# CORS middleware for frontend integration. The bundled pages are same-origin;
+# list external frontends in CORS_ORIGINS (comma-separated) to allow credentials.
+# With the "*" default, credentials stay off so the constant wildcard header is sent.
+cors_origins = [origin.strip() for origin in os.getenv("CORS_ORIGINS", "*").split(",") if origin.strip()]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=cors_origins,
+    allow_credentials="*" not in cors_origins,
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=86400,  # let browsers cache preflight responses for a day
 )
 
-# Mount static files for frontend
-app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Global variables
-client = None
-collection = None
-embedding_model = None
+PRECOMPRESSED_SUFFIXES = (".html", ".css")  # text assets compressed once at startup
+QUERY_CACHE_SIZE = 1024  # job description embeddings kept in memory
+MATCH_CACHE_SIZE = 1024  # top-5 candidate lists kept in memory, keyed by job text and corpus size
+CONTACT_CACHE_SIZE = 4096  # contact details of matched resumes, keyed by document id
+QUESTION_TIMEOUT_SECONDS = 60.0  # one batched generate() call covers every matched candidate
+QUESTION_TIMEOUT_GRACE_SECONDS = 5.0  # extra wait for a CTranslate2 batch, which cannot stop mid-decode
+QUESTION_CACHE_SIZE = 4096  # generated question sets kept in memory, keyed by (job title, snippet)
+QUESTION_CACHE_DIR = os.getenv("QUESTION_CACHE_DIR", "data/question_cache")
+QUESTION_CACHE_SIZE_LIMIT = 2 << 30  # bytes on disk before diskcache evicts the least recently used entries
+EMBED_MAX_BATCH = 32  # job descriptions embedded together by the request batcher
+EMBED_MAX_WAIT_MS = 5  # how long a batch stays open for more requests
+# Upload status lives on disk so any server worker can answer a status poll
+UPLOAD_STATUS_DIR = os.getenv("UPLOAD_STATUS_DIR", "data/uploads")
+
+# Dedicated, bounded pool for blocking CPU work (PDF parsing, embedding) so it stays off the event loop;
+# sized to this worker's share of the cores (OMP_NUM_THREADS is set per worker in __main__)
+CPU_POOL_WORKERS = int(os.getenv("CPU_POOL_WORKERS", os.getenv("OMP_NUM_THREADS", str(os.cpu_count() or 1))))
+cpu_pool = ThreadPoolExecutor(max_workers=CPU_POOL_WORKERS, thread_name_prefix="cpu")
+
+async def run_in_cpu_pool(func, *args):
+    """Run a blocking call on the CPU pool and await its result"""
+    return await asyncio.get_running_loop().run_in_executor(cpu_pool, func, *args)
+
+class EmbeddingBatcher:
+    """Coalesces concurrent single-text embed calls into one batched embed_texts call
+
+    The first waiting text opens a batch; texts arriving within max_wait seconds
+    (up to max_batch of them) join it, and the whole batch runs as one forward pass.
+    """
+
+    def __init__(self, max_batch=EMBED_MAX_BATCH, max_wait=EMBED_MAX_WAIT_MS / 1000):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue = None
+        self.worker = None
+
+    async def embed(self, text):
+        if self.worker is None or self.worker.done():
+            self.queue = asyncio.Queue()
+            self.worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((text, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                embeddings = await run_in_cpu_pool(embed_texts, [text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+
+embedding_batcher = EmbeddingBatcher()
+query_cache = OrderedDict()  # normalized job text -> embedding, least recently used first
+match_cache = OrderedDict()  # (sha1 of normalized job text, resume count) -> candidates, least recently used first
+
+def normalize_query(text):
+    """Canonical form of a job description, used as a cache key"""
+    return " ".join(text.lower().split())
+
+async def encode_query(text):
+    """Embed a job description, reusing the vector for repeated searches
+
+    MiniLM's tokenizer is uncased and splits on whitespace, so lowercasing and
+    collapsing whitespace does not change the embedding but raises the hit rate.
+    """
+    key = normalize_query(text)
+    embedding = query_cache.get(key)
+    if embedding is not None:
+        query_cache.move_to_end(key)
+        return embedding
+    
+    embedding = await embedding_batcher.embed(key)
+    embedding.setflags(write=False)  # shared between requests
+    query_cache[key] = embedding
+    if len(query_cache) > QUERY_CACHE_SIZE:
+        query_cache.popitem(last=False)
+    return embedding
+
+question_cache = OrderedDict()  # sha1(job title, snippet) -> questions, least recently used first
+question_store = None  # on-disk diskcache.Cache behind question_cache, opened on first use
+question_store_checked = False
+
+def get_question_store():
+    """Open the on-disk question cache once; returns None if diskcache is unavailable"""
+    global question_store, question_store_checked
+    if not question_store_checked:
+        question_store_checked = True
+        if diskcache is not None:
+            try:
+                question_store = diskcache.Cache(QUESTION_CACHE_DIR, size_limit=QUESTION_CACHE_SIZE_LIMIT)
+            except Exception as e:
+                logger.warning(f"WARNING: Could not open question cache at {QUESTION_CACHE_DIR}: {e}")
+    return question_store
+
+def question_cache_key(job_title, resume_snippet):
+    """Content address of a (job title, resume snippet) pair"""
+    return hashlib.sha1((job_title + "\x00" + resume_snippet).encode("utf-8")).hexdigest()
+
+def get_cached_questions(key):
+    """Look questions up in memory, then on disk; None on a miss"""
+    questions = question_cache.get(key)
+    if questions is not None:
+        question_cache.move_to_end(key)
+        return questions
+    
+    store = get_question_store()
+    questions = store.get(key) if store is not None else None
+    if questions is not None:
+        remember_questions(key, questions, persist=False)
+    return questions
+
+def remember_questions(key, questions, persist=True):
+    """Keep generated questions in memory and, unless they came from there, on disk"""
+    question_cache[key] = questions
+    if len(question_cache) > QUESTION_CACHE_SIZE:
+        question_cache.popitem(last=False)
+    store = get_question_store() if persist else None
+    if store is not None:
+        store.set(key, questions)
+
+@lru_cache(maxsize=CONTACT_CACHE_SIZE)
+def _extract_contact_cached(doc_id, resume_text):
+    email, phone = extract_contact(resume_text)
+    return {"email": email, "phone": phone}
+
+def extract_contact_info(doc_id, resume_text):
+    """Extract a resume's email and phone, reusing the result when the same document matches again"""
+    return dict(_extract_contact_cached(doc_id, resume_text))
 
 def extract_text_from_pdf(pdf_file):
     """Extract text from PDF file"""
     try:
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+        doc = pdfium.PdfDocument(pdf_file.read())
+        try:
+            # Join once instead of growing a string page by page
+            return "".join(page.get_textpage().get_text_bounded() + "\n" for page in doc)
+        finally:
+            doc.close()
     except Exception as e:
         raise Exception(f"Error reading PDF: {str(e)}")
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize the application on startup"""
-    global client, collection, embedding_model
+async def stream_questions_for_candidates(job_title, resume_snippets):
+    """Yield (index, questions) for each candidate as soon as its questions are available
+
+    Snippets already seen with this job title come straight from the question
+    cache, before any generation starts; the misses then share one batched
+    model call. Failures yield an error message in place of questions.
+    """
+    keys = [question_cache_key(job_title, snippet) if isinstance(snippet, str) else None for snippet in resume_snippets]
+    missing = []
+    for index, key in enumerate(keys):
+        cached = get_cached_questions(key) if key is not None else None
+        if cached is None:
+            missing.append(index)
+        else:
+            yield index, cached
+    if not missing:
+        return
+    
+    # A thread cannot be cancelled, so the generator itself stops at the timeout (max_time);
+    # wait_for only adds a grace period for the batch in flight when the deadline passes
+    pairs = [(job_title, resume_snippets[i]) for i in missing]
     try:
-        client, collection = init_chroma()
-        # Use lazy loading from vector_store instead of loading here
-        from Scripts.vector_store import get_embedding_model
-        embedding_model = get_embedding_model()
-        print("✅ Application initialized successfully")
+        generated = await asyncio.wait_for(
+            asyncio.to_thread(generate_interview_questions_batch, pairs, max_time=QUESTION_TIMEOUT_SECONDS),
+            timeout=QUESTION_TIMEOUT_SECONDS + QUESTION_TIMEOUT_GRACE_SECONDS
+        )
+    except asyncio.TimeoutError:
+        generated = [(False, "Interview questions generation timed out. Please try again.")] * len(missing)
     except Exception as e:
-        print(f"❌ Failed to initialize application: {e}")
-
-@app.get("/", response_class=HTMLResponse)
-async def read_root():
-    """Serve the main landing page"""
-    html_content = """
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Multilingual Resume Screener & Interview Assistant</title>
-        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-        <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
-        <style>
-            .hero-section {
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 80px 0;
-            }
-            .role-card {
-                border: none;
-                border-radius: 15px;
-                box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-                transition: transform 0.3s ease;
-                cursor: pointer;
-            }
-            .role-card:hover {
-                transform: translateY(-5px);
-            }
-            
-            /* New AI Brain Design */
-            .hero-illustration {
-                position: relative;
-                display: flex;
-                flex-direction: column;
-                align-items: center;
-                justify-content: center;
-                height: 400px;
-            }
-            
-            .ai-brain {
-                position: relative;
-                display: flex;
-                flex-direction: column;
-                align-items: center;
-                margin-bottom: 2rem;
-            }
-            
-            .neural-network {
-                position: relative;
-                width: 200px;
-                height: 120px;
-                display: grid;
-                grid-template-columns: repeat(3, 1fr);
-                grid-template-rows: repeat(2, 1fr);
-                gap: 20px;
-            }
-            
-            .node {
-                width: 20px;
-                height: 20px;
-                background: rgba(255, 255, 255, 0.8);
-                border-radius: 50%;
-                position: relative;
-                animation: pulse 2s infinite;
-            }
-            
-            .node:nth-child(1) { animation-delay: 0s; }
-            .node:nth-child(2) { animation-delay: 0.3s; }
-            .node:nth-child(3) { animation-delay: 0.6s; }
-            .node:nth-child(4) { animation-delay: 0.9s; }
-            .node:nth-child(5) { animation-delay: 1.2s; }
-            .node:nth-child(6) { animation-delay: 1.5s; }
-            
-            .node::before {
-                content: '';
-                position: absolute;
-                top: 50%;
-                left: 50%;
-                width: 30px;
-                height: 2px;
-                background: rgba(255, 255, 255, 0.3);
-                transform: translate(-50%, -50%);
-            }
-            
-            .node::after {
-                content: '';
-                position: absolute;
-                top: 50%;
-                left: 50%;
-                width: 2px;
-                height: 30px;
-                background: rgba(255, 255, 255, 0.3);
-                transform: translate(-50%, -50%);
-            }
-            
-            @keyframes pulse {
-                0%, 100% { 
-                    transform: scale(1);
-                    opacity: 0.8;
-                }
-                50% { 
-                    transform: scale(1.2);
-                    opacity: 1;
-                }
-            }
-            
-            .tech-stack {
-                display: flex;
-                gap: 10px;
-                flex-wrap: wrap;
-                justify-content: center;
-            }
-            
-            .tech-badge {
-                background: rgba(255, 255, 255, 0.2);
-                color: white;
-                padding: 8px 16px;
-                border-radius: 20px;
-                font-size: 0.9rem;
-                font-weight: 600;
-                border: 1px solid rgba(255, 255, 255, 0.3);
-                backdrop-filter: blur(10px);
-                transition: all 0.3s ease;
-            }
-            
-            .tech-badge:hover {
-                background: rgba(255, 255, 255, 0.3);
-                transform: translateY(-2px);
-            }
-        </style>
-    </head>
-    <body>
-        <!-- Hero Section -->
-        <div class="hero-section">
-            <div class="container">
-                <div class="row align-items-center">
-                    <div class="col-lg-6">
-                        <h1 class="display-4 fw-bold mb-4">
-                            <i class="fas fa-globe-americas me-3"></i>
-                            Multilingual Resume Screener
-                        </h1>
-                        <p class="lead mb-4">
-                            AI-powered resume screening and interview question generation 
-                            supporting English, French, German, and Spanish resumes.
-                        </p>
-                    </div>
-                    <div class="col-lg-6 text-center">
-                        <div class="hero-illustration">
-                            <div class="ai-brain">
-                                <i class="fas fa-brain" style="font-size: 4rem; color: #fff; margin-bottom: 1rem;"></i>
-                                <div class="neural-network">
-                                    <div class="node"></div>
-                                    <div class="node"></div>
-                                    <div class="node"></div>
-                                    <div class="node"></div>
-                                    <div class="node"></div>
-                                    <div class="node"></div>
-                                </div>
-                            </div>
-                            <div class="tech-stack">
-                                <span class="tech-badge">AI</span>
-                                <span class="tech-badge">NLP</span>
-                                <span class="tech-badge">ML</span>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <!-- Role Selection Section -->
-        <div class="container my-5">
-            <div class="row justify-content-center">
-                <div class="col-lg-8 text-center">
-                    <h2 class="mb-5">Choose Your Role</h2>
-                    <div class="row">
-                        <div class="col-md-6 mb-4">
-                            <div class="card role-card h-100" onclick="window.location.href='/recruiter'">
-                                <div class="card-body text-center p-5">
-                                    <i class="fas fa-user-tie fa-4x text-primary mb-4"></i>
-                                    <h4 class="card-title">Recruiter</h4>
-                                    <p class="card-text">
-                                        Upload job descriptions, find matching candidates, 
-                                        and generate interview questions for top matches.
-                                    </p>
-                                    <button class="btn btn-primary btn-lg">
-                                        <i class="fas fa-search me-2"></i>Find Candidates
-                                    </button>
-                                </div>
-                            </div>
-                        </div>
-                        <div class="col-md-6 mb-4">
-                            <div class="card role-card h-100" onclick="window.location.href='/employee'">
-                                <div class="card-body text-center p-5">
-                                    <i class="fas fa-user fa-4x text-success mb-4"></i>
-                                    <h4 class="card-title">Job Seeker</h4>
-                                    <p class="card-text">
-                                        Upload your resume and find matching job opportunities 
-                                        across multiple languages.
-                                    </p>
-                                    <button class="btn btn-success btn-lg">
-                                        <i class="fas fa-upload me-2"></i>Upload Resume
-                                    </button>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
-    </body>
-    </html>
-    """
-    return HTMLResponse(content=html_content)
-
-@app.get("/recruiter", response_class=HTMLResponse)
-async def recruiter_dashboard():
-    """Recruiter dashboard for job posting and candidate matching"""
-    html_content = """
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Recruiter Dashboard - Multilingual Resume Screener</title>
-        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-        <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
-        <style>
-            .hero-section {
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 40px 0;
-            }
-            .result-card {
-                border-radius: 10px;
-                box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-                margin-bottom: 20px;
-            }
-            .contact-info {
-                background: #f8f9fa;
-                border-radius: 8px;
-                padding: 15px;
-                margin-top: 10px;
-            }
-        </style>
-    </head>
-    <body>
-        <!-- Navigation -->
-        <nav class="navbar navbar-expand-lg navbar-dark bg-primary">
-            <div class="container">
-                <a class="navbar-brand" href="/">
-                    <i class="fas fa-globe-americas me-2"></i>Resume Screener
-                </a>
-                <div class="navbar-nav ms-auto">
-                    <a class="nav-link" href="/"><i class="fas fa-home me-1"></i>Home</a>
-                    <a class="nav-link active" href="/recruiter"><i class="fas fa-user-tie me-1"></i>Recruiter</a>
-                    <a class="nav-link" href="/employee"><i class="fas fa-user me-1"></i>Employee</a>
-                </div>
-            </div>
-        </nav>
-
-        <!-- Hero Section -->
-        <div class="hero-section">
-            <div class="container">
-                <h1><i class="fas fa-user-tie me-3"></i>Recruiter Dashboard</h1>
-                <p class="lead">Find the best candidates for your job openings</p>
-            </div>
-        </div>
-
-        <!-- Job Description Form -->
-        <div class="container my-5">
-            <div class="row justify-content-center">
-                <div class="col-lg-8">
-                    <div class="card">
-                        <div class="card-header bg-primary text-white">
-                            <h4 class="mb-0"><i class="fas fa-search me-2"></i>Find Matching Candidates</h4>
-                        </div>
-                        <div class="card-body">
-                            <form id="jobDescriptionForm">
-                                <div class="mb-3">
-                                    <label for="jobTitle" class="form-label">Job Title</label>
-                                    <input type="text" class="form-control" id="jobTitle" name="jobTitle" required>
-                                </div>
-                                <div class="mb-3">
-                                    <label for="jobDescription" class="form-label">Job Description</label>
-                                    <textarea class="form-control" id="jobDescription" name="jobDescription" rows="5" required></textarea>
-                                </div>
-                                <div class="mb-3">
-                                    <label for="requirements" class="form-label">Requirements (one per line)</label>
-                                    <textarea class="form-control" id="requirements" name="requirements" rows="3"></textarea>
-                                </div>
-                                <div class="mb-3">
-                                    <label for="skills" class="form-label">Required Skills (comma-separated)</label>
-                                    <input type="text" class="form-control" id="skills" name="skills">
-                                </div>
-                                <button type="submit" class="btn btn-primary">
-                                    <i class="fas fa-search me-2"></i>Find Matching Candidates
-                                </button>
-                            </form>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <!-- Results Section -->
-        <div class="container my-5" id="results-section" style="display: none;">
-            <div class="row">
-                <div class="col-12">
-                    <h3><i class="fas fa-users me-2"></i>Top Matching Candidates</h3>
-                    <div id="results-container"></div>
-                </div>
-            </div>
-        </div>
-
-        <!-- Loading Modal -->
-        <div class="modal fade" id="loadingModal" tabindex="-1" data-bs-backdrop="static" data-bs-keyboard="false">
-            <div class="modal-dialog modal-dialog-centered">
-                <div class="modal-content">
-                    <div class="modal-body text-center">
-                        <div class="spinner-border text-primary mb-3" role="status"></div>
-                        <h5>Finding Best Candidates...</h5>
-                        <p>This may take a few moments.</p>
-                        <div class="progress mt-3" style="height: 4px;">
-                            <div class="progress-bar progress-bar-striped progress-bar-animated" role="progressbar" style="width: 0%"></div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
-        <script>
-            document.getElementById('jobDescriptionForm').addEventListener('submit', async (e) => {
-                e.preventDefault();
-                
-                const formData = new FormData(e.target);
-                const jobData = {
-                    title: formData.get('jobTitle'),
-                    description: formData.get('jobDescription'),
-                    requirements: formData.get('requirements').split('\\n').filter(req => req.trim()),
-                    skills: formData.get('skills').split(',').map(skill => skill.trim()).filter(skill => skill)
-                };
-
-                // Show loading modal
-                const loadingModal = new bootstrap.Modal(document.getElementById('loadingModal'));
-                loadingModal.show();
-
-                try {
-                    // Add timeout to the fetch request (90 seconds for complete processing)
-                    const controller = new AbortController();
-                    const timeoutId = setTimeout(() => controller.abort(), 90000);
-                    
-                    // Update loading message to show progress
-                    const loadingBody = document.querySelector('#loadingModal .modal-body');
-                    const progressBar = document.querySelector('#loadingModal .progress-bar');
-                    
-                    loadingBody.innerHTML = `
-                        <div class="spinner-border text-primary mb-3" role="status"></div>
-                        <h5>Finding Best Candidates...</h5>
-                        <p>Analyzing job requirements and matching candidates...</p>
-                        <div class="progress mt-3" style="height: 4px;">
-                            <div class="progress-bar progress-bar-striped progress-bar-animated" role="progressbar" style="width: 25%"></div>
-                        </div>
-                    `;
-                    
-                    const response = await fetch('/api/match-candidates', {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json',
-                        },
-                        body: JSON.stringify(jobData),
-                        signal: controller.signal
-                    });
-
-                    clearTimeout(timeoutId);
-                    
-                    if (!response.ok) {
-                        throw new Error(`HTTP error! status: ${response.status}`);
-                    }
-
-                    // Update loading message for final processing
-                    loadingBody.innerHTML = `
-                        <div class="spinner-border text-primary mb-3" role="status"></div>
-                        <h5>Generating Interview Questions...</h5>
-                        <p>Creating personalized questions for each candidate...</p>
-                        <div class="progress mt-3" style="height: 4px;">
-                            <div class="progress-bar progress-bar-striped progress-bar-animated" role="progressbar" style="width: 75%"></div>
-                        </div>
-                    `;
-                    
-                    const results = await response.json();
-                    
-                    // Small delay to show the final loading state
-                    await new Promise(resolve => setTimeout(resolve, 1000));
-                    
-                    // Hide modal and display results
-                    loadingModal.hide();
-                    displayResults(results);
-                    
-                } catch (error) {
-                    console.error('Error:', error);
-                    loadingModal.hide(); // Hide modal on error too
-                    if (error.name === 'AbortError') {
-                        alert('Request timed out. Please try again with a simpler job description.');
-                    } else {
-                        alert('An error occurred while processing your request. Please try again.');
-                    }
-                }
-            });
-
-            function displayResults(results) {
-                const container = document.getElementById('results-container');
-                const resultsSection = document.getElementById('results-section');
-                
-                container.innerHTML = '';
-                
-                results.candidates.forEach((candidate, index) => {
-                    const card = document.createElement('div');
-                    card.className = 'card result-card';
-                    card.innerHTML = `
-                        <div class="card-header d-flex justify-content-between align-items-center">
-                            <h5 class="mb-0">Candidate ${index + 1} (Score: ${(1 - candidate.score).toFixed(3)})</h5>
-                            <span class="badge bg-primary">${candidate.language}</span>
-                        </div>
-                        <div class="card-body">
-                            <div class="row">
-                                <div class="col-md-8">
-                                    <h6>Resume Snippet:</h6>
-                                    <p class="text-muted">${candidate.resume_snippet.substring(0, 300)}...</p>
-                                    
-                                    <div class="contact-info">
-                                        <h6><i class="fas fa-address-card me-2"></i>Contact Information:</h6>
-                                        <p><strong>Email:</strong> ${candidate.contact_info.email || 'Not available'}</p>
-                                        <p><strong>Phone:</strong> ${candidate.contact_info.phone || 'Not available'}</p>
-                                    </div>
-                                </div>
-                                <div class="col-md-4">
-                                    <h6>Interview Questions:</h6>
-                                    <ul class="list-unstyled">
-                                        ${candidate.interview_questions.split('\\n').map(q => 
-                                            `<li><i class="fas fa-question-circle text-primary me-2"></i>${q}</li>`
-                                        ).join('')}
-                                    </ul>
-                                </div>
-                            </div>
-                        </div>
-                    `;
-                    container.appendChild(card);
-                });
-                
-                resultsSection.style.display = 'block';
-                resultsSection.scrollIntoView({ behavior: 'smooth' });
-            }
-        </script>
-    </body>
-    </html>
-    """
-    return HTMLResponse(content=html_content)
-
-@app.get("/employee", response_class=HTMLResponse)
-async def employee_dashboard():
-    """Employee dashboard for resume upload and job matching"""
-    html_content = """
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Job Seeker Dashboard - Multilingual Resume Screener</title>
-        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-        <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
-        <style>
-            .hero-section {
-                background: linear-gradient(135deg, #28a745 0%, #20c997 100%);
-                color: white;
-                padding: 40px 0;
-            }
-            .upload-area {
-                border: 2px dashed #dee2e6;
-                border-radius: 10px;
-                padding: 40px;
-                text-align: center;
-                transition: border-color 0.3s ease;
-            }
-            .upload-area:hover {
-                border-color: #28a745;
-            }
-        </style>
-    </head>
-    <body>
-        <!-- Navigation -->
-        <nav class="navbar navbar-expand-lg navbar-dark bg-success">
-            <div class="container">
-                <a class="navbar-brand" href="/">
-                    <i class="fas fa-globe-americas me-2"></i>Resume Screener
-                </a>
-                <div class="navbar-nav ms-auto">
-                    <a class="nav-link" href="/"><i class="fas fa-home me-1"></i>Home</a>
-                    <a class="nav-link" href="/recruiter"><i class="fas fa-user-tie me-1"></i>Recruiter</a>
-                    <a class="nav-link active" href="/employee"><i class="fas fa-user me-1"></i>Employee</a>
-                </div>
-            </div>
-        </nav>
-
-        <!-- Hero Section -->
-        <div class="hero-section">
-            <div class="container">
-                <h1><i class="fas fa-user me-3"></i>Job Seeker Dashboard</h1>
-                <p class="lead">Upload your resume and find matching job opportunities</p>
-            </div>
-        </div>
-
-        <!-- Resume Upload Section -->
-        <div class="container my-5">
-            <div class="row justify-content-center">
-                <div class="col-lg-8">
-                    <div class="card">
-                        <div class="card-header bg-success text-white">
-                            <h4 class="mb-0"><i class="fas fa-file-upload me-2"></i>Upload Your Resume</h4>
-                        </div>
-                        <div class="card-body">
-                            <form id="resumeUploadForm">
-                                <div class="upload-area" id="uploadArea">
-                                    <i class="fas fa-cloud-upload-alt fa-3x text-muted mb-3"></i>
-                                    <h5>Drag & Drop Resume Here</h5>
-                                    <p class="text-muted">Supports PDF, TXT, and DOC files</p>
-                                    <input type="file" id="resumeFile" name="resume_file" accept=".pdf,.txt,.doc,.docx" style="display: none;">
-                                    <button type="button" class="btn btn-outline-success" onclick="document.getElementById('resumeFile').click()">
-                                        <i class="fas fa-folder-open me-2"></i>Choose File
-                                    </button>
-                                </div>
-                                <div class="mt-3">
-                                    <button type="submit" class="btn btn-success" id="uploadBtn" disabled>
-                                        <i class="fas fa-upload me-2"></i>Upload Resume
-                                    </button>
-                                </div>
-                            </form>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
-        <script>
-            const resumeFile = document.getElementById('resumeFile');
-            const uploadBtn = document.getElementById('uploadBtn');
-            const uploadArea = document.getElementById('uploadArea');
-
-            // File selection handling
-            resumeFile.addEventListener('change', (e) => {
-                if (e.target.files.length > 0) {
-                    uploadBtn.disabled = false;
-                    uploadArea.innerHTML = `
-                        <i class="fas fa-file fa-3x text-success mb-3"></i>
-                        <h5>File Selected: ${e.target.files[0].name}</h5>
-                        <p class="text-muted">Ready to upload</p>
-                    `;
-                }
-            });
-
-            // Drag and drop handling
-            uploadArea.addEventListener('dragover', (e) => {
-                e.preventDefault();
-                uploadArea.style.borderColor = '#28a745';
-            });
-
-            uploadArea.addEventListener('dragleave', (e) => {
-                e.preventDefault();
-                uploadArea.style.borderColor = '#dee2e6';
-            });
-
-            uploadArea.addEventListener('drop', (e) => {
-                e.preventDefault();
-                uploadArea.style.borderColor = '#dee2e6';
-                const files = e.dataTransfer.files;
-                if (files.length > 0) {
-                    resumeFile.files = files;
-                    uploadBtn.disabled = false;
-                    uploadArea.innerHTML = `
-                        <i class="fas fa-file fa-3x text-success mb-3"></i>
-                        <h5>File Selected: ${files[0].name}</h5>
-                        <p class="text-muted">Ready to upload</p>
-                    `;
-                }
-            });
-
-            // Resume upload form
-            document.getElementById('resumeUploadForm').addEventListener('submit', async (e) => {
-                e.preventDefault();
-                
-                const formData = new FormData();
-                formData.append('resume_file', resumeFile.files[0]);
-
-                try {
-                    const response = await fetch('/api/upload-resume', {
-                        method: 'POST',
-                        body: formData
-                    });
-
-                    const result = await response.json();
-                    if (result.success) {
-                        alert('Resume uploaded successfully!');
-                        document.getElementById('resumeUploadForm').reset();
-                        uploadBtn.disabled = true;
-                        uploadArea.innerHTML = `
-                            <i class="fas fa-cloud-upload-alt fa-3x text-muted mb-3"></i>
-                            <h5>Drag & Drop Resume Here</h5>
-                            <p class="text-muted">Supports PDF, TXT, and DOC files</p>
-                            <input type="file" id="resumeFile" name="resume_file" accept=".pdf,.txt,.doc,.docx" style="display: none;">
-                            <button type="button" class="btn btn-outline-success" onclick="document.getElementById('resumeFile').click()">
-                                <i class="fas fa-folder-open me-2"></i>Choose File
-                            </button>
-                        `;
-                    } else {
-                        alert('Error uploading resume: ' + result.error);
-                    }
-                } catch (error) {
-                    console.error('Error:', error);
-                    alert('An error occurred while uploading the resume.');
-                }
-            });
-        </script>
-    </body>
-    </html>
-    """
-    return HTMLResponse(content=html_content)
+        generated = [(False, f"Error generating questions: {str(e)}")] * len(missing)
+    
+    for index, (ok, candidate_questions) in zip(missing, generated):
+        # Errors and timeouts are worth retrying, so only real questions are cached
+        if ok and keys[index] is not None:
+            remember_questions(keys[index], candidate_questions)
+        yield index, candidate_questions
 
 @app.post("/api/match-candidates")
 async def match_candidates(job_data: Dict[str, Any]):
-    """Match job description with top 5 candidates and generate interview questions"""
+    """Match job description with top 5 candidates
+
+    Only runs the embedding search, so it returns quickly; interview questions
+    are generated separately through /api/interview-questions.
+    """
     try:
         # Build job description text
         job_text = build_job_description_text(job_data)
         
+        # Repeated searches skip both the embedding and the search. The resume count is part
+        # of the key, so an upload (in any worker) makes older results unreachable
+        _, collection = init_chroma()
+        cache_key = (hashlib.sha1(normalize_query(job_text).encode("utf-8")).hexdigest(), collection.count())
+        candidates = match_cache.get(cache_key)
+        if candidates is not None:
+            match_cache.move_to_end(cache_key)
+            return {
+                "success": True,
+                "candidates": candidates,
+                "job_title": job_data["title"]
+            }
+        
         # Embed job description
-        job_embedding = embedding_model.encode(job_text).tolist()
+        job_embeddings = [await encode_query(job_text)]
         
         # Query top 5 matches
-        results = collection.query(
-            query_embeddings=[job_embedding], 
-            n_results=5
-        )
+        results = await run_in_cpu_pool(query_resumes, collection, job_embeddings, 5)
         
-        # Prepare candidates data first
-        candidates_data = []
+        candidates = []
         for i in range(len(results["documents"][0])):
             resume_snippet = results["documents"][0][i]
             score = results["distances"][0][i]
             
-            # Extract contact information from resume
-            contact_info = {
-                "email": extract_email(resume_snippet),
-                "phone": extract_phone(resume_snippet)
-            }
-            
-            candidates_data.append({
-                "resume_snippet": resume_snippet,
-                "score": score,
-                "contact_info": contact_info
-            })
-        
-        # Generate interview questions for all candidates in parallel
-        import asyncio
-        import concurrent.futures
-        
-        async def generate_questions_for_candidate(candidate_data):
-            try:
-                # Set a timeout for question generation (30 seconds)
-                questions = await asyncio.wait_for(
-                    asyncio.to_thread(generate_interview_questions, job_data["title"], candidate_data["resume_snippet"]),
-                    timeout=30.0
-                )
-                return questions
-            except asyncio.TimeoutError:
-                return "Interview questions generation timed out. Please try again."
-            except Exception as e:
-                return f"Error generating questions: {str(e)}"
-        
-        # Generate questions for all candidates simultaneously
-        question_tasks = [generate_questions_for_candidate(candidate) for candidate in candidates_data]
-        questions_results = await asyncio.gather(*question_tasks, return_exceptions=True)
-        
-        # Combine results
-        candidates = []
-        for i, candidate_data in enumerate(candidates_data):
-            questions = questions_results[i] if not isinstance(questions_results[i], Exception) else f"Error: {str(questions_results[i])}"
+            # Extract contact information from resume (cached per document)
+            contact_info = extract_contact_info(results["ids"][0][i], resume_snippet)
             
             # Detect language (simplified - assume English for now)
             language = "English"  # This could be enhanced with language detection
             
             candidates.append({
-                "resume_snippet": candidate_data["resume_snippet"],
-                "score": candidate_data["score"],
-                "interview_questions": questions,
+                "resume_snippet": resume_snippet,
+                "score": score,
                 "language": language,
-                "contact_info": candidate_data["contact_info"]
+                "contact_info": contact_info
             })
         
+        match_cache[cache_key] = candidates
+        if len(match_cache) > MATCH_CACHE_SIZE:
+            match_cache.popitem(last=False)
+        
         return {
             "success": True,
             "candidates": candidates,
@@ -773,69 +386,242 @@ async def match_candidates(job_data: Dict[str, Any]):
         }
         
     except Exception as e:
-        print(f"Error in match_candidates: {e}")
-        raise HTTPException(status_code=500, detail=f"Error matching candidates: {str(e)}")
+        # The details go to the log; clients get a stable message without internals
+        logger.exception("ERROR: match_candidates failed", extra={"job_title": job_data.get("title")})
+        raise HTTPException(status_code=500, detail="Error matching candidates")
+
+@app.post("/api/interview-questions")
+async def interview_questions(request_data: Dict[str, Any]):
+    """Stream interview questions for matched candidates as server-sent events
+
+    Expects {"job_title": str, "resume_snippets": [str, ...]}. Each candidate's
+    questions are sent as a `data: {"index": i, "interview_questions": "..."}`
+    event as soon as they are ready, cached ones first, so events may arrive out
+    of order. The request carries everything needed, so it can be served by any worker.
+    """
+    job_title = request_data.get("job_title")
+    resume_snippets = request_data.get("resume_snippets")
+    if not job_title or not isinstance(resume_snippets, list):
+        raise HTTPException(status_code=400, detail="job_title and resume_snippets are required")
+    
+    async def events():
+        async for index, candidate_questions in stream_questions_for_candidates(job_title, resume_snippets):
+            yield b"data: " + orjson.dumps({"index": index, "interview_questions": candidate_questions}) + b"\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"cache-control": "no-cache"})
+
+def prepare_resume_text(text_content):
+    """Detect the language of an uploaded resume, translate it to English if needed and parse it
+
+    Returns (language, text to store in the vector store).
+    """
+    # Detect language
+    lang = detect_language(text_content)
+    
+    # Translate if not English
+    if lang in ['fr', 'es', 'de']:
+        translated_content = translate_text(text_content, lang)
+        # Parse both original and translated
+        original_parsed = parse_resume(text_content)
+        translated_parsed = parse_resume(translated_content)
+        
+        # Use translated content for vector store
+        final_content = translated_content
+    else:
+        # Parse English content
+        original_parsed = parse_resume(text_content)
+        final_content = text_content
+    
+    return lang, final_content
+
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+def extract_text_from_docx(content):
+    """Extract paragraph text from a .docx (zipped WordprocessingML) file"""
+    if docx is not None:
+        return "\n".join(paragraph.text for paragraph in docx.Document(io.BytesIO(content)).paragraphs)
+    
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        root = ET.fromstring(archive.read("word/document.xml"))
+    return "\n".join(
+        "".join(node.text or "" for node in paragraph.iter(WORD_NAMESPACE + "t"))
+        for paragraph in root.iter(WORD_NAMESPACE + "p")
+    )
+
+def extract_text_from_doc(content):
+    """Extract text from a legacy binary .doc file with antiword"""
+    antiword = shutil.which("antiword")
+    if antiword is None:
+        raise Exception("Reading .doc files requires antiword; please upload a PDF, DOCX or TXT instead")
+    
+    with tempfile.NamedTemporaryFile(suffix=".doc") as f:
+        f.write(content)
+        f.flush()
+        result = subprocess.run([antiword, "-w", "0", f.name], capture_output=True, check=True)
+    return result.stdout.decode("utf-8", errors="replace")
+
+def decode_text(content):
+    """Decode an uploaded text file, detecting the charset when it isn't UTF-8"""
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        pass
+    
+    best = detect_charset(content).best() if detect_charset is not None else None
+    if best is None:
+        return content.decode('utf-8', errors='replace')
+    return str(best)
+
+def extract_text_from_upload(content, file_extension):
+    """Extract the text of an uploaded resume according to its file type"""
+    if file_extension == 'pdf':
+        return extract_text_from_pdf(io.BytesIO(content))
+    if file_extension == 'docx':
+        return extract_text_from_docx(content)
+    if file_extension == 'doc':
+        return extract_text_from_doc(content)
+    return decode_text(content)
+
+def write_upload_status(upload_id, status):
+    """Record the processing status of an upload, replacing the file atomically"""
+    os.makedirs(UPLOAD_STATUS_DIR, exist_ok=True)
+    path = os.path.join(UPLOAD_STATUS_DIR, f"{upload_id}.json")
+    with open(path + ".tmp", "wb") as f:
+        f.write(orjson.dumps(status))
+    os.replace(path + ".tmp", path)
+
+def process_uploaded_resume(upload_id, filename, content, file_extension):
+    """Extract, translate, parse, embed and store an uploaded resume, recording its status as it goes"""
+    try:
+        text_content = extract_text_from_upload(content, file_extension)
+        
+        lang, final_content = prepare_resume_text(text_content)
+        
+        # Add to vector store
+        resume_embedding = embed_texts([final_content])
+        _, collection = init_chroma()
+        resume_id = f"uploaded_{filename}"
+        collection.add(
+            documents=[final_content],
+            embeddings=resume_embedding.tolist(),
+            ids=[resume_id]
+        )
+        # Keep the in-memory search index current without reloading it from Chroma
+        add_to_resume_index(collection, [resume_id], [final_content], resume_embedding)
+        
+        write_upload_status(upload_id, {
+            "status": "done",
+            "filename": filename,
+            "language": lang,
+            "message": f"Resume uploaded and processed successfully. Language detected: {lang}"
+        })
+    except Exception as e:
+        logger.exception(f"ERROR: Error processing uploaded resume {filename}: {e}")
+        write_upload_status(upload_id, {"status": "error", "filename": filename, "message": f"Error processing resume: {str(e)}"})
 
-@app.post("/api/upload-resume")
-async def upload_resume(resume_file: UploadFile = File(...)):
-    """Upload and process a new resume"""
+@app.post("/api/upload-resume", status_code=202)
+async def upload_resume(background_tasks: BackgroundTasks, resume_file: UploadFile = File(...)):
+    """Accept a resume and process it in the background
+
+    Poll /api/upload-resume/{upload_id}/status for the result.
+    """
     try:
         # Check file type
         if not resume_file.filename:
             raise HTTPException(status_code=400, detail="No file provided")
         
         file_extension = resume_file.filename.lower().split('.')[-1]
-        
-        # Extract text based on file type
-        if file_extension == 'pdf':
-            # Read PDF content
-            content = await resume_file.read()
-            pdf_file = io.BytesIO(content)
-            text_content = extract_text_from_pdf(pdf_file)
-        elif file_extension in ['txt', 'doc', 'docx']:
-            # Read text content
-            content = await resume_file.read()
-            text_content = content.decode('utf-8')
-        else:
+        if file_extension not in ['pdf', 'txt', 'doc', 'docx']:
             raise HTTPException(status_code=400, detail="Unsupported file type. Please upload PDF, TXT, or DOC files.")
         
-        # Detect language
-        lang = detect_language(text_content)
-        
-        # Translate if not English
-        if lang in ['fr', 'es', 'de']:
-            translated_content = translate_text(text_content, lang)
-            # Parse both original and translated
-            original_parsed = parse_resume(text_content)
-            translated_parsed = parse_resume(translated_content)
-            
-            # Use translated content for vector store
-            final_content = translated_content
-        else:
-            # Parse English content
-            original_parsed = parse_resume(text_content)
-            final_content = text_content
-        
-        # Add to vector store
-        collection.add(
-            documents=[final_content],
-            ids=[f"uploaded_{resume_file.filename}"]
-        )
+        content = await resume_file.read()
+        upload_id = uuid.uuid4().hex
+        write_upload_status(upload_id, {"status": "processing", "filename": resume_file.filename})
+        # Extraction, translation, parsing and embedding run after the response is sent,
+        # on the CPU pool so they don't block the event loop
+        background_tasks.add_task(run_in_cpu_pool, process_uploaded_resume, upload_id, resume_file.filename, content, file_extension)
         
         return {
             "success": True,
-            "message": f"Resume uploaded and processed successfully. Language detected: {lang}",
-            "filename": resume_file.filename
+            "message": "Resume received and is being processed",
+            "filename": resume_file.filename,
+            "upload_id": upload_id,
+            "status_url": f"/api/upload-resume/{upload_id}/status"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error uploading resume: {str(e)}")
+        logger.exception("ERROR: upload_resume failed", extra={"resume_filename": resume_file.filename})
+        raise HTTPException(status_code=500, detail="Error uploading resume")
+
+@app.get("/api/upload-resume/{upload_id}/status")
+async def upload_status(upload_id: str):
+    """Report whether an uploaded resume is still processing, done or failed"""
+    # Ids are uuid4 hex, so anything else can't name a status file
+    if len(upload_id) != 32 or any(c not in "0123456789abcdef" for c in upload_id):
+        raise HTTPException(status_code=404, detail="Unknown upload id")
+    try:
+        with open(os.path.join(UPLOAD_STATUS_DIR, f"{upload_id}.json"), "rb") as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Unknown upload id")
 
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "message": "Multilingual Resume Screener is running"}
 
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves HTML and CSS from brotli/gzip bytes compressed once at startup"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.compressed = {}  # real path -> (mtime, {encoding: bytes})
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(PRECOMPRESSED_SUFFIXES):
+                    path = os.path.realpath(os.path.join(root, name))
+                    with open(path, "rb") as f:
+                        data = f.read()
+                    variants = {"gzip": gzip.compress(data, 9)}
+                    if brotli is not None:
+                        variants["br"] = brotli.compress(data, quality=11)
+                    self.compressed[path] = (os.stat(path).st_mtime, variants)
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        cached = self.compressed.get(os.path.realpath(full_path))
+        if response.status_code == 304 or cached is None or cached[0] != stat_result.st_mtime:
+            return response
+        
+        accept_encoding = dict(scope["headers"]).get(b"accept-encoding", b"").decode("latin-1")
+        encoding = next((enc for enc in ("br", "gzip") if enc in accept_encoding and enc in cached[1]), None)
+        if encoding is None:
+            return response
+        
+        headers = {
+            "content-encoding": encoding,
+            "vary": "Accept-Encoding",
+            "etag": "W/" + response.headers["etag"],
+            "last-modified": response.headers["last-modified"],
+        }
+        return Response(cached[1][encoding], status_code=status_code, media_type=response.media_type, headers=headers)
+
+# Shared stylesheet and other assets
+app.mount("/static", PrecompressedStaticFiles(directory="static"), name="static")
+
+# Dashboard pages are plain HTML served from static/ (index.html, recruiter/, employee/).
+# Mounted last so it only handles paths no API route matched.
+app.mount("/", PrecompressedStaticFiles(directory="static", html=True), name="pages")
+
 if __name__ == "__main__":
     port = int(os.getenv("PORT", "8000"))
-    uvicorn.run(app, host="0.0.0.0", port=port) 
\ No newline at end of file
+    # Each worker process loads its own copy of every model (generator, translators, MiniLM, spaCy),
+    # so more than one worker must be asked for explicitly and sized to the container's memory
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    # Split the cores between workers so their PyTorch/OpenMP/CTranslate2 thread pools
+    # do not oversubscribe the CPU; the models read this budget when they load
+    os.environ.setdefault("OMP_NUM_THREADS", str(max(1, (os.cpu_count() or 1) // workers)))
+    # uvicorn picks uvloop and httptools automatically when they are installed
+    uvicorn.run("app:app", host="0.0.0.0", port=port, workers=workers, access_log=False) 
\ No newline at end of file
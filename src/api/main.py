@@ -68,6 +68,8 @@ def create_app() -> FastAPI:
     Returns:
         FastAPI: Configured FastAPI application instance
     """
+    config.ensure_logging()
+    
     app = FastAPI(
         title="Multilingual Resume Assistant",
         description="""
@@ -5,7 +5,7 @@ This module contains the fundamental components for resume processing,
 language detection, and data management.
 """
 
-from .config import Config
+from .config import Config, get_config
 from .exceptions import ResumeProcessingError, LanguageDetectionError
 
-__all__ = ['Config', 'ResumeProcessingError', 'LanguageDetectionError'] 
\ No newline at end of file
+__all__ = ['Config', 'get_config', 'ResumeProcessingError', 'LanguageDetectionError'] 
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""
+Persistent cache for model inference results.
+
+Embeddings and translations are pure functions of the model and the input text,
+so they are stored in a SQLite table keyed by a SHA-256 digest and fronted by an
+in-process LRU. Repeat inputs then skip the transformer forward pass, across
+restarts and across worker processes sharing the same file.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceCache:
+    """
+    Two-level cache of inference results: an in-memory LRU over a SQLite table.
+
+    Values are stored as bytes; callers encode and decode them (e.g. float16
+    vectors with ``ndarray.tobytes`` / ``np.frombuffer``, strings as UTF-8).
+    The table keeps the most recently written ``max_disk_items`` entries; older
+    ones are deleted as new ones are written.
+
+    Attributes:
+        path (Optional[str]): SQLite database file, or None to keep entries in memory only
+        table (str): Table holding this cache's entries
+        max_memory_items (int): Entries kept in the in-memory LRU
+        max_disk_items (int): Entries kept in the SQLite table; 0 keeps all of them
+    """
+
+    def __init__(self, path: Optional[str], table: str, max_memory_items: int = 4096, max_disk_items: int = 0):
+        """
+        Open (or create) the cache table.
+
+        Args:
+            path (str, optional): SQLite database file. If None or the file cannot be
+                opened, the cache lives in memory only.
+            table (str): Table name for this cache; several caches can share one file
+            max_memory_items (int): Entries kept in the in-memory LRU
+            max_disk_items (int): Entries kept in the SQLite table; 0 keeps all of them
+        """
+        self.path = path
+        self.table = table
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        self._memory: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        if path:
+            try:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(f"CREATE TABLE IF NOT EXISTS {table} (hash BLOB PRIMARY KEY, value BLOB NOT NULL)")
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Inference cache at {path} unavailable, keeping entries in memory only: {e}")
+                self._db = None
+
+    @staticmethod
+    def key(model_name: str, text: str) -> bytes:
+        """
+        Cache key for the result of running a model on a text.
+
+        Args:
+            model_name (str): Name or path identifying the model (and any settings that change its output)
+            text (str): Input text
+
+        Returns:
+            bytes: SHA-256 digest of the model name and text
+        """
+        return hashlib.sha256(f"{model_name}|{text}".encode("utf-8")).digest()
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        """
+        Look up a cached value.
+
+        Args:
+            key (bytes): Key from ``InferenceCache.key``
+
+        Returns:
+            Optional[bytes]: The stored value, or None on a miss
+        """
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                return value
+            if self._db is None:
+                return None
+            try:
+                row = self._db.execute(f"SELECT value FROM {self.table} WHERE hash = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Inference cache lookup failed: {e}")
+                return None
+            if row is None:
+                return None
+            self._remember(key, row[0])
+            return row[0]
+
+    def set(self, key: bytes, value: bytes) -> None:
+        """
+        Store a value in memory and, if available, on disk.
+
+        Args:
+            key (bytes): Key from ``InferenceCache.key``
+            value (bytes): Value to store
+        """
+        self.set_many([(key, value)])
+
+    def set_many(self, items: Iterable[Tuple[bytes, bytes]]) -> None:
+        """
+        Store several values in one transaction.
+
+        Args:
+            items (Iterable[Tuple[bytes, bytes]]): (key, value) pairs, keys from ``InferenceCache.key``
+        """
+        items = list(items)
+        if not items:
+            return
+        with self._lock:
+            for key, value in items:
+                self._remember(key, value)
+            if self._db is None:
+                return
+            try:
+                self._db.executemany(f"INSERT OR REPLACE INTO {self.table} (hash, value) VALUES (?, ?)", items)
+                if self.max_disk_items > 0:
+                    # Rewritten entries get a fresh rowid, so the lowest rowids are the oldest writes
+                    self._db.execute(
+                        f"DELETE FROM {self.table} WHERE rowid <= (SELECT MAX(rowid) FROM {self.table}) - ?",
+                        (self.max_disk_items,)
+                    )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Inference cache write failed: {e}")
+
+    def _remember(self, key: bytes, value: bytes) -> None:
+        """Add an entry to the in-memory LRU, evicting the least recently used one if full."""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
@@ -6,13 +6,54 @@ variable support, validation, and type safety for all application settings.
 """
 
 import os
-from typing import Dict, List, Optional, Union
+import sys
+import functools
+from typing import Dict, List, Optional, Tuple, Union
 from pathlib import Path
 from dataclasses import dataclass, field
 import logging
 
 
-@dataclass
+@functools.lru_cache(maxsize=None)
+def _env(name: str, default: Optional[str] = None) -> Optional[str]:
+    """Read an environment variable once; see ``clear_env_cache``."""
+    return os.environ.get(name, default)
+
+
+@functools.lru_cache(maxsize=None)
+def _env_name(name: str, default: str) -> str:
+    """Read an enum-like string setting once, interned so comparisons against literals hit the identity fast path."""
+    return sys.intern(_env(name, default))
+
+
+@functools.lru_cache(maxsize=None)
+def _env_int(name: str, default: int) -> int:
+    """Read and parse an integer environment variable once."""
+    value = _env(name)
+    return int(value) if value is not None else default
+
+
+@functools.lru_cache(maxsize=None)
+def _env_float(name: str, default: float) -> float:
+    """Read and parse a float environment variable once."""
+    value = _env(name)
+    return float(value) if value is not None else default
+
+
+@functools.lru_cache(maxsize=None)
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean environment variable ("true", case-insensitive) once."""
+    value = _env(name)
+    return value.lower() == "true" if value is not None else default
+
+
+def clear_env_cache() -> None:
+    """Forget cached environment values, e.g. after a test changes ``os.environ``."""
+    for cached in (_env, _env_name, _env_int, _env_float, _env_bool):
+        cached.cache_clear()
+
+
+@dataclass(slots=True)
 class DatabaseConfig:
     """Database configuration settings."""
     
@@ -23,50 +64,83 @@ class DatabaseConfig:
     password: str = ""
     pool_size: int = 10
     max_overflow: int = 20
+    _dsn: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Settings are fixed once loaded, so build the connection string a single time
+        self._dsn = f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}"
     
     @property
     def connection_string(self) -> str:
-        """Generate database connection string."""
-        return f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}"
+        """Database connection string."""
+        return self._dsn
+
+
+# Translation model directory for each supported source language
+_MODEL_MAPPING: Dict[str, str] = {
+    "fr": "opus-mt-fr-en",
+    "es": "opus-mt-es-en",
+    "de": "opus-mt-de-en",
+}
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelConfig:
     """Machine learning model configuration."""
     
     # Translation models
     translation_models_dir: str = "models"
-    supported_languages: List[str] = field(default_factory=lambda: ["en", "es", "fr", "de"])
+    supported_languages: Tuple[str, ...] = ("en", "es", "fr", "de")
     
     # NLP models
     spacy_model: str = "en_core_web_sm"
     sentence_transformer_model: str = "all-MiniLM-L6-v2"
+    embedding_backend: str = "torch"  # "torch" or "onnx" (int8 ONNX Runtime, exported on first use)
+    embedding_onnx_quantization: str = "avx512_vnni"  # "arm64", "avx2", "avx512" or "avx512_vnni"
+    retrieval_backend: str = "matrix"  # "matrix" (exact numpy search in memory), "faiss" (int8 index, needs faiss-cpu) or "chroma"
     
     # Model loading settings
     device: str = "cpu"  # "cpu" or "cuda"
     max_length: int = 512
     batch_size: int = 32
+    dtype: Optional[str] = None  # "float32", "bfloat16" or "float16"; chosen per device when unset
+    num_threads: int = 0  # PyTorch intra-op threads; 0 uses every CPU
+    compile_models: bool = False  # wrap translation and PyTorch embedding models in torch.compile
+    
+    # Embeddings and translations are cached here by (model, text); None keeps them in memory only
+    inference_cache_path: Optional[str] = "data/inference_cache.sqlite3"
+    inference_cache_size: int = 4096  # entries per cache kept in memory
+    inference_cache_disk_size: int = 200000  # entries per cache kept on disk; 0 keeps all of them
+    _model_paths: Dict[str, str] = field(init=False, repr=False, compare=False)
+    _dir_exists: bool = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Translation model paths are looked up per request, so join them once
+        self._model_paths = {
+            language: str(Path(self.translation_models_dir) / model_name)
+            for language, model_name in _MODEL_MAPPING.items()
+        }
+        self.refresh_paths()
+    
+    def refresh_paths(self) -> None:
+        """Re-check whether the translation model directory exists."""
+        self._dir_exists = os.path.isdir(self.translation_models_dir)
     
     def get_model_path(self, language: str) -> str:
         """Get the path for a specific language model."""
-        model_mapping = {
-            "fr": "opus-mt-fr-en",
-            "es": "opus-mt-es-en", 
-            "de": "opus-mt-de-en"
-        }
-        model_name = model_mapping.get(language)
-        if not model_name:
-            raise ValueError(f"Unsupported language: {language}")
-        return str(Path(self.translation_models_dir) / model_name)
+        try:
+            return self._model_paths[language]
+        except KeyError:
+            raise ValueError(f"Unsupported language: {language}") from None
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingConfig:
     """Resume processing configuration."""
     
     # File processing
     max_file_size: int = 10 * 1024 * 1024  # 10MB
-    supported_formats: List[str] = field(default_factory=lambda: [".pdf", ".txt", ".docx"])
+    supported_formats: Tuple[str, ...] = (".pdf", ".txt", ".docx")
     
     # Text processing
     min_text_length: int = 50
@@ -77,9 +151,10 @@ class ProcessingConfig:
     extract_skills: bool = True
     extract_education: bool = True
     extract_experience: bool = True
+    run_ner_on_ingest: bool = False  # otherwise names/locations the heuristics miss wait for enrich_with_ner
 
 
-@dataclass
+@dataclass(slots=True)
 class APIConfig:
     """API configuration settings."""
     
@@ -89,16 +164,16 @@ class APIConfig:
     workers: int = 1
     
     # CORS settings
-    allowed_origins: List[str] = field(default_factory=lambda: ["*"])
-    allowed_methods: List[str] = field(default_factory=lambda: ["GET", "POST", "PUT", "DELETE"])
-    allowed_headers: List[str] = field(default_factory=lambda: ["*"])
+    allowed_origins: Tuple[str, ...] = ("*",)
+    allowed_methods: Tuple[str, ...] = ("GET", "POST", "PUT", "DELETE")
+    allowed_headers: Tuple[str, ...] = ("*",)
     
     # Rate limiting
     rate_limit_per_minute: int = 100
     rate_limit_per_hour: int = 1000
 
 
-@dataclass
+@dataclass(slots=True)
 class LoggingConfig:
     """Logging configuration."""
     
@@ -107,6 +182,63 @@ class LoggingConfig:
     file_path: Optional[str] = None
     max_file_size: int = 10 * 1024 * 1024  # 10MB
     backup_count: int = 5
+    level_int: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Resolve the level name once; unknown names fall back to INFO
+        self.level_int = logging.getLevelNamesMapping().get(self.level.upper(), logging.INFO)
+
+
+# Environment overrides per config section: (variable, field, reader, default)
+_ENV_SPEC = {
+    "database": (DatabaseConfig, (
+        ("DB_HOST", "host", _env, "localhost"),
+        ("DB_PORT", "port", _env_int, 5432),
+        ("DB_NAME", "name", _env, "resume_assistant"),
+        ("DB_USER", "user", _env, "postgres"),
+        ("DB_PASSWORD", "password", _env, ""),
+        ("DB_POOL_SIZE", "pool_size", _env_int, 10),
+        ("DB_MAX_OVERFLOW", "max_overflow", _env_int, 20),
+    )),
+    "model": (ModelConfig, (
+        ("MODEL_DIR", "translation_models_dir", _env, "models"),
+        ("SPACY_MODEL", "spacy_model", _env, "en_core_web_sm"),
+        ("SENTENCE_TRANSFORMER_MODEL", "sentence_transformer_model", _env, "all-MiniLM-L6-v2"),
+        ("EMBEDDING_BACKEND", "embedding_backend", _env_name, "torch"),
+        ("EMBEDDING_ONNX_QUANTIZATION", "embedding_onnx_quantization", _env, "avx512_vnni"),
+        ("RETRIEVAL_BACKEND", "retrieval_backend", _env_name, "matrix"),
+        ("MODEL_DEVICE", "device", _env_name, "cpu"),
+        ("MODEL_MAX_LENGTH", "max_length", _env_int, 512),
+        ("MODEL_BATCH_SIZE", "batch_size", _env_int, 32),
+        ("MODEL_DTYPE", "dtype", _env, None),
+        ("MODEL_NUM_THREADS", "num_threads", _env_int, 0),
+        ("MODEL_COMPILE", "compile_models", _env_bool, False),
+        ("INFERENCE_CACHE_PATH", "inference_cache_path", _env, "data/inference_cache.sqlite3"),
+        ("INFERENCE_CACHE_SIZE", "inference_cache_size", _env_int, 4096),
+        ("INFERENCE_CACHE_DISK_SIZE", "inference_cache_disk_size", _env_int, 200000),
+    )),
+    "processing": (ProcessingConfig, (
+        ("MAX_FILE_SIZE", "max_file_size", _env_int, 10 * 1024 * 1024),
+        ("MIN_TEXT_LENGTH", "min_text_length", _env_int, 50),
+        ("MAX_TEXT_LENGTH", "max_text_length", _env_int, 50000),
+        ("CONFIDENCE_THRESHOLD", "confidence_threshold", _env_float, 0.7),
+        ("RUN_NER_ON_INGEST", "run_ner_on_ingest", _env_bool, False),
+    )),
+    "api": (APIConfig, (
+        ("API_HOST", "host", _env, "0.0.0.0"),
+        ("API_PORT", "port", _env_int, 8000),
+        ("DEBUG", "debug", _env_bool, False),
+        ("WORKERS", "workers", _env_int, 1),
+        ("RATE_LIMIT_PER_MINUTE", "rate_limit_per_minute", _env_int, 100),
+        ("RATE_LIMIT_PER_HOUR", "rate_limit_per_hour", _env_int, 1000),
+    )),
+    "logging": (LoggingConfig, (
+        ("LOG_LEVEL", "level", _env_name, "INFO"),
+        ("LOG_FILE_PATH", "file_path", _env, None),
+        ("LOG_MAX_FILE_SIZE", "max_file_size", _env_int, 10 * 1024 * 1024),
+        ("LOG_BACKUP_COUNT", "backup_count", _env_int, 5),
+    )),
+}
 
 
 class Config:
@@ -118,73 +250,34 @@ class Config:
     application settings.
     """
     
+    # Logging is process-wide, so it is configured at most once per process
+    _logging_initialized: bool = False
+    
     def __init__(self):
         """Initialize configuration with environment variable overrides."""
-        self.database = self._load_database_config()
-        self.model = self._load_model_config()
-        self.processing = self._load_processing_config()
-        self.api = self._load_api_config()
-        self.logging = self._load_logging_config()
-        
-        # Set up logging
-        self._setup_logging()
-    
-    def _load_database_config(self) -> DatabaseConfig:
-        """Load database configuration from environment variables."""
-        return DatabaseConfig(
-            host=os.getenv("DB_HOST", "localhost"),
-            port=int(os.getenv("DB_PORT", "5432")),
-            name=os.getenv("DB_NAME", "resume_assistant"),
-            user=os.getenv("DB_USER", "postgres"),
-            password=os.getenv("DB_PASSWORD", ""),
-            pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
-            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20"))
-        )
-    
-    def _load_model_config(self) -> ModelConfig:
-        """Load model configuration from environment variables."""
-        return ModelConfig(
-            translation_models_dir=os.getenv("MODEL_DIR", "models"),
-            spacy_model=os.getenv("SPACY_MODEL", "en_core_web_sm"),
-            sentence_transformer_model=os.getenv("SENTENCE_TRANSFORMER_MODEL", "all-MiniLM-L6-v2"),
-            device=os.getenv("MODEL_DEVICE", "cpu"),
-            max_length=int(os.getenv("MODEL_MAX_LENGTH", "512")),
-            batch_size=int(os.getenv("MODEL_BATCH_SIZE", "32"))
-        )
-    
-    def _load_processing_config(self) -> ProcessingConfig:
-        """Load processing configuration from environment variables."""
-        return ProcessingConfig(
-            max_file_size=int(os.getenv("MAX_FILE_SIZE", str(10 * 1024 * 1024))),
-            min_text_length=int(os.getenv("MIN_TEXT_LENGTH", "50")),
-            max_text_length=int(os.getenv("MAX_TEXT_LENGTH", "50000")),
-            confidence_threshold=float(os.getenv("CONFIDENCE_THRESHOLD", "0.7"))
-        )
-    
-    def _load_api_config(self) -> APIConfig:
-        """Load API configuration from environment variables."""
-        return APIConfig(
-            host=os.getenv("API_HOST", "0.0.0.0"),
-            port=int(os.getenv("API_PORT", "8000")),
-            debug=os.getenv("DEBUG", "false").lower() == "true",
-            workers=int(os.getenv("WORKERS", "1")),
-            rate_limit_per_minute=int(os.getenv("RATE_LIMIT_PER_MINUTE", "100")),
-            rate_limit_per_hour=int(os.getenv("RATE_LIMIT_PER_HOUR", "1000"))
-        )
+        self.database: DatabaseConfig = self._load_section("database")
+        self.model: ModelConfig = self._load_section("model")
+        self.processing: ProcessingConfig = self._load_section("processing")
+        self.api: APIConfig = self._load_section("api")
+        self.logging: LoggingConfig = self._load_section("logging")
     
-    def _load_logging_config(self) -> LoggingConfig:
-        """Load logging configuration from environment variables."""
-        return LoggingConfig(
-            level=os.getenv("LOG_LEVEL", "INFO"),
-            file_path=os.getenv("LOG_FILE_PATH"),
-            max_file_size=int(os.getenv("LOG_MAX_FILE_SIZE", str(10 * 1024 * 1024))),
-            backup_count=int(os.getenv("LOG_BACKUP_COUNT", "5"))
-        )
+    def _load_section(self, section: str):
+        """Build one config section from its environment variables."""
+        section_cls, settings = _ENV_SPEC[section]
+        return section_cls(**{field_name: reader(name, default) for name, field_name, reader, default in settings})
     
-    def _setup_logging(self):
-        """Set up logging configuration."""
+    def ensure_logging(self) -> None:
+        """
+        Configure logging from these settings, once per process.
+        
+        Entry points that log (the API, worker scripts) call this; library code
+        that only reads settings never pays for handler setup.
+        """
+        if Config._logging_initialized:
+            return
+        Config._logging_initialized = True
         logging.basicConfig(
-            level=getattr(logging, self.logging.level),
+            level=self.logging.level_int,
             format=self.logging.format,
             handlers=self._get_log_handlers()
         )
@@ -212,24 +305,37 @@ class Config:
         Returns:
             bool: True if configuration is valid, raises exception otherwise
         """
-        # Validate database configuration
-        if not self.database.host:
-            raise ValueError("Database host cannot be empty")
-        
-        # Validate model configuration
-        if not Path(self.model.translation_models_dir).exists():
-            raise ValueError(f"Model directory does not exist: {self.model.translation_models_dir}")
-        
-        # Validate processing configuration
-        if self.processing.confidence_threshold < 0 or self.processing.confidence_threshold > 1:
-            raise ValueError("Confidence threshold must be between 0 and 1")
-        
-        # Validate API configuration
-        if self.api.port < 1 or self.api.port > 65535:
-            raise ValueError("API port must be between 1 and 65535")
+        # (is valid, error message) per section; the model directory check was done at load time
+        checks = (
+            (bool(self.database.host), "Database host cannot be empty"),
+            (self.model._dir_exists, f"Model directory does not exist: {self.model.translation_models_dir}"),
+            (0 <= self.processing.confidence_threshold <= 1, "Confidence threshold must be between 0 and 1"),
+            (1 <= self.api.port <= 65535, "API port must be between 1 and 65535"),
+        )
+        for is_valid, message in checks:
+            if not is_valid:
+                raise ValueError(message)
         
         return True
+    
+    def invalidate_paths(self) -> None:
+        """Re-check filesystem paths on the next validation, e.g. after a test creates them."""
+        self.model.refresh_paths()
+
+
+@functools.lru_cache(maxsize=1)
+def get_config() -> Config:
+    """
+    Get the global configuration instance, creating it on first use.
+    
+    Returns:
+        Config: The shared configuration instance
+    """
+    return Config()
 
 
-# Global configuration instance
-config = Config() 
\ No newline at end of file
+def __getattr__(name: str):
+    """Build the global ``config`` lazily when it is first accessed."""
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}") 
\ No newline at end of file
@@ -0,0 +1,16 @@
+"""
+Hardware capability checks for the model loaders.
+
+Reduced-precision dtypes only pay off where the CPU executes them natively;
+elsewhere they are emulated and run slower than float32.
+"""
+
+
+def cpu_supports_bf16() -> bool:
+    """Whether the CPU has native bfloat16 instructions (AVX512-BF16 or AMX), per /proc/cpuinfo."""
+    try:
+        with open("/proc/cpuinfo") as cpuinfo:
+            flags = cpuinfo.read()
+    except OSError:
+        return False
+    return "avx512_bf16" in flags or "amx_bf16" in flags
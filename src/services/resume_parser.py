@@ -7,19 +7,97 @@ other relevant data from various resume formats.
 """
 
 import os
+import re
+import functools
 import json
 import logging
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 from pathlib import Path
 import spacy
 from datetime import datetime
 
-from ..core.exceptions import ResumeProcessingError, DataValidationError
+from ..core.exceptions import ResumeProcessingError, DataValidationError, ModelLoadingError
 from ..core.config import config
-from .translation import translation_service
+from .translation import get_translation_service
 
 logger = logging.getLogger(__name__)
 
+# Only the entity recognizer is used (PERSON/GPE/LOC), so skip loading the rest of the pipeline
+SPACY_EXCLUDE = ["tagger", "parser", "attribute_ruler", "lemmatizer"]
+PERSONAL_INFO_CHARS = 1000  # names and locations are looked for in the opening of the resume
+PIPE_BATCH_SIZE = 64  # texts per nlp.pipe batch when parsing many resumes
+
+# Common skill keywords, matched as whole lowercase tokens
+SKILL_KEYWORDS = [
+    "python", "java", "javascript", "react", "angular", "vue", "node.js",
+    "sql", "mongodb", "postgresql", "mysql", "aws", "azure", "docker",
+    "kubernetes", "git", "agile", "scrum", "machine learning", "ai",
+    "data analysis", "statistics", "excel", "powerbi", "tableau",
+    "html", "css", "bootstrap", "jquery", "php", "c++", "c#", ".net",
+    "spring", "django", "flask", "fastapi", "express", "graphql",
+    "rest api", "microservices", "ci/cd", "jenkins", "github actions"
+]
+SKILL_CONTEXT_CHARS = 50  # characters kept on each side of a skill mention
+
+
+@functools.lru_cache(maxsize=4)
+def _load_spacy(model_name: str):
+    """Load a spaCy model once per process; every ResumeParser using it shares the same pipeline."""
+    nlp = spacy.load(model_name, exclude=SPACY_EXCLUDE)
+    if "ner" not in nlp.pipe_names:
+        raise ValueError(f"model has no 'ner' component (pipeline: {nlp.pipe_names})")
+    return nlp
+
+
+# Tokens may contain the punctuation used inside skill names ("c++", "c#", ".net", "node.js", "ci/cd").
+# Both patterns run on the original text (ASCII-only case folding), so match offsets index it directly.
+_SKILL_TOKEN_RE = re.compile(r"[a-z0-9+#./]+", re.IGNORECASE | re.ASCII)
+_SKILLS_SET = frozenset(skill for skill in SKILL_KEYWORDS if " " not in skill)
+_MULTIWORD_SKILL_RE = re.compile(
+    r"(?<![a-z0-9+#./])(?:"
+    + "|".join(re.escape(skill) for skill in SKILL_KEYWORDS if " " in skill)
+    + r")(?![a-z0-9+#])",
+    re.IGNORECASE | re.ASCII
+)
+
+
+def _any_of(words: List[str], flags: int = 0) -> "re.Pattern[str]":
+    """Compile a pattern matching any of the words as a plain substring."""
+    return re.compile("|".join(re.escape(word) for word in words), flags)
+
+
+# Section headings, and the headings that end each section, matched anywhere in a line regardless of case
+_EDUCATION_HEADING_RE = _any_of(["education", "academic", "degree", "university", "college", "bachelor", "master", "phd", "diploma"], re.IGNORECASE)
+_EDUCATION_END_RE = _any_of(["experience", "work", "employment", "skills"], re.IGNORECASE)
+_EXPERIENCE_HEADING_RE = _any_of(["experience", "work history", "employment", "professional experience", "career"], re.IGNORECASE)
+_EXPERIENCE_END_RE = _any_of(["education", "skills", "projects"], re.IGNORECASE)
+
+# Lines that start a new education or experience entry, matched anywhere in the line regardless of case
+_DEGREE_RE = _any_of(["bachelor", "master", "phd", "associate", "diploma"], re.IGNORECASE)
+_JOB_TITLE_RE = _any_of(["engineer", "developer", "manager", "analyst", "specialist", "consultant"], re.IGNORECASE)
+
+# Patterns compiled once at import rather than on every resume; fields keep only the first match, so they use search()
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+# A 10-digit number with optional country code, e.g. +1 (555) 123-4567 or 555.123.4567; years and IDs do not match
+_PHONE_RE = re.compile(r'(?<!\d)(?:\+?\d{1,3}[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}\b')
+# Every URL is found in one scan and then classified by host; LinkedIn profiles keep the /in/<handle> form
+_URL_RE = re.compile(r'https?://(?:www\.)?([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})(/[^\s]*)?')
+_LINKEDIN_RE = re.compile(r'https?://(?:www\.)?linkedin\.com/in/[a-zA-Z0-9-]+')
+# A name on its own line, e.g. "Jane Doe" or "Maria Del Carmen Ruiz", and a labelled location line
+_NAME_LINE_RE = re.compile(r'^\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})\s*$', re.M)
+_LOCATION_LINE_RE = re.compile(r'^\s*(?:location|address|based in)\s*[:\-]\s*(\S.*?)\s*$', re.I | re.M)
+NAME_SCAN_CHARS = 400  # the name heuristic only looks at the top of the resume
+# Title-case lines at the top of a resume that are headings rather than names
+NAME_BLOCKLIST = frozenset([
+    "resume", "curriculum", "vitae", "cv", "profile", "summary", "objective",
+    "contact", "information", "experience", "education", "skills", "personal", "details",
+])
+_YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+_DATE_RANGE_RE = re.compile(
+    r'\b(19|20)\d{2}\b.*\b(19|20)\d{2}\b|\b(19|20)\d{2}\b.*present|\b(19|20)\d{2}\b.*now',
+    re.IGNORECASE
+)
+
 
 class ResumeParser:
     """
@@ -57,8 +135,8 @@ class ResumeParser:
         try:
             model_name = spacy_model or config.model.spacy_model
             logger.info(f"Loading spaCy model: {model_name}")
-            self.nlp = spacy.load(model_name)
-            logger.info("spaCy model loaded successfully")
+            self.nlp = _load_spacy(model_name)
+            logger.info(f"spaCy model loaded successfully with components: {self.nlp.pipe_names}")
         except Exception as e:
             logger.error(f"Failed to load spaCy model: {e}")
             raise ModelLoadingError(
@@ -85,55 +163,12 @@ class ResumeParser:
             ResumeProcessingError: If parsing fails
             ValueError: If input text is invalid
         """
-        if not text or not isinstance(text, str):
-            raise ValueError("Resume text must be a non-empty string")
-        
-        if len(text.strip()) < config.processing.min_text_length:
-            raise ResumeProcessingError(
-                f"Resume text too short (minimum {config.processing.min_text_length} characters)",
-                resume_id=resume_id,
-                details={"text_length": len(text)}
-            )
+        self._validate_text(text, resume_id)
         
         try:
             logger.info(f"Starting resume parsing for ID: {resume_id}")
-            
-            # Detect language and translate if necessary
-            language = translation_service.detect_language(text)
-            if language != "en" and translation_service.is_language_supported(language):
-                logger.info(f"Translating resume from {language} to English")
-                translated_text, detected_lang = translation_service.translate_text(text, language)
-                original_language = language
-            else:
-                translated_text = text
-                original_language = "en"
-            
-            # Parse the resume
-            parsed_data = {
-                "resume_id": resume_id,
-                "original_language": original_language,
-                "parsing_timestamp": datetime.now().isoformat(),
-                "text_length": len(text),
-                "translated_text_length": len(translated_text),
-                "extraction_confidence": 0.0
-            }
-            
-            # Extract different sections
-            if config.processing.extract_skills:
-                parsed_data["skills"] = self._extract_skills(translated_text)
-            
-            if config.processing.extract_education:
-                parsed_data["education"] = self._extract_education(translated_text)
-            
-            if config.processing.extract_experience:
-                parsed_data["experience"] = self._extract_experience(translated_text)
-            
-            # Extract personal information
-            parsed_data["personal_info"] = self._extract_personal_info(translated_text)
-            
-            # Calculate overall confidence
-            parsed_data["extraction_confidence"] = self._calculate_confidence(parsed_data)
-            
+            translated_text, original_language = self._translate(text)
+            parsed_data = self._build_parsed_data(text, translated_text, original_language, resume_id, None)
             logger.info(f"Resume parsing completed for ID: {resume_id}")
             return parsed_data
             
@@ -145,6 +180,168 @@ class ResumeParser:
                 details={"error_type": type(e).__name__}
             )
     
+    def parse_resumes(self, texts: List[str], resume_ids: Optional[List[Optional[str]]] = None) -> List[Dict[str, Any]]:
+        """
+        Parse many resumes, running entity recognition over them in batches.
+        
+        Produces the same results as calling parse_resume on each text, but the
+        spaCy pipeline processes the texts that need it through nlp.pipe instead
+        of one call each.
+        
+        Args:
+            texts (List[str]): Raw resume texts to parse
+            resume_ids (List[str], optional): Identifier for each resume, in the same order
+            
+        Returns:
+            List[Dict[str, Any]]: Structured resume data for each text, in input order
+            
+        Raises:
+            ResumeProcessingError: If parsing any resume fails
+            ValueError: If any input text is invalid
+        """
+        if resume_ids is None:
+            resume_ids = [None] * len(texts)
+        if len(resume_ids) != len(texts):
+            raise ValueError("resume_ids must have one entry per text")
+        
+        for text, resume_id in zip(texts, resume_ids):
+            self._validate_text(text, resume_id)
+        
+        logger.info(f"Starting batch parsing of {len(texts)} resumes")
+        translated = []
+        for text, resume_id in zip(texts, resume_ids):
+            try:
+                translated.append(self._translate(text))
+            except Exception as e:
+                logger.error(f"Resume parsing failed for ID {resume_id}: {e}")
+                raise ResumeProcessingError(
+                    f"Resume parsing failed: {str(e)}",
+                    resume_id=resume_id,
+                    details={"error_type": type(e).__name__}
+                )
+        
+        # Only resumes whose name or location the heuristics miss go through spaCy, if it runs at ingest
+        run_ner = config.processing.run_ner_on_ingest
+        needs_ner = [run_ner and self._needs_ner(translated_text) for translated_text, _ in translated]
+        docs = self.nlp.pipe(
+            (translated_text[:PERSONAL_INFO_CHARS] for (translated_text, _), ner in zip(translated, needs_ner) if ner),
+            batch_size=PIPE_BATCH_SIZE
+        )
+        results = []
+        for text, resume_id, (translated_text, original_language), ner in zip(texts, resume_ids, translated, needs_ner):
+            try:
+                doc = next(docs) if ner else None
+                results.append(self._build_parsed_data(text, translated_text, original_language, resume_id, doc))
+            except Exception as e:
+                logger.error(f"Resume parsing failed for ID {resume_id}: {e}")
+                raise ResumeProcessingError(
+                    f"Resume parsing failed: {str(e)}",
+                    resume_id=resume_id,
+                    details={"error_type": type(e).__name__}
+                )
+        
+        logger.info(f"Batch parsing completed for {len(texts)} resumes")
+        return results
+    
+    def enrich_with_ner(self, parsed_data: Dict[str, Any], text: str) -> Dict[str, Any]:
+        """
+        Fill in the name and location that parsing left empty, using the spaCy pipeline.
+        
+        Unless config.processing.run_ner_on_ingest is set, parsing only finds these
+        with layout heuristics; callers that need them can run this afterwards.
+        
+        Args:
+            parsed_data (Dict[str, Any]): Result of parse_resume, updated in place
+            text (str): English resume text (the translation, for non-English resumes)
+            
+        Returns:
+            Dict[str, Any]: The same parsed data, with personal info and confidence updated
+        """
+        personal_info = parsed_data.setdefault("personal_info", {})
+        if personal_info.get("name") and personal_info.get("location"):
+            return parsed_data
+        
+        self._fill_from_entities(personal_info, self.nlp(text[:PERSONAL_INFO_CHARS]))
+        parsed_data["extraction_confidence"] = self._calculate_confidence(parsed_data)
+        return parsed_data
+    
+    def _validate_text(self, text: str, resume_id: Optional[str]) -> None:
+        """
+        Check that resume text is usable before parsing it.
+        
+        Raises:
+            ResumeProcessingError: If the text is too short
+            ValueError: If the text is not a non-empty string
+        """
+        if not text or not isinstance(text, str):
+            raise ValueError("Resume text must be a non-empty string")
+        
+        if len(text.strip()) < config.processing.min_text_length:
+            raise ResumeProcessingError(
+                f"Resume text too short (minimum {config.processing.min_text_length} characters)",
+                resume_id=resume_id,
+                details={"text_length": len(text)}
+            )
+    
+    def _translate(self, text: str) -> Tuple[str, str]:
+        """
+        Detect the language of a resume and translate it to English if necessary.
+        
+        Returns:
+            Tuple[str, str]: The English text and the original language code
+        """
+        translation_service = get_translation_service()
+        language = translation_service.detect_language(text)
+        if language != "en" and translation_service.is_language_supported(language):
+            logger.info(f"Translating resume from {language} to English")
+            translated_text, detected_lang = translation_service.translate_text(text, language)
+            return translated_text, language
+        return text, "en"
+    
+    def _build_parsed_data(self, text: str, translated_text: str, original_language: str,
+                           resume_id: Optional[str], doc) -> Dict[str, Any]:
+        """
+        Extract every section of a translated resume into its structured form.
+        
+        Args:
+            text (str): Raw resume text
+            translated_text (str): English resume text
+            original_language (str): Language code of the raw text
+            resume_id (str, optional): Unique identifier for the resume
+            doc: spaCy Doc for the opening of translated_text, or None to run the pipeline only if needed
+            
+        Returns:
+            Dict[str, Any]: Structured resume data
+        """
+        parsed_data = {
+            "resume_id": resume_id,
+            "original_language": original_language,
+            "parsing_timestamp": datetime.now().isoformat(),
+            "text_length": len(text),
+            "translated_text_length": len(translated_text),
+            "extraction_confidence": 0.0
+        }
+        
+        # Extract different sections
+        if config.processing.extract_skills:
+            parsed_data["skills"] = self._extract_skills(translated_text)
+        
+        # Education and experience come from the same pass over the lines
+        if config.processing.extract_education or config.processing.extract_experience:
+            sections = self._split_sections(translated_text)
+            if config.processing.extract_education:
+                parsed_data["education"] = self._parse_education_entries(sections["education"]) if sections["education"] else []
+            if config.processing.extract_experience:
+                parsed_data["experience"] = self._parse_experience_entries(sections["experience"]) if sections["experience"] else []
+        
+        # Extract personal information
+        parsed_data["personal_info"] = self._extract_personal_info_from_doc(doc, translated_text)
+        
+        # Calculate overall confidence
+        parsed_data["extraction_confidence"] = self._calculate_confidence(parsed_data)
+        
+        return parsed_data
+    
     def _extract_personal_info(self, text: str) -> Dict[str, Any]:
         """
         Extract personal information from resume text.
@@ -152,6 +349,23 @@ class ResumeParser:
         Args:
             text (str): Resume text to analyze
             
+        Returns:
+            Dict[str, Any]: Extracted personal information
+        """
+        return self._extract_personal_info_from_doc(None, text)
+    
+    def _extract_personal_info_from_doc(self, doc, text: str) -> Dict[str, Any]:
+        """
+        Extract personal information from resume text and, if given, its already-processed spaCy Doc.
+        
+        The name and location are first looked for with cheap layout heuristics. The
+        spaCy pipeline fills the fields they miss from doc when given, or else runs
+        here only if config.processing.run_ner_on_ingest is set.
+        
+        Args:
+            doc: spaCy Doc for the opening of the resume, or None
+            text (str): Resume text to analyze
+            
         Returns:
             Dict[str, Any]: Extracted personal information
         """
@@ -165,49 +379,108 @@ class ResumeParser:
         }
         
         # Extract email addresses
-        import re
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        if emails:
-            personal_info["email"] = emails[0]  # Take the first email found
+        email = _EMAIL_RE.search(text)
+        if email:
+            personal_info["email"] = email.group()
         
         # Extract phone numbers
-        phone_pattern = r'[\+]?[1-9][\d]{0,15}'
-        phones = re.findall(phone_pattern, text)
-        if phones:
-            personal_info["phone"] = phones[0]  # Take the first phone number found
-        
-        # Extract LinkedIn URLs
-        linkedin_pattern = r'https?://(?:www\.)?linkedin\.com/in/[a-zA-Z0-9-]+'
-        linkedin_urls = re.findall(linkedin_pattern, text)
-        if linkedin_urls:
-            personal_info["linkedin"] = linkedin_urls[0]
-        
-        # Extract website URLs
-        website_pattern = r'https?://(?:www\.)?[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        websites = re.findall(website_pattern, text)
-        if websites:
-            personal_info["website"] = websites[0]
-        
-        # Extract name using NLP
-        doc = self.nlp(text[:1000])  # Analyze first 1000 characters for name
-        for ent in doc.ents:
-            if ent.label_ == "PERSON":
-                personal_info["name"] = ent.text.strip()
+        phone = _PHONE_RE.search(text)
+        if phone:
+            personal_info["phone"] = phone.group()
+        
+        # Extract the LinkedIn profile and the first other website from one pass over the URLs
+        for url in _URL_RE.finditer(text):
+            if url.group(1).lower() == "linkedin.com":
+                if personal_info["linkedin"] is None:
+                    profile = _LINKEDIN_RE.match(text, url.start())
+                    if profile:
+                        personal_info["linkedin"] = profile.group()
+            elif personal_info["website"] is None:
+                # Drop punctuation that ends the sentence around the URL
+                personal_info["website"] = url.group().rstrip(".,;:)")
+            if personal_info["linkedin"] is not None and personal_info["website"] is not None:
                 break
         
-        # Extract location
+        # Name and location from the layout of the resume where possible
+        personal_info["name"] = self._guess_name(text)
+        personal_info["location"] = self._guess_location(text)
+        if personal_info["name"] and personal_info["location"]:
+            return personal_info
+        
+        # Fall back to NLP for whatever the heuristics missed, if it runs at ingest
+        if doc is None:
+            if not config.processing.run_ner_on_ingest:
+                return personal_info
+            doc = self.nlp(text[:PERSONAL_INFO_CHARS])
+        
+        self._fill_from_entities(personal_info, doc)
+        return personal_info
+    
+    def _fill_from_entities(self, personal_info: Dict[str, Any], doc) -> None:
+        """
+        Fill a missing name and location from the first PERSON and GPE/LOC entities of a spaCy Doc.
+        
+        Args:
+            personal_info (Dict[str, Any]): Personal information to update in place
+            doc: spaCy Doc for the opening of the resume
+        """
+        # Name and location from the first PERSON and GPE/LOC entities, in one pass
+        name = personal_info.get("name")
+        location = personal_info.get("location")
         for ent in doc.ents:
-            if ent.label_ in ["GPE", "LOC"]:
-                personal_info["location"] = ent.text.strip()
+            label = ent.label_
+            if name is None and label == "PERSON":
+                name = ent.text.strip()
+            elif location is None and label in ("GPE", "LOC"):
+                location = ent.text.strip()
+            if name is not None and location is not None:
                 break
+        personal_info["name"] = name
+        personal_info["location"] = location
+    
+    def _guess_name(self, text: str) -> Optional[str]:
+        """
+        Take the first line of a resume as the candidate's name when it looks like one.
         
-        return personal_info
+        Args:
+            text (str): Resume text to analyze
+            
+        Returns:
+            Optional[str]: The name, or None if the first line is not a plain
+                two-to-four word title-case name
+        """
+        for line in text[:NAME_SCAN_CHARS].splitlines():
+            if line.strip():
+                match = _NAME_LINE_RE.match(line)
+                if match and not any(word.lower() in NAME_BLOCKLIST for word in match.group(1).split()):
+                    return match.group(1)
+                return None
+        return None
+    
+    def _guess_location(self, text: str) -> Optional[str]:
+        """
+        Find an explicit "Location:" (or "Address:", "Based in:") line near the top of a resume.
+        
+        Args:
+            text (str): Resume text to analyze
+            
+        Returns:
+            Optional[str]: The labelled location, or None if there is none
+        """
+        match = _LOCATION_LINE_RE.search(text, 0, PERSONAL_INFO_CHARS)
+        return match.group(1) if match else None
+    
+    def _needs_ner(self, text: str) -> bool:
+        """Whether the name or location of a resume can only be found with the spaCy pipeline."""
+        return self._guess_name(text) is None or self._guess_location(text) is None
     
     def _extract_skills(self, text: str) -> List[Dict[str, Any]]:
         """
         Extract skills and competencies from resume text.
         
+        Skills are found by tokenizing the text once, which also gives the
+        position each skill's context is sliced from.
+        
         Args:
             text (str): Resume text to analyze
             
@@ -216,35 +489,63 @@ class ResumeParser:
         """
         skills = []
         
-        # Common skill keywords
-        skill_keywords = [
-            "python", "java", "javascript", "react", "angular", "vue", "node.js",
-            "sql", "mongodb", "postgresql", "mysql", "aws", "azure", "docker",
-            "kubernetes", "git", "agile", "scrum", "machine learning", "ai",
-            "data analysis", "statistics", "excel", "powerbi", "tableau",
-            "html", "css", "bootstrap", "jquery", "php", "c++", "c#", ".net",
-            "spring", "django", "flask", "fastapi", "express", "graphql",
-            "rest api", "microservices", "ci/cd", "jenkins", "github actions"
-        ]
-        
-        # Find skills in text
-        text_lower = text.lower()
-        for skill in skill_keywords:
-            if skill in text_lower:
-                # Calculate confidence based on context
-                confidence = self._calculate_skill_confidence(text, skill)
-                if confidence >= self.confidence_threshold:
-                    skills.append({
-                        "skill": skill.title(),
-                        "confidence": confidence,
-                        "context": self._extract_skill_context(text, skill)
-                    })
+        # Find every skill mentioned in text, with the first mention of each
+        mentions = self._find_skill_mentions(text)
+        if not mentions:
+            return skills
+        
+        # Confidence depends only on which sections the resume has, so it is the same for every skill
+        confidence = self._section_confidence(text.lower())
+        if confidence < self.confidence_threshold:
+            return skills
+        
+        for skill in SKILL_KEYWORDS:
+            if skill not in mentions:
+                continue
+            start = mentions[skill]
+            context = text[max(0, start - SKILL_CONTEXT_CHARS):start + len(skill) + SKILL_CONTEXT_CHARS].strip()
+            skills.append({
+                "skill": skill.title(),
+                "confidence": confidence,
+                "context": context
+            })
         
         # Sort by confidence
         skills.sort(key=lambda x: x["confidence"], reverse=True)
         
         return skills
     
+    def _find_skill_mentions(self, text: str) -> Dict[str, int]:
+        """
+        Find the skill keywords mentioned as whole tokens in text, ignoring case.
+        
+        Single-word skills are looked up in a set as the text is tokenized, so "ai"
+        is not found inside "email" nor "c#" inside "c#include".
+        
+        Args:
+            text (str): Resume text
+            
+        Returns:
+            Dict[str, int]: For each skill found, the offset in text of its first mention
+        """
+        mentions = {}
+        for match in _SKILL_TOKEN_RE.finditer(text):
+            # Sentence punctuation sticks to the token ("python." or "aws/"); ".net" keeps its leading dot
+            token = match.group().rstrip("./").lower()
+            if token in _SKILLS_SET:
+                mentions.setdefault(token, match.start())
+            elif "/" in token:
+                # Slash-separated lists such as "python/django" name several skills
+                offset = match.start()
+                for part in token.split("/"):
+                    if part in _SKILLS_SET:
+                        mentions.setdefault(part, offset)
+                    offset += len(part) + 1
+        
+        for match in _MULTIWORD_SKILL_RE.finditer(text):
+            mentions.setdefault(match.group().lower(), match.start())
+        return mentions
+    
     def _extract_education(self, text: str) -> List[Dict[str, Any]]:
         """
         Extract education history from resume text.
@@ -255,47 +556,8 @@ class ResumeParser:
         Returns:
             List[Dict[str, Any]]: List of education entries
         """
-        education = []
-        
-        # Education section patterns
-        education_patterns = [
-            r"education",
-            r"academic",
-            r"degree",
-            r"university",
-            r"college",
-            r"bachelor",
-            r"master",
-            r"phd",
-            r"diploma"
-        ]
-        
-        # Find education section
-        lines = text.split('\n')
-        in_education_section = False
-        education_text = ""
-        
-        for line in lines:
-            line_lower = line.lower().strip()
-            
-            # Check if we're entering education section
-            if any(pattern in line_lower for pattern in education_patterns):
-                in_education_section = True
-                continue
-            
-            # Collect education information
-            if in_education_section and line.strip():
-                education_text += line + "\n"
-            
-            # Exit education section if we hit another major section
-            if in_education_section and any(section in line_lower for section in ["experience", "work", "employment", "skills"]):
-                break
-        
-        # Parse education entries
-        if education_text:
-            education = self._parse_education_entries(education_text)
-        
-        return education
+        education_text = self._split_sections(text)["education"]
+        return self._parse_education_entries(education_text) if education_text else []
     
     def _extract_experience(self, text: str) -> List[Dict[str, Any]]:
         """
@@ -307,43 +569,56 @@ class ResumeParser:
         Returns:
             List[Dict[str, Any]]: List of work experience entries
         """
-        experience = []
-        
-        # Experience section patterns
-        experience_patterns = [
-            r"experience",
-            r"work history",
-            r"employment",
-            r"professional experience",
-            r"career"
-        ]
+        experience_text = self._split_sections(text)["experience"]
+        return self._parse_experience_entries(experience_text) if experience_text else []
+    
+    def _split_sections(self, text: str) -> Dict[str, str]:
+        """
+        Collect the education and experience sections of a resume in one pass over its lines.
         
-        # Find experience section
-        lines = text.split('\n')
-        in_experience_section = False
-        experience_text = ""
+        A section starts after a line mentioning one of its heading words and runs
+        until (and including) the first later line that mentions another section.
         
-        for line in lines:
-            line_lower = line.lower().strip()
+        Args:
+            text (str): Resume text to analyze
             
-            # Check if we're entering experience section
-            if any(pattern in line_lower for pattern in experience_patterns):
-                in_experience_section = True
-                continue
+        Returns:
+            Dict[str, str]: Text of the "education" and "experience" sections, empty if absent
+        """
+        education_lines = []
+        experience_lines = []
+        in_education = in_experience = False
+        education_done = experience_done = False
+        
+        for line in text.splitlines():
+            if education_done and experience_done:
+                break
+            has_text = bool(line.strip())
             
-            # Collect experience information
-            if in_experience_section and line.strip():
-                experience_text += line + "\n"
+            if not education_done:
+                # Heading lines open (or re-open) the section and are not part of it
+                if _EDUCATION_HEADING_RE.search(line):
+                    in_education = True
+                elif in_education:
+                    if has_text:
+                        education_lines.append(line)
+                    # Stop once another major section starts
+                    if _EDUCATION_END_RE.search(line):
+                        education_done = True
             
-            # Exit experience section if we hit another major section
-            if in_experience_section and any(section in line_lower for section in ["education", "skills", "projects"]):
-                break
-        
-        # Parse experience entries
-        if experience_text:
-            experience = self._parse_experience_entries(experience_text)
-        
-        return experience
+            if not experience_done:
+                if _EXPERIENCE_HEADING_RE.search(line):
+                    in_experience = True
+                elif in_experience:
+                    if has_text:
+                        experience_lines.append(line)
+                    if _EXPERIENCE_END_RE.search(line):
+                        experience_done = True
+        
+        return {
+            "education": "".join(line + "\n" for line in education_lines),
+            "experience": "".join(line + "\n" for line in experience_lines),
+        }
     
     def _calculate_skill_confidence(self, text: str, skill: str) -> float:
         """
@@ -358,43 +633,29 @@ class ResumeParser:
         """
         # Simple confidence calculation based on context
         text_lower = text.lower()
-        skill_lower = skill.lower()
-        
-        if skill_lower in text_lower:
-            # Check if skill is mentioned in a skills section
-            if "skills" in text_lower or "competencies" in text_lower:
-                return 0.9
-            # Check if skill is mentioned in experience section
-            elif "experience" in text_lower or "work" in text_lower:
-                return 0.8
-            else:
-                return 0.6
+        
+        if skill.lower() in text_lower:
+            return self._section_confidence(text_lower)
         
         return 0.0
     
-    def _extract_skill_context(self, text: str, skill: str) -> str:
+    def _section_confidence(self, text_lower: str) -> float:
         """
-        Extract context around a skill mention.
+        Confidence for a skill found in a resume, based on the sections it has.
         
         Args:
-            text (str): Resume text
-            skill (str): Skill keyword
+            text_lower (str): Lowercased resume text
             
         Returns:
-            str: Context around the skill mention
+            float: Confidence score between 0 and 1
         """
-        import re
-        
-        # Find the skill in the text
-        pattern = re.compile(rf'\b{re.escape(skill)}\b', re.IGNORECASE)
-        match = pattern.search(text)
-        
-        if match:
-            start = max(0, match.start() - 50)
-            end = min(len(text), match.end() + 50)
-            return text[start:end].strip()
-        
-        return ""
+        # Check if skill is mentioned in a skills section
+        if "skills" in text_lower or "competencies" in text_lower:
+            return 0.9
+        # Check if skill is mentioned in experience section
+        elif "experience" in text_lower or "work" in text_lower:
+            return 0.8
+        return 0.6
     
     def _parse_education_entries(self, education_text: str) -> List[Dict[str, Any]]:
         """
@@ -409,7 +670,7 @@ class ResumeParser:
         entries = []
         
         # Simple parsing - split by lines and look for degree patterns
-        lines = education_text.split('\n')
+        lines = education_text.splitlines()
         current_entry = {}
         
         for line in lines:
@@ -418,8 +679,7 @@ class ResumeParser:
                 continue
             
             # Look for degree patterns
-            degree_patterns = ["bachelor", "master", "phd", "associate", "diploma"]
-            if any(pattern in line.lower() for pattern in degree_patterns):
+            if _DEGREE_RE.search(line):
                 if current_entry:
                     entries.append(current_entry)
                 current_entry = {"degree": line, "institution": "", "year": ""}
@@ -427,8 +687,7 @@ class ResumeParser:
                 current_entry["institution"] = line
             elif current_entry and not current_entry.get("year"):
                 # Try to extract year
-                import re
-                year_match = re.search(r'\b(19|20)\d{2}\b', line)
+                year_match = _YEAR_RE.search(line)
                 if year_match:
                     current_entry["year"] = year_match.group()
         
@@ -450,7 +709,7 @@ class ResumeParser:
         entries = []
         
         # Simple parsing - split by lines and look for job patterns
-        lines = experience_text.split('\n')
+        lines = experience_text.splitlines()
         current_entry = {}
         
         for line in lines:
@@ -459,25 +718,26 @@ class ResumeParser:
                 continue
             
             # Look for job title patterns
-            job_patterns = ["engineer", "developer", "manager", "analyst", "specialist", "consultant"]
-            if any(pattern in line.lower() for pattern in job_patterns):
+            if _JOB_TITLE_RE.search(line):
                 if current_entry:
                     entries.append(current_entry)
-                current_entry = {"title": line, "company": "", "duration": "", "description": ""}
+                # Description lines are collected in a list and joined once the section is parsed
+                current_entry = {"title": line, "company": "", "duration": "", "description": []}
             elif current_entry and not current_entry.get("company"):
                 current_entry["company"] = line
             elif current_entry and not current_entry.get("duration"):
                 # Try to extract duration/date
-                import re
-                date_pattern = r'\b(19|20)\d{2}\b.*\b(19|20)\d{2}\b|\b(19|20)\d{2}\b.*present|\b(19|20)\d{2}\b.*now'
-                if re.search(date_pattern, line, re.IGNORECASE):
+                if _DATE_RANGE_RE.search(line):
                     current_entry["duration"] = line
             elif current_entry:
-                current_entry["description"] += line + " "
+                current_entry["description"].append(line)
         
         if current_entry:
             entries.append(current_entry)
         
+        for entry in entries:
+            entry["description"] = "".join(line + " " for line in entry["description"])
+        
         return entries
     
     def _calculate_confidence(self, parsed_data: Dict[str, Any]) -> float:
@@ -490,34 +750,42 @@ class ResumeParser:
         Returns:
             float: Overall confidence score between 0 and 1
         """
-        scores = []
+        # Running total and count of the scores, averaged at the end
+        total = 0.0
+        count = 0
         
         # Personal info confidence
         personal_info = parsed_data.get("personal_info", {})
         if personal_info.get("email"):
-            scores.append(0.8)
+            total += 0.8
+            count += 1
         if personal_info.get("name"):
-            scores.append(0.7)
+            total += 0.7
+            count += 1
         if personal_info.get("phone"):
-            scores.append(0.6)
+            total += 0.6
+            count += 1
         
         # Skills confidence
         skills = parsed_data.get("skills", [])
         if skills:
-            avg_skill_confidence = sum(skill["confidence"] for skill in skills) / len(skills)
-            scores.append(avg_skill_confidence * 0.8)
+            skill_total = 0.0
+            for skill in skills:
+                skill_total += skill["confidence"]
+            total += skill_total / len(skills) * 0.8
+            count += 1
         
         # Education confidence
-        education = parsed_data.get("education", [])
-        if education:
-            scores.append(0.7)
+        if parsed_data.get("education"):
+            total += 0.7
+            count += 1
         
         # Experience confidence
-        experience = parsed_data.get("experience", [])
-        if experience:
-            scores.append(0.7)
+        if parsed_data.get("experience"):
+            total += 0.7
+            count += 1
         
-        return sum(scores) / len(scores) if scores else 0.0
+        return total / count if count else 0.0
     
     def validate_parsed_data(self, parsed_data: Dict[str, Any]) -> bool:
         """
@@ -544,5 +812,19 @@ class ResumeParser:
         return True
 
 
-# Global resume parser instance
-resume_parser = ResumeParser() 
\ No newline at end of file
+@functools.lru_cache(maxsize=1)
+def get_resume_parser() -> ResumeParser:
+    """
+    Get the global resume parser, creating it on first use.
+    
+    Returns:
+        ResumeParser: The shared resume parser
+    """
+    return ResumeParser()
+
+
+def __getattr__(name: str):
+    """Build the global ``resume_parser`` lazily when it is first accessed."""
+    if name == "resume_parser":
+        return get_resume_parser()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -8,20 +8,123 @@ job descriptions based on content similarity and skill alignment.
 
 import os
 import json
+import asyncio
+import functools
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple, Any
+from dataclasses import dataclass
 from pathlib import Path
 import numpy as np
 
 import chromadb
-from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
 from sentence_transformers import SentenceTransformer
 
+try:
+    import faiss
+except ImportError:  # Fall back to the numpy matrix search
+    faiss = None
+
 from ..core.exceptions import ModelLoadingError, DataValidationError
 from ..core.config import config
+from ..core.cache import InferenceCache
 
 logger = logging.getLogger(__name__)
 
+TEXT_LENGTH_EWMA_WEIGHT = 0.01  # weight of each added document in the running average text length
+STATS_SAMPLE_SIZE = 100  # stored documents sampled to seed the average text length after a restart
+SEARCH_WORKERS = 4  # threads serving the async search methods
+
+
+def _dedupe(texts: List[str]) -> Tuple[List[str], List[int]]:
+    """
+    Collapse repeated texts, keeping first-seen order.
+    
+    Args:
+        texts (List[str]): Texts, possibly with repeats
+        
+    Returns:
+        Tuple[List[str], List[int]]: The distinct texts, and for each input text
+            the position of its distinct text
+    """
+    positions: Dict[str, int] = {}
+    inverse = [positions.setdefault(text, len(positions)) for text in texts]
+    return list(positions), inverse
+
+
+@dataclass(slots=True)
+class MatchResult:
+    """
+    Matches for one query, as parallel sequences rather than one dict per match.
+    
+    Attributes:
+        ids (List[str]): Matched document ids, best match first
+        scores (np.ndarray): Similarity score of each match
+        metadatas (List[Dict[str, Any]]): Stored metadata of each match
+        ranks (np.ndarray): 1-based rank of each match among all rows returned, before min_score filtering
+    """
+    
+    ids: List[str]
+    scores: np.ndarray
+    metadatas: List[Dict[str, Any]]
+    ranks: np.ndarray
+    
+    @classmethod
+    def empty(cls) -> "MatchResult":
+        """A result with no matches."""
+        return cls([], np.empty(0), [], np.empty(0, dtype=np.int64))
+    
+    @classmethod
+    def from_query(cls, results: Dict[str, Any], query_idx: int = 0,
+                   min_score: Optional[float] = None) -> "MatchResult":
+        """
+        Collect one query's rows of a search result, filtered by score.
+        
+        Args:
+            results (Dict[str, Any]): Result in Chroma's query layout
+            query_idx (int): Which query's rows to read
+            min_score (float, optional): Minimum similarity score; None keeps every row
+            
+        Returns:
+            MatchResult: The rows that pass, in ranked order
+        """
+        if not results['ids'] or not results['ids'][query_idx]:
+            return cls.empty()
+        
+        ids = results['ids'][query_idx]
+        metadatas = results['metadatas'][query_idx]
+        
+        # Convert distances to similarity scores (ChromaDB uses cosine distance)
+        similarities = 1.0 - np.asarray(results['distances'][query_idx], dtype=np.float64)
+        if min_score is None:
+            return cls(list(ids), similarities, list(metadatas), np.arange(1, len(ids) + 1))
+        
+        keep = np.flatnonzero(similarities >= min_score)
+        rows = keep.tolist()
+        return cls([ids[i] for i in rows], similarities[keep], [metadatas[i] for i in rows], keep + 1)
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def to_dicts(self, id_key: str = "document_id") -> List[Dict[str, Any]]:
+        """
+        Convert to the list-of-dicts form returned by the find_* methods.
+        
+        Args:
+            id_key (str): Key the document id is stored under in each match
+            
+        Returns:
+            List[Dict[str, Any]]: Matches with scores rounded to 4 places, metadata and rank
+        """
+        return [
+            {id_key: doc_id, "similarity_score": score, "metadata": metadata, "rank": rank}
+            for doc_id, score, metadata, rank in zip(
+                self.ids, np.round(self.scores, 4).tolist(), self.metadatas, self.ranks.tolist()
+            )
+        ]
+
 
 class SemanticMatchingService:
     """
@@ -57,17 +160,36 @@ class SemanticMatchingService:
         
         try:
             logger.info(f"Loading sentence transformer model: {self.model_name}")
-            self.embedding_model = SentenceTransformer(self.model_name)
+            self.embedding_model = self._load_embedding_model()
             
             # Initialize ChromaDB
             self.chroma_client = chromadb.PersistentClient(path=self.db_path)
-            self.embedding_function = SentenceTransformerEmbeddingFunction(
-                model_name=self.model_name
-            )
             
             # Get or create collection
             self.collection = self._get_or_create_collection()
             
+            # Embeddings of texts seen before, by (model, text)
+            self.embedding_cache = InferenceCache(
+                config.model.inference_cache_path, "embeddings", config.model.inference_cache_size,
+                config.model.inference_cache_disk_size
+            )
+            
+            # In-memory index per document type (a float32 matrix or an int8 FAISS index),
+            # built from the collection on first search
+            self._type_indexes: Dict[str, Optional[Dict[str, Any]]] = {}
+            self._index_lock = threading.Lock()
+            self._index_space = self._select_index_space()
+            self._use_faiss = self._index_space is not None and config.model.retrieval_backend == "faiss"
+            if self._use_faiss and faiss is None:
+                logger.warning("faiss is not installed, using numpy matrix search")
+                self._use_faiss = False
+            
+            # Searches awaited from async code run here, off the event loop; threads start on first use
+            self._search_pool = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="semmatch")
+            
+            # Moving average of stored text lengths, kept up to date as documents are added
+            self._avg_text_length: Optional[float] = None
+            
             logger.info("Semantic matching service initialized successfully")
             
         except Exception as e:
@@ -77,10 +199,233 @@ class SemanticMatchingService:
                 model_name=self.model_name
             )
     
+    def _load_embedding_model(self) -> SentenceTransformer:
+        """
+        Load the sentence transformer on the configured backend.
+        
+        With the "onnx" backend the model runs on ONNX Runtime with dynamically
+        quantized int8 weights, exported into the local model directory on first
+        use. If that fails, the PyTorch model is used instead.
+        
+        Sets embedding_backend to the backend actually loaded, since int8 and
+        fp32 embeddings of a text differ slightly and are cached separately.
+        
+        Returns:
+            SentenceTransformer: The embedding model
+        """
+        if config.model.embedding_backend == "onnx" and not Path(self.model_name).is_dir():
+            logger.warning(f"The ONNX backend needs a local model directory, using PyTorch for {self.model_name}")
+        elif config.model.embedding_backend == "onnx":
+            quantization = config.model.embedding_onnx_quantization
+            file_name = f"model_qint8_{quantization}.onnx"
+            try:
+                if not (Path(self.model_name) / "onnx" / file_name).exists():
+                    from sentence_transformers import export_dynamic_quantized_onnx_model
+                    
+                    logger.info(f"Exporting {self.model_name} to int8 ONNX ({quantization})")
+                    fp32_model = SentenceTransformer(self.model_name, backend="onnx")
+                    export_dynamic_quantized_onnx_model(fp32_model, quantization, self.model_name)
+                model = SentenceTransformer(
+                    self.model_name,
+                    backend="onnx",
+                    model_kwargs={"file_name": f"onnx/{file_name}", "provider": "CPUExecutionProvider"}
+                )
+                self.embedding_backend = f"onnx-qint8-{quantization}"
+                return model
+            except Exception as e:
+                logger.warning(f"Could not load int8 ONNX embedding model, falling back to PyTorch: {e}")
+        
+        self.embedding_backend = "torch"
+        model = SentenceTransformer(self.model_name)
+        if config.model.compile_models:
+            self._compile_embedding_model(model)
+        return model
+    
+    @staticmethod
+    def _compile_embedding_model(model: SentenceTransformer) -> None:
+        """
+        Wrap the PyTorch transformer inside a sentence transformer in torch.compile.
+        
+        Queries are encoded one or two short texts at a time, where fused kernels
+        cut per-call overhead the most. Shapes are compiled as dynamic so texts of
+        new lengths do not trigger a recompile each.
+        
+        Args:
+            model (SentenceTransformer): Model loaded with the PyTorch backend
+        """
+        try:
+            import torch
+            
+            transformer = model[0]
+            transformer.auto_model = torch.compile(transformer.auto_model, dynamic=True)
+            logger.info("Compiled embedding model with torch.compile")
+        except Exception as e:
+            logger.warning(f"torch.compile unavailable, using eager embedding model: {e}")
+    
+    def _select_index_space(self) -> Optional[str]:
+        """
+        Decide whether searches go through in-memory indexes.
+        
+        Returns:
+            Optional[str]: The collection's distance space ("l2" or "cosine") when the
+                matrix or FAISS backend is configured and usable, otherwise None to query Chroma
+        """
+        if config.model.retrieval_backend not in ("matrix", "faiss"):
+            return None
+        space = (self.collection.metadata or {}).get("hnsw:space", "l2")
+        if space not in ("l2", "cosine"):
+            logger.warning(f"In-memory search does not support the {space} space, searching the Chroma collection")
+            return None
+        return space
+    
+    def _build_type_index(self, document_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Load one document type's embeddings from the collection into an in-memory index.
+        
+        Vectors are kept as a float32 matrix, or with the FAISS backend as 8-bit
+        scalar-quantized codes (4x smaller), and scanned exhaustively under L2, so
+        distances match Chroma's; in the cosine space the vectors are normalized first.
+        
+        Args:
+            document_type (str): "resume" or "job"
+            
+        Returns:
+            Optional[Dict[str, Any]]: The index with its ids and metadata, or None if there
+                are no documents of this type
+        """
+        stored = self.collection.get(where={"type": document_type}, include=["embeddings", "metadatas"])
+        if not stored["ids"]:
+            return None
+        
+        vectors = self._index_vectors(stored["embeddings"])
+        index = {
+            "ids": list(stored["ids"]),
+            "id_set": set(stored["ids"]),
+            "metadatas": list(stored["metadatas"]),
+        }
+        if self._use_faiss:
+            faiss_index = faiss.IndexScalarQuantizer(vectors.shape[1], faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_L2)
+            faiss_index.train(vectors)
+            faiss_index.add(vectors)
+            index["faiss"] = faiss_index
+            logger.info(f"Built int8 FAISS index over {len(stored['ids'])} {document_type} embeddings")
+        else:
+            index["matrix"] = vectors
+            index["sq_norms"] = np.einsum("ij,ij->i", vectors, vectors)
+            logger.info(f"Loaded {len(stored['ids'])} {document_type} embeddings for matrix search")
+        return index
+    
+    def _index_vectors(self, embeddings) -> np.ndarray:
+        """Embeddings as the C-contiguous float32 rows the in-memory indexes hold."""
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if self._index_space == "cosine":
+            vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors
+    
+    def _extend_type_indexes(self, documents: List[Tuple[str, str, str, Dict]], embeddings: np.ndarray) -> None:
+        """
+        Add documents just written to the collection to the in-memory indexes already built.
+        
+        A new index is built and swapped in, so searches running on other threads keep a
+        consistent view. If an id was already indexed (the collection kept the old
+        document), the index is dropped and rebuilt on the next search instead.
+        """
+        with self._index_lock:
+            for document_type in {doc[0] for doc in documents}:
+                if document_type not in self._type_indexes:
+                    continue
+                rows = [i for i, doc in enumerate(documents) if doc[0] == document_type]
+                index = self._type_indexes[document_type]
+                if index is None or any(documents[i][1] in index["id_set"] for i in rows):
+                    del self._type_indexes[document_type]
+                    continue
+                vectors = self._index_vectors(embeddings[rows])
+                new_ids = [documents[i][1] for i in rows]
+                new_index = {
+                    "ids": index["ids"] + new_ids,
+                    "id_set": index["id_set"] | set(new_ids),
+                    "metadatas": index["metadatas"] + [documents[i][3] for i in rows],
+                }
+                if "faiss" in index:
+                    new_index["faiss"] = faiss.clone_index(index["faiss"])
+                    new_index["faiss"].add(vectors)
+                else:
+                    new_index["matrix"] = np.vstack([index["matrix"], vectors])
+                    new_index["sq_norms"] = np.concatenate([index["sq_norms"], np.einsum("ij,ij->i", vectors, vectors)])
+                self._type_indexes[document_type] = new_index
+    
+    def _query(self, query_embeddings: np.ndarray, top_k: int, document_type: str) -> Dict[str, List]:
+        """
+        Find the nearest documents of one type, in Chroma's query result layout.
+        
+        Args:
+            query_embeddings (np.ndarray): One query embedding per row
+            top_k (int): Number of results per query
+            document_type (str): "resume" or "job"
+            
+        Returns:
+            Dict[str, List]: "ids", "distances" and "metadatas", one list per query
+        """
+        if self._index_space is None:
+            return self.collection.query(
+                query_embeddings=np.asarray(query_embeddings).tolist(),
+                n_results=top_k,
+                where={"type": document_type}
+            )
+        
+        with self._index_lock:
+            if document_type not in self._type_indexes:
+                self._type_indexes[document_type] = self._build_type_index(document_type)
+            index = self._type_indexes[document_type]
+        
+        if index is None:
+            empty = [[] for _ in range(len(query_embeddings))]
+            return {"ids": empty, "distances": empty, "metadatas": empty}
+        
+        queries = self._index_vectors(query_embeddings)
+        k = min(top_k, len(index["ids"]))
+        if "faiss" in index:
+            distances, rows = index["faiss"].search(queries, k)
+        else:
+            distances, rows = self._matrix_search(index, queries, k)
+        if self._index_space == "cosine":
+            # Squared L2 between unit vectors is 2 - 2cos; Chroma's cosine distance is 1 - cos
+            distances = distances / 2.0
+        return {
+            "ids": [[index["ids"][row] for row in query_rows if row >= 0] for query_rows in rows],
+            "distances": [[float(d) for d, row in zip(query_distances, query_rows) if row >= 0]
+                          for query_distances, query_rows in zip(distances, rows)],
+            "metadatas": [[index["metadatas"][row] for row in query_rows if row >= 0] for query_rows in rows],
+        }
+    
+    @staticmethod
+    def _matrix_search(index: Dict[str, Any], queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exact nearest neighbours by squared L2 over the index's float32 matrix.
+        
+        Args:
+            index (Dict[str, Any]): Index with "matrix" and "sq_norms"
+            queries (np.ndarray): One query vector per row
+            k (int): Neighbours per query, at most the number of indexed rows
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Distances and row numbers, nearest first, shaped like FAISS results
+        """
+        distances = index["sq_norms"][None, :] - 2.0 * (queries @ index["matrix"].T)
+        distances += np.einsum("ij,ij->i", queries, queries)[:, None]
+        np.maximum(distances, 0.0, out=distances)
+        rows = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        nearest = np.take_along_axis(distances, rows, axis=1)
+        order = np.argsort(nearest, axis=1)
+        return np.take_along_axis(nearest, order, axis=1), np.take_along_axis(rows, order, axis=1)
+    
     def _get_or_create_collection(self, collection_name: str = "resumes") -> chromadb.Collection:
         """
         Get existing collection or create a new one.
         
+        The collection has no embedding function: every add and query passes
+        embeddings computed by this service's model.
+        
         Args:
             collection_name (str): Name of the collection
             
@@ -91,7 +436,7 @@ class SemanticMatchingService:
             # Try to get existing collection
             collection = self.chroma_client.get_collection(
                 name=collection_name,
-                embedding_function=self.embedding_function
+                embedding_function=None
             )
             logger.info(f"Using existing collection: {collection_name}")
             return collection
@@ -100,7 +445,7 @@ class SemanticMatchingService:
             logger.info(f"Creating new collection: {collection_name}")
             return self.chroma_client.create_collection(
                 name=collection_name,
-                embedding_function=self.embedding_function
+                embedding_function=None
             )
     
     def add_resume_embedding(self, resume_id: str, resume_text: str, metadata: Optional[Dict] = None) -> bool:
@@ -119,41 +464,8 @@ class SemanticMatchingService:
             ValueError: If inputs are invalid
             DataValidationError: If data validation fails
         """
-        if not resume_id or not isinstance(resume_id, str):
-            raise ValueError("Resume ID must be a non-empty string")
-        
-        if not resume_text or not isinstance(resume_text, str):
-            raise ValueError("Resume text must be a non-empty string")
-        
-        if len(resume_text.strip()) < config.processing.min_text_length:
-            raise DataValidationError(
-                f"Resume text too short (minimum {config.processing.min_text_length} characters)",
-                field_name="resume_text",
-                value=len(resume_text)
-            )
-        
-        try:
-            # Prepare metadata
-            metadata = metadata or {}
-            metadata.update({
-                "type": "resume",
-                "text_length": len(resume_text),
-                "timestamp": str(np.datetime64('now'))
-            })
-            
-            # Add to collection
-            self.collection.add(
-                documents=[resume_text],
-                metadatas=[metadata],
-                ids=[resume_id]
-            )
-            
-            logger.info(f"Added resume embedding for ID: {resume_id}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to add resume embedding for ID {resume_id}: {e}")
-            return False
+        self._validate_document("resume", resume_id, resume_text)
+        return self._add_documents([("resume", resume_id, resume_text, metadata)])
     
     def add_job_embedding(self, job_id: str, job_description: str, metadata: Optional[Dict] = None) -> bool:
         """
@@ -171,40 +483,108 @@ class SemanticMatchingService:
             ValueError: If inputs are invalid
             DataValidationError: If data validation fails
         """
-        if not job_id or not isinstance(job_id, str):
-            raise ValueError("Job ID must be a non-empty string")
+        self._validate_document("job", job_id, job_description)
+        return self._add_documents([("job", job_id, job_description, metadata)])
+    
+    def add_resume_embeddings_bulk(self, items: List[Tuple[str, str, Optional[Dict]]]) -> bool:
+        """
+        Add many resume embeddings to the vector database in one write.
         
-        if not job_description or not isinstance(job_description, str):
-            raise ValueError("Job description must be a non-empty string")
+        Args:
+            items (List[Tuple[str, str, Optional[Dict]]]): (resume_id, resume_text, metadata) per resume
+            
+        Returns:
+            bool: True if successfully added
+            
+        Raises:
+            ValueError: If inputs are invalid
+            DataValidationError: If data validation fails
+        """
+        for resume_id, resume_text, _ in items:
+            self._validate_document("resume", resume_id, resume_text)
+        return self._add_documents([("resume", doc_id, text, metadata) for doc_id, text, metadata in items])
+    
+    def add_job_embeddings_bulk(self, items: List[Tuple[str, str, Optional[Dict]]]) -> bool:
+        """
+        Add many job description embeddings to the vector database in one write.
         
-        if len(job_description.strip()) < config.processing.min_text_length:
+        Args:
+            items (List[Tuple[str, str, Optional[Dict]]]): (job_id, job_description, metadata) per job
+            
+        Returns:
+            bool: True if successfully added
+            
+        Raises:
+            ValueError: If inputs are invalid
+            DataValidationError: If data validation fails
+        """
+        for job_id, job_description, _ in items:
+            self._validate_document("job", job_id, job_description)
+        return self._add_documents([("job", doc_id, text, metadata) for doc_id, text, metadata in items])
+    
+    def _validate_document(self, document_type: str, doc_id: str, text: str) -> None:
+        """
+        Check a resume or job description before it is added.
+        
+        Raises:
+            ValueError: If the id or text is not a non-empty string
+            DataValidationError: If the text is too short
+        """
+        label = "Resume" if document_type == "resume" else "Job"
+        if not doc_id or not isinstance(doc_id, str):
+            raise ValueError(f"{label} ID must be a non-empty string")
+        
+        text_label = "Resume text" if document_type == "resume" else "Job description"
+        if not text or not isinstance(text, str):
+            raise ValueError(f"{text_label} must be a non-empty string")
+        
+        if len(text.strip()) < config.processing.min_text_length:
             raise DataValidationError(
-                f"Job description too short (minimum {config.processing.min_text_length} characters)",
-                field_name="job_description",
-                value=len(job_description)
+                f"{text_label} too short (minimum {config.processing.min_text_length} characters)",
+                field_name="resume_text" if document_type == "resume" else "job_description",
+                value=len(text)
             )
+    
+    def _add_documents(self, documents: List[Tuple[str, str, str, Optional[Dict]]]) -> bool:
+        """
+        Embed validated documents in one batch and add them to the collection in one call.
         
+        Args:
+            documents (List[Tuple[str, str, str, Optional[Dict]]]): (document type, id, text, metadata) per document
+            
+        Returns:
+            bool: True if successfully added
+        """
+        ids = [doc_id for _, doc_id, _, _ in documents]
         try:
-            # Prepare metadata
-            metadata = metadata or {}
-            metadata.update({
-                "type": "job",
-                "text_length": len(job_description),
-                "timestamp": str(np.datetime64('now'))
-            })
-            
-            # Add to collection
+            # One timestamp (Unix seconds) for the whole batch
+            timestamp = int(time.time())
+            texts = [text for _, _, text, _ in documents]
+            metadatas = [
+                {**(metadata or {}), "type": document_type, "text_length": len(text), "timestamp": timestamp}
+                for document_type, _, text, metadata in documents
+            ]
+            
+            # Add to collection, embedded with this service's model
+            embeddings = self._encode_many_cached(texts)
             self.collection.add(
-                documents=[job_description],
-                metadatas=[metadata],
-                ids=[job_id]
+                documents=texts,
+                embeddings=embeddings.tolist(),
+                metadatas=metadatas,
+                ids=ids
             )
+            if self._index_space is not None:
+                self._extend_type_indexes(
+                    [(doc[0], doc[1], doc[2], meta) for doc, meta in zip(documents, metadatas)], embeddings
+                )
+            
+            self._track_text_lengths(texts)
             
-            logger.info(f"Added job embedding for ID: {job_id}")
+            logger.info(f"Added {len(ids)} embeddings")
             return True
             
         except Exception as e:
-            logger.error(f"Failed to add job embedding for ID {job_id}: {e}")
+            logger.error(f"Failed to add embeddings for IDs {ids}: {e}")
             return False
     
     def find_matching_resumes(self, job_description: str, top_k: int = 10, 
@@ -224,30 +604,7 @@ class SemanticMatchingService:
             raise ValueError("Job description must be a non-empty string")
         
         try:
-            # Query the collection
-            results = self.collection.query(
-                query_texts=[job_description],
-                n_results=top_k,
-                where={"type": "resume"}
-            )
-            
-            matches = []
-            if results['ids'] and results['ids'][0]:
-                for i, (resume_id, distance, metadata) in enumerate(zip(
-                    results['ids'][0], 
-                    results['distances'][0], 
-                    results['metadatas'][0]
-                )):
-                    # Convert distance to similarity score (ChromaDB uses cosine distance)
-                    similarity_score = 1 - distance
-                    
-                    if similarity_score >= min_score:
-                        matches.append({
-                            "resume_id": resume_id,
-                            "similarity_score": round(similarity_score, 4),
-                            "metadata": metadata,
-                            "rank": i + 1
-                        })
+            matches = self._search(job_description, "resume", top_k, min_score).to_dicts("resume_id")
             
             logger.info(f"Found {len(matches)} matching resumes for job description")
             return matches
@@ -273,30 +630,7 @@ class SemanticMatchingService:
             raise ValueError("Resume text must be a non-empty string")
         
         try:
-            # Query the collection
-            results = self.collection.query(
-                query_texts=[resume_text],
-                n_results=top_k,
-                where={"type": "job"}
-            )
-            
-            matches = []
-            if results['ids'] and results['ids'][0]:
-                for i, (job_id, distance, metadata) in enumerate(zip(
-                    results['ids'][0], 
-                    results['distances'][0], 
-                    results['metadatas'][0]
-                )):
-                    # Convert distance to similarity score
-                    similarity_score = 1 - distance
-                    
-                    if similarity_score >= min_score:
-                        matches.append({
-                            "job_id": job_id,
-                            "similarity_score": round(similarity_score, 4),
-                            "metadata": metadata,
-                            "rank": i + 1
-                        })
+            matches = self._search(resume_text, "job", top_k, min_score).to_dicts("job_id")
             
             logger.info(f"Found {len(matches)} matching jobs for resume")
             return matches
@@ -305,6 +639,105 @@ class SemanticMatchingService:
             logger.error(f"Failed to find matching jobs: {e}")
             return []
     
+    def search_matches(self, query_text: str, document_type: str = "resume", top_k: int = 10,
+                       min_score: Optional[float] = None) -> MatchResult:
+        """
+        Find documents of one type that match a text, as parallel arrays.
+        
+        Same search as find_matching_resumes/find_matching_jobs without building
+        a dict per match, for callers that only read ids and scores.
+        
+        Args:
+            query_text (str): Text to match against
+            document_type (str): Type of documents to search ("resume" or "job")
+            top_k (int): Number of top matches to return
+            min_score (float, optional): Minimum similarity score threshold
+            
+        Returns:
+            MatchResult: Matching documents with scores and metadata
+        """
+        if not query_text or not isinstance(query_text, str):
+            raise ValueError("Query text must be a non-empty string")
+        
+        try:
+            return self._search(query_text, document_type, top_k, min_score)
+        except Exception as e:
+            logger.error(f"Failed to search {document_type} documents: {e}")
+            return MatchResult.empty()
+    
+    def _search(self, query_text: str, document_type: str, top_k: int,
+                min_score: Optional[float]) -> MatchResult:
+        """
+        Embed a query and search the documents of one type.
+        
+        Args:
+            query_text (str): Text to match against
+            document_type (str): Type of documents to search ("resume" or "job")
+            top_k (int): Number of top matches to return
+            min_score (float, optional): Minimum similarity score threshold
+            
+        Returns:
+            MatchResult: Matching documents with scores and metadata
+        """
+        # Query the collection
+        results = self._query(self._encode_cached(query_text)[None, :], top_k, document_type)
+        return MatchResult.from_query(results, 0, min_score)
+    
+    async def afind_matching_resumes(self, job_description: str, top_k: int = 10,
+                                     min_score: float = 0.5) -> List[Dict[str, Any]]:
+        """
+        Find resumes that match a job description without blocking the event loop.
+        
+        Runs find_matching_resumes on the service's search thread pool.
+        
+        Args:
+            job_description (str): Job description text
+            top_k (int): Number of top matches to return
+            min_score (float): Minimum similarity score threshold
+            
+        Returns:
+            List[Dict[str, Any]]: List of matching resumes with scores and metadata
+        """
+        return await self._run_in_search_pool(self.find_matching_resumes, job_description, top_k, min_score)
+    
+    async def afind_matching_jobs(self, resume_text: str, top_k: int = 10,
+                                  min_score: float = 0.5) -> List[Dict[str, Any]]:
+        """
+        Find jobs that match a resume without blocking the event loop.
+        
+        Runs find_matching_jobs on the service's search thread pool.
+        
+        Args:
+            resume_text (str): Resume text
+            top_k (int): Number of top matches to return
+            min_score (float): Minimum similarity score threshold
+            
+        Returns:
+            List[Dict[str, Any]]: List of matching jobs with scores and metadata
+        """
+        return await self._run_in_search_pool(self.find_matching_jobs, resume_text, top_k, min_score)
+    
+    async def abatch_similarity_search(self, query_texts: List[str], document_type: str = "resume",
+                                       top_k: int = 5) -> List[List[Dict[str, Any]]]:
+        """
+        Perform batch similarity search without blocking the event loop.
+        
+        Runs batch_similarity_search on the service's search thread pool.
+        
+        Args:
+            query_texts (List[str]): List of query texts
+            document_type (str): Type of documents to search ("resume" or "job")
+            top_k (int): Number of top matches per query
+            
+        Returns:
+            List[List[Dict[str, Any]]]: List of matches for each query
+        """
+        return await self._run_in_search_pool(self.batch_similarity_search, query_texts, document_type, top_k)
+    
+    async def _run_in_search_pool(self, func, *args):
+        """Run a blocking search on the search thread pool and await its result."""
+        return await asyncio.get_running_loop().run_in_executor(self._search_pool, func, *args)
+    
     def calculate_similarity(self, text1: str, text2: str) -> float:
         """
         Calculate semantic similarity between two texts.
@@ -320,21 +753,107 @@ class SemanticMatchingService:
             return 0.0
         
         try:
-            # Generate embeddings
-            embedding1 = self.embedding_model.encode([text1])
-            embedding2 = self.embedding_model.encode([text2])
+            # Generate both embeddings with one encode call
+            embeddings = self._encode_many_cached([text1, text2])
             
             # Calculate cosine similarity
-            similarity = np.dot(embedding1[0], embedding2[0]) / (
-                np.linalg.norm(embedding1[0]) * np.linalg.norm(embedding2[0])
-            )
-            
-            return float(similarity)
+            return float(self._row_cosines(embeddings[:1], embeddings[1:])[0])
             
         except Exception as e:
             logger.error(f"Failed to calculate similarity: {e}")
             return 0.0
     
+    def calculate_similarity_batch(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """
+        Calculate semantic similarity for many pairs of texts, e.g. to rerank candidates.
+        
+        Each distinct text is embedded once, and all similarities come from one
+        pass over the normalized embedding rows.
+        
+        Args:
+            pairs (List[Tuple[str, str]]): (text1, text2) pairs
+            
+        Returns:
+            List[float]: Similarity score for each pair, 0.0 where either text is empty
+        """
+        valid = [i for i, (text1, text2) in enumerate(pairs) if text1 and text2]
+        similarities = [0.0] * len(pairs)
+        if not valid:
+            return similarities
+        
+        try:
+            texts = list(dict.fromkeys(text for i in valid for text in pairs[i]))
+            row_of = {text: row for row, text in enumerate(texts)}
+            embeddings = self._encode_many_cached(texts)
+            
+            left = embeddings[[row_of[pairs[i][0]] for i in valid]]
+            right = embeddings[[row_of[pairs[i][1]] for i in valid]]
+            for i, similarity in zip(valid, self._row_cosines(left, right)):
+                similarities[i] = float(similarity)
+            return similarities
+            
+        except Exception as e:
+            logger.error(f"Failed to calculate similarities: {e}")
+            return [0.0] * len(pairs)
+    
+    @staticmethod
+    def _row_cosines(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Cosine similarity between matching rows of two embedding matrices."""
+        left = left / np.maximum(np.linalg.norm(left, axis=1, keepdims=True), 1e-12)
+        right = right / np.maximum(np.linalg.norm(right, axis=1, keepdims=True), 1e-12)
+        return np.einsum('ij,ij->i', left, right)
+    
+    def _encode_cached(self, text: str) -> np.ndarray:
+        """
+        Embed a text, reusing the stored embedding if this model has seen it before.
+        
+        Args:
+            text (str): Text to embed
+            
+        Returns:
+            np.ndarray: float32 embedding vector
+        """
+        return self._encode_many_cached([text])[0]
+    
+    def _encode_many_cached(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts, encoding only those this model has not seen before, in one batched call.
+        
+        Embeddings are rounded to float16, the precision they are cached in, so a
+        text gets the same vector whether it was just encoded or read back.
+        
+        Args:
+            texts (List[str]): Texts to embed
+            
+        Returns:
+            np.ndarray: float32 embeddings, one row per text
+        """
+        model_key = f"{self.model_name}@{self.embedding_backend}@f16"
+        keys = [InferenceCache.key(model_key, text) for text in texts]
+        embeddings: List[Optional[np.ndarray]] = []
+        missing = []
+        for i, key in enumerate(keys):
+            cached = self.embedding_cache.get(key)
+            embeddings.append(None if cached is None else np.frombuffer(cached, dtype=np.float16).astype(np.float32))
+            if cached is None:
+                missing.append(i)
+        
+        if missing:
+            # Repeated texts in the batch are encoded once
+            unique_texts, inverse = _dedupe([texts[i] for i in missing])
+            encoded = self.embedding_model.encode(
+                unique_texts, batch_size=config.model.batch_size,
+                show_progress_bar=False, convert_to_numpy=True
+            ).astype(np.float16)
+            self.embedding_cache.set_many(
+                (InferenceCache.key(model_key, text), embedding.tobytes())
+                for text, embedding in zip(unique_texts, encoded)
+            )
+            for i, j in zip(missing, inverse):
+                embeddings[i] = encoded[j].astype(np.float32)
+        
+        return np.stack(embeddings)
+    
     def batch_similarity_search(self, query_texts: List[str], 
                               document_type: str = "resume",
                               top_k: int = 5) -> List[List[Dict[str, Any]]]:
@@ -353,30 +872,15 @@ class SemanticMatchingService:
             return []
         
         try:
+            # Embed all queries in one batched call, through the same cache and rounding as single searches
+            query_embeddings = self._encode_many_cached(query_texts)
+            
             # Query the collection
-            results = self.collection.query(
-                query_texts=query_texts,
-                n_results=top_k,
-                where={"type": document_type}
-            )
+            results = self._query(query_embeddings, top_k, document_type)
             
-            all_matches = []
-            for query_idx in range(len(query_texts)):
-                query_matches = []
-                if results['ids'] and results['ids'][query_idx]:
-                    for i, (doc_id, distance, metadata) in enumerate(zip(
-                        results['ids'][query_idx],
-                        results['distances'][query_idx],
-                        results['metadatas'][query_idx]
-                    )):
-                        similarity_score = 1 - distance
-                        query_matches.append({
-                            "document_id": doc_id,
-                            "similarity_score": round(similarity_score, 4),
-                            "metadata": metadata,
-                            "rank": i + 1
-                        })
-                all_matches.append(query_matches)
+            all_matches = [
+                MatchResult.from_query(results, query_idx).to_dicts() for query_idx in range(len(query_texts))
+            ]
             
             logger.info(f"Completed batch similarity search for {len(query_texts)} queries")
             return all_matches
@@ -385,19 +889,35 @@ class SemanticMatchingService:
             logger.error(f"Failed to perform batch similarity search: {e}")
             return [[] for _ in query_texts]
     
+    def _track_text_lengths(self, texts: List[str]) -> None:
+        """
+        Fold the lengths of newly added texts into the running average.
+        
+        Args:
+            texts (List[str]): Texts just added to the collection
+        """
+        avg = self._avg_text_length
+        for text in texts:
+            if avg is None:
+                avg = float(len(text))
+            else:
+                avg += TEXT_LENGTH_EWMA_WEIGHT * (len(text) - avg)
+        self._avg_text_length = avg
+    
     def get_collection_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the vector collection.
         
+        Document counts are exact and filtered by Chroma; the average text length
+        is a moving average over added documents, seeded from a sample of the
+        collection when nothing has been added since startup.
+        
         Returns:
             Dict[str, Any]: Collection statistics
         """
         try:
             count = self.collection.count()
             
-            # Get sample documents to analyze
-            sample_results = self.collection.get(limit=100)
-            
             stats = {
                 "total_documents": count,
                 "resume_count": 0,
@@ -406,20 +926,16 @@ class SemanticMatchingService:
                 "model_name": self.model_name
             }
             
-            if sample_results['metadatas']:
-                resume_count = sum(1 for meta in sample_results['metadatas'] 
-                                 if meta.get('type') == 'resume')
-                job_count = sum(1 for meta in sample_results['metadatas'] 
-                              if meta.get('type') == 'job')
-                
-                avg_length = np.mean([meta.get('text_length', 0) 
-                                    for meta in sample_results['metadatas']])
+            if count:
+                # Only ids come back, no documents, embeddings or metadata
+                for document_type in ("resume", "job"):
+                    matches = self.collection.get(where={"type": document_type}, include=[])
+                    stats[f"{document_type}_count"] = len(matches['ids'])
                 
-                stats.update({
-                    "resume_count": resume_count,
-                    "job_count": job_count,
-                    "average_text_length": int(avg_length)
-                })
+                if self._avg_text_length is None:
+                    sample = self.collection.get(limit=STATS_SAMPLE_SIZE, include=["metadatas"])
+                    self._track_text_lengths_from_metadata(sample['metadatas'] or [])
+                stats["average_text_length"] = int(self._avg_text_length or 0)
             
             return stats
             
@@ -427,6 +943,17 @@ class SemanticMatchingService:
             logger.error(f"Failed to get collection stats: {e}")
             return {"error": str(e)}
     
+    def _track_text_lengths_from_metadata(self, metadatas: List[Dict[str, Any]]) -> None:
+        """
+        Seed the running average text length from stored metadata.
+        
+        Args:
+            metadatas (List[Dict[str, Any]]): Metadata of a sample of stored documents
+        """
+        lengths = [meta.get('text_length', 0) for meta in metadatas if meta]
+        if lengths:
+            self._avg_text_length = sum(lengths) / len(lengths)
+    
     def clear_collection(self) -> bool:
         """
         Clear all documents from the collection.
@@ -434,8 +961,14 @@ class SemanticMatchingService:
         Returns:
             bool: True if successfully cleared
         """
+        with self._index_lock:
+            self._type_indexes = {}
+        self._avg_text_length = None
         try:
-            self.collection.delete(where={})
+            # Dropping the collection frees its index at once instead of deleting row by row
+            collection_name = self.collection.name
+            self.chroma_client.delete_collection(name=collection_name)
+            self.collection = self._get_or_create_collection(collection_name)
             logger.info("Collection cleared successfully")
             return True
         except Exception as e:
@@ -443,5 +976,19 @@ class SemanticMatchingService:
             return False
 
 
-# Global semantic matching service instance
-semantic_matching_service = SemanticMatchingService() 
\ No newline at end of file
+@functools.lru_cache(maxsize=1)
+def get_semantic_matching_service() -> SemanticMatchingService:
+    """
+    Get the global semantic matching service, creating it on first use.
+    
+    Returns:
+        SemanticMatchingService: The shared semantic matching service
+    """
+    return SemanticMatchingService()
+
+
+def __getattr__(name: str):
+    """Build the global ``semantic_matching_service`` lazily when it is first accessed."""
+    if name == "semantic_matching_service":
+        return get_semantic_matching_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
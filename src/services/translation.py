@@ -7,20 +7,51 @@ and provides robust error handling for production use.
 """
 
 import os
+import re
+import functools
 import logging
+import threading
 from typing import Dict, List, Optional, Tuple, Union
 from pathlib import Path
 import glob
 
+import torch
 from tqdm import tqdm
 from transformers import MarianMTModel, MarianTokenizer
 from langdetect import detect, LangDetectException
 
+try:
+    import fasttext
+except ImportError:
+    fasttext = None
+
 from ..core.exceptions import LanguageDetectionError, ModelLoadingError
 from ..core.config import config
+from ..core.cache import InferenceCache
+from ..core.hardware import cpu_supports_bf16
 
 logger = logging.getLogger(__name__)
 
+# Text that says nothing about the language, removed before detection
+_WHITESPACE_RE = re.compile(r'\s+')
+_EMAIL_RE = re.compile(r'\S+@\S+')
+_URL_RE = re.compile(r'https?://\S+')
+_PHONE_RE = re.compile(r'[+]?[1-9]\d{0,15}')
+
+TARGET_LANGUAGE = "en"  # every model translates into English
+LID_MODEL_FILE = "lid.176.bin"  # fastText language identification model, in the model directory
+LID_MAX_CHARS = 1000  # the opening of a resume is enough to identify its language
+MIN_DETECTION_CHARS = 10  # shorter cleaned text is rejected as undetectable
+
+MAX_BATCH_TOKENS = 8192  # padded source tokens per generate() call in batch_translate
+# Greedy decoding; the opus-mt configs default to beam search, which costs several times as much
+GENERATE_KWARGS = {"num_beams": 1, "do_sample": False, "use_cache": True}
+
+
+def _text_sample(text: str) -> str:
+    """The opening of a text, for error messages."""
+    return text[:100] + "..." if len(text) > 100 else text
+
 
 class TranslationService:
     """
@@ -36,6 +67,8 @@ class TranslationService:
         model_dir (str): Directory containing translation models
         supported_languages (Dict[str, str]): Mapping of language codes to model paths
         loaded_models (Dict[str, Tuple[MarianMTModel, MarianTokenizer]]): Cache of loaded models
+        device (torch.device): Device the models run on
+        dtype (torch.dtype): Floating-point type the models run in
     """
     
     def __init__(self, model_dir: Optional[str] = None):
@@ -67,15 +100,38 @@ class TranslationService:
         # Cache for loaded models to avoid reloading
         self.loaded_models: Dict[str, Tuple[MarianMTModel, MarianTokenizer]] = {}
         
+        # A model is loaded once and runs one generate() at a time; different languages run concurrently
+        self._language_locks = {language: threading.RLock() for language in self.supported_languages}
+        
+        # Inference settings shared by every language's model
+        device = config.model.device
+        if device == "cuda" and not torch.cuda.is_available():
+            logger.warning("CUDA requested for translation but not available, using CPU")
+            device = "cpu"
+        self.device = torch.device(device)
+        self.dtype = self._select_dtype()
+        self._configure_threads()
+        
+        # fastText language identifier, loaded on first detection; langdetect is the fallback
+        self._lid_model = None
+        self._lid_checked = False
+        self._lid_lock = threading.Lock()
+        
+        # Translations of texts seen before, by (model, text)
+        self.translation_cache = InferenceCache(
+            config.model.inference_cache_path, "translations", config.model.inference_cache_size,
+            config.model.inference_cache_disk_size
+        )
+        
         logger.info(f"Translation service initialized with model directory: {self.model_dir}")
     
     def detect_language(self, text: str) -> str:
         """
         Detect the language of the input text.
         
-        This method uses the langdetect library to identify the language
-        of the provided text. It handles various edge cases and provides
-        meaningful error messages.
+        This method uses the fastText lid.176 model when it is present in the
+        model directory and the langdetect library otherwise. It handles various
+        edge cases and provides meaningful error messages.
         
         Args:
             text (str): The text to analyze for language detection
@@ -87,18 +143,87 @@ class TranslationService:
             LanguageDetectionError: If language detection fails
             ValueError: If input text is empty or invalid
         """
+        return self.batch_detect_language([text])[0]
+    
+    def batch_detect_language(self, texts: List[str]) -> List[str]:
+        """
+        Detect the language of each text.
+        
+        With the fastText model every text is classified in a single predict()
+        call; without it, langdetect runs on each text in turn.
+        
+        Args:
+            texts (List[str]): The texts to analyze for language detection
+            
+        Returns:
+            List[str]: ISO 639-1 language code of each text, in input order
+            
+        Raises:
+            LanguageDetectionError: If language detection fails for any text
+            ValueError: If any input text is empty or invalid
+        """
+        cleaned_texts = [self._clean_for_detection(text) for text in texts]
+        if not cleaned_texts:
+            return []
+        
+        lid_model = self._load_lid_model()
+        if lid_model is None:
+            return [self._detect_with_langdetect(cleaned, text) for cleaned, text in zip(cleaned_texts, texts)]
+        
+        try:
+            labels, _ = lid_model.predict([cleaned[:LID_MAX_CHARS] for cleaned in cleaned_texts], k=1)
+        except Exception as e:
+            logger.error(f"Unexpected error in language detection: {e}")
+            raise LanguageDetectionError(
+                f"Unexpected error during language detection: {str(e)}",
+                text_sample=_text_sample(texts[0])
+            )
+        
+        languages = [label[0].removeprefix("__label__") for label in labels]
+        logger.debug(f"Detected languages for {len(languages)} texts: {sorted(set(languages))}")
+        return languages
+    
+    def _clean_for_detection(self, text: str) -> str:
+        """
+        Validate a text and preprocess it for language detection.
+        
+        Args:
+            text (str): Raw input text
+            
+        Returns:
+            str: Preprocessed text, long enough for detection
+            
+        Raises:
+            LanguageDetectionError: If too little text is left after preprocessing
+            ValueError: If input text is empty or invalid
+        """
         if not text or not isinstance(text, str):
             raise ValueError("Input text must be a non-empty string")
         
         # Clean and prepare text for detection
         cleaned_text = self._preprocess_text_for_detection(text)
         
-        if len(cleaned_text.strip()) < 10:
+        if len(cleaned_text.strip()) < MIN_DETECTION_CHARS:
             raise LanguageDetectionError(
                 "Text too short for reliable language detection",
-                text_sample=text[:100] + "..." if len(text) > 100 else text
+                text_sample=_text_sample(text)
             )
+        return cleaned_text
+    
+    def _detect_with_langdetect(self, cleaned_text: str, text: str) -> str:
+        """
+        Detect the language of preprocessed text with langdetect.
         
+        Args:
+            cleaned_text (str): Text from _clean_for_detection
+            text (str): The original text, quoted in errors
+            
+        Returns:
+            str: ISO 639-1 language code
+            
+        Raises:
+            LanguageDetectionError: If language detection fails
+        """
         try:
             detected_lang = detect(cleaned_text)
             logger.debug(f"Detected language: {detected_lang} for text sample: {text[:50]}...")
@@ -107,15 +232,40 @@ class TranslationService:
         except LangDetectException as e:
             raise LanguageDetectionError(
                 f"Language detection failed: {str(e)}",
-                text_sample=text[:100] + "..." if len(text) > 100 else text
+                text_sample=_text_sample(text)
             )
         except Exception as e:
             logger.error(f"Unexpected error in language detection: {e}")
             raise LanguageDetectionError(
                 f"Unexpected error during language detection: {str(e)}",
-                text_sample=text[:100] + "..." if len(text) > 100 else text
+                text_sample=_text_sample(text)
             )
     
+    def _load_lid_model(self):
+        """
+        Load the fastText language identifier on first use.
+        
+        Returns:
+            The fastText model, or None if fasttext or the model file is unavailable
+        """
+        with self._lid_lock:
+            if self._lid_checked:
+                return self._lid_model
+            self._lid_checked = True
+            
+            model_path = self.model_dir / LID_MODEL_FILE
+            if fasttext is None or not model_path.exists():
+                logger.info("fastText language identifier unavailable, using langdetect")
+                return None
+            
+            try:
+                self._lid_model = fasttext.load_model(str(model_path))
+                logger.info(f"Loaded language identification model from {model_path}")
+            except Exception as e:
+                logger.warning(f"Could not load fastText model, using langdetect: {e}")
+                self._lid_model = None
+            return self._lid_model
+    
     def _preprocess_text_for_detection(self, text: str) -> str:
         """
         Preprocess text to improve language detection accuracy.
@@ -127,19 +277,44 @@ class TranslationService:
             str: Preprocessed text suitable for language detection
         """
         # Remove excessive whitespace and normalize
-        cleaned = " ".join(text.split())
+        cleaned = _WHITESPACE_RE.sub(" ", text).strip()
         
-        # Remove common non-language specific patterns
-        import re
-        # Remove email addresses
-        cleaned = re.sub(r'\S+@\S+', '', cleaned)
-        # Remove URLs
-        cleaned = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', cleaned)
-        # Remove phone numbers
-        cleaned = re.sub(r'[\+]?[1-9][\d]{0,15}', '', cleaned)
+        # Remove common non-language specific patterns: email addresses, URLs and phone numbers
+        cleaned = _EMAIL_RE.sub('', cleaned)
+        cleaned = _URL_RE.sub('', cleaned)
+        cleaned = _PHONE_RE.sub('', cleaned)
         
         return cleaned
     
+    def _select_dtype(self) -> "torch.dtype":
+        """
+        Pick the floating-point type translation models run in.
+        
+        An explicit config.model.dtype wins; otherwise GPUs use bfloat16 (or float16
+        where bfloat16 is unsupported), and CPUs use bfloat16 only if they have
+        native instructions for it.
+        
+        Returns:
+            torch.dtype: The dtype to load models in
+        """
+        if config.model.dtype:
+            return getattr(torch, config.model.dtype)
+        if self.device.type == "cuda":
+            return torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        return torch.bfloat16 if cpu_supports_bf16() else torch.float32
+    
+    def _configure_threads(self) -> None:
+        """Use every CPU (or config.model.num_threads) for each generate() call."""
+        torch.set_num_threads(config.model.num_threads or os.cpu_count() or 1)
+        try:
+            torch.set_num_interop_threads(2)
+        except RuntimeError:  # Only allowed before the first parallel op in the process
+            pass
+    
+    def _cache_model_name(self, language_code: str) -> str:
+        """Name identifying a language's model and the settings that change its output, for cache keys."""
+        return f"{self.supported_languages[language_code]}|{self.dtype}|greedy"
+    
     def load_model(self, language_code: str) -> Tuple[MarianMTModel, MarianTokenizer]:
         """
         Load translation model and tokenizer for a specific language.
@@ -161,38 +336,50 @@ class TranslationService:
             raise ValueError(f"Unsupported language code: {language_code}. "
                            f"Supported languages: {list(self.supported_languages.keys())}")
         
-        # Return cached model if already loaded
-        if language_code in self.loaded_models:
-            logger.debug(f"Using cached model for language: {language_code}")
-            return self.loaded_models[language_code]
-        
-        model_path = self.supported_languages[language_code]
-        
-        if not Path(model_path).exists():
-            raise ModelLoadingError(
-                f"Translation model not found for language: {language_code}",
-                model_name=f"opus-mt-{language_code}-en",
-                model_path=model_path
-            )
-        
-        try:
-            logger.info(f"Loading translation model for language: {language_code}")
-            tokenizer = MarianTokenizer.from_pretrained(model_path)
-            model = MarianMTModel.from_pretrained(model_path)
+        with self._language_locks[language_code]:
+            # Return cached model if already loaded
+            if language_code in self.loaded_models:
+                logger.debug(f"Using cached model for language: {language_code}")
+                return self.loaded_models[language_code]
             
-            # Cache the loaded model
-            self.loaded_models[language_code] = (model, tokenizer)
+            model_path = self.supported_languages[language_code]
             
-            logger.info(f"Successfully loaded translation model for {language_code}")
-            return model, tokenizer
+            if not Path(model_path).exists():
+                raise ModelLoadingError(
+                    f"Translation model not found for language: {language_code}",
+                    model_name=f"opus-mt-{language_code}-en",
+                    model_path=model_path
+                )
             
-        except Exception as e:
-            logger.error(f"Failed to load translation model for {language_code}: {e}")
-            raise ModelLoadingError(
-                f"Failed to load translation model for {language_code}: {str(e)}",
-                model_name=f"opus-mt-{language_code}-en",
-                model_path=model_path
-            )
+            try:
+                logger.info(f"Loading translation model for language: {language_code}")
+                tokenizer = MarianTokenizer.from_pretrained(model_path)
+                model = MarianMTModel.from_pretrained(model_path, torch_dtype=self.dtype)
+                model.to(self.device)
+                model.eval()
+                
+                if config.model.compile_models:
+                    try:
+                        # generate() calls forward() once per decoding step; compiling the
+                        # wrapper module would leave generate() on the eager forward
+                        model.forward = torch.compile(model.forward, dynamic=True)
+                        logger.info(f"Compiled translation model for {language_code} with torch.compile")
+                    except Exception as e:
+                        logger.warning(f"torch.compile unavailable, using eager model: {e}")
+                
+                # Cache the loaded model
+                self.loaded_models[language_code] = (model, tokenizer)
+                
+                logger.info(f"Successfully loaded translation model for {language_code}")
+                return model, tokenizer
+            
+            except Exception as e:
+                logger.error(f"Failed to load translation model for {language_code}: {e}")
+                raise ModelLoadingError(
+                    f"Failed to load translation model for {language_code}: {str(e)}",
+                    model_name=f"opus-mt-{language_code}-en",
+                    model_path=model_path
+                )
     
     def translate_text(self, text: str, source_language: Optional[str] = None) -> Tuple[str, str]:
         """
@@ -220,25 +407,36 @@ class TranslationService:
         if source_language is None:
             source_language = self.detect_language(text)
         
+        # English text is already in the target language
+        if source_language == TARGET_LANGUAGE:
+            return text, source_language
+        
         # Check if language is supported
         if source_language not in self.supported_languages:
             logger.warning(f"Language {source_language} not supported for translation. "
                          f"Returning original text.")
             return text, source_language
         
+        # Reuse an earlier translation of the same text by the same model
+        cache_key = InferenceCache.key(self._cache_model_name(source_language), text)
+        cached = self.translation_cache.get(cache_key)
+        if cached is not None:
+            return cached.decode("utf-8"), source_language
+        
         try:
             # Load model and tokenizer
             model, tokenizer = self.load_model(source_language)
             
             # Prepare text for translation
-            batch = tokenizer.prepare_seq2seq_batch([text], return_tensors="pt")
+            batch = tokenizer([text], truncation=True, return_tensors="pt").to(self.device)
             
             # Generate translation
-            with torch.no_grad():
-                generated = model.generate(**batch)
+            with self._language_locks[source_language], torch.inference_mode():
+                generated = model.generate(**batch, **GENERATE_KWARGS)
                 translated = tokenizer.batch_decode(generated, skip_special_tokens=True)[0]
             
             logger.debug(f"Translated text from {source_language} to English")
+            self.translation_cache.set(cache_key, translated.encode("utf-8"))
             return translated, source_language
             
         except Exception as e:
@@ -250,6 +448,9 @@ class TranslationService:
         """
         Translate multiple texts in batch.
         
+        Texts of each language are translated together in padded mini-batches
+        rather than one generate() call per text.
+        
         Args:
             texts (List[str]): List of texts to translate
             source_languages (List[str], optional): List of source language codes.
@@ -261,24 +462,86 @@ class TranslationService:
         if not texts:
             return []
         
-        results = []
-        
         # Detect languages if not provided
         if source_languages is None:
-            source_languages = [self.detect_language(text) for text in texts]
+            source_languages = self.batch_detect_language(texts)
+        
+        # English and unsupported languages pass through; cached texts are answered straight away
+        results: List[Optional[Tuple[str, str]]] = [None] * len(texts)
+        pending: Dict[str, List[int]] = {}
+        for i, (text, lang) in enumerate(zip(texts, source_languages)):
+            if lang not in self.supported_languages:
+                results[i] = (text, lang)
+                continue
+            cached = self.translation_cache.get(InferenceCache.key(self._cache_model_name(lang), text))
+            if cached is not None:
+                results[i] = (cached.decode("utf-8"), lang)
+            else:
+                pending.setdefault(lang, []).append(i)
+        
+        # Translate the rest in batches of similar length, one language at a time: each
+        # generate() call already runs on every torch thread, so languages are not overlapped
+        for lang, indices in pending.items():
+            for i, translated in zip(indices, self._translate_batches(lang, [texts[i] for i in indices])):
+                results[i] = (translated, lang)
+        
+        return results
+    
+    def _translate_batches(self, language_code: str, texts: List[str]) -> List[str]:
+        """
+        Translate texts of one language with length-sorted mini-batches.
+        
+        Texts are tokenized once and sorted by token count, so each batch pads to
+        a similar length; a batch holds at most config.model.batch_size texts and
+        MAX_BATCH_TOKENS padded tokens. Texts in a batch that fails are returned
+        untranslated, as translate_text does.
         
-        # Process each text
-        for text, lang in tqdm(zip(texts, source_languages), 
-                             total=len(texts), 
-                             desc="Translating texts"):
+        Args:
+            language_code (str): Source language code, supported by this service
+            texts (List[str]): Texts to translate
+            
+        Returns:
+            List[str]: Translations in the order of texts
+        """
+        try:
+            model, tokenizer = self.load_model(language_code)
+        except Exception as e:
+            logger.error(f"Failed to translate texts: {e}")
+            return list(texts)
+        
+        model_name = self._cache_model_name(language_code)
+        input_ids = tokenizer(texts, truncation=True)["input_ids"]
+        order = sorted(range(len(texts)), key=lambda i: len(input_ids[i]))
+        
+        # Ascending lengths, so a batch pads to the length of its last text
+        batches: List[List[int]] = []
+        for i in order:
+            if batches:
+                batch = batches[-1]
+                padded = (len(batch) + 1) * len(input_ids[i])
+                if len(batch) < config.model.batch_size and padded <= MAX_BATCH_TOKENS:
+                    batch.append(i)
+                    continue
+            batches.append([i])
+        
+        translations = list(texts)
+        for batch in tqdm(batches, desc=f"Translating {language_code} texts"):
             try:
-                translated, detected_lang = self.translate_text(text, lang)
-                results.append((translated, detected_lang))
+                encoded = tokenizer.pad({"input_ids": [input_ids[i] for i in batch]}, return_tensors="pt").to(self.device)
+                with self._language_locks[language_code], torch.inference_mode():
+                    generated = model.generate(**encoded, **GENERATE_KWARGS)
+                decoded = tokenizer.batch_decode(generated, skip_special_tokens=True)
             except Exception as e:
-                logger.error(f"Failed to translate text: {e}")
-                results.append((text, lang))  # Return original text on error
+                logger.error(f"Failed to translate texts: {e}")
+                continue
+            for i, translated in zip(batch, decoded):
+                translations[i] = translated
+            self.translation_cache.set_many(
+                (InferenceCache.key(model_name, texts[i]), translated.encode("utf-8"))
+                for i, translated in zip(batch, decoded)
+            )
         
-        return results
+        return translations
     
     def get_supported_languages(self) -> List[str]:
         """
@@ -302,9 +565,20 @@ class TranslationService:
         return language_code in self.supported_languages
 
 
-# Import torch here to avoid circular imports
-import torch
+@functools.lru_cache(maxsize=1)
+def get_translation_service() -> TranslationService:
+    """
+    Get the global translation service, creating it on first use.
+    
+    Returns:
+        TranslationService: The shared translation service
+    """
+    return TranslationService()
 
 
-# Global translation service instance
-translation_service = TranslationService() 
\ No newline at end of file
+def __getattr__(name: str):
+    """Build the global ``translation_service`` lazily when it is first accessed."""
+    if name == "translation_service":
+        return get_translation_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+ 
\ No newline at end of file